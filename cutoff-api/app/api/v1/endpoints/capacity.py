@@ -3,85 +3,208 @@ Capacity check endpoint.
 POST /capacity/check - Main decision endpoint.
 """
 
+import email.message
+import json
 import time
-from datetime import datetime
-from decimal import Decimal
+from typing import Any, AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
 
+from app.core.load_shedding import get_admission_controller
 from app.core.logging import get_logger
-from app.core.metrics import capacity_checks_total
-from app.models.domain import ResourceType
-from app.models.requests import CapacityCheckRequest
+from app.core.metrics import (
+    capacity_checks_total,
+    request_parse_duration_seconds,
+    stale_snapshot_decisions_total,
+)
+from app.core.timing import stage
+from app.models.requests import (
+    CapacityCheckRequest,
+    ParsedCapacityCheck,
+    capacity_check_payload_adapter,
+)
 from app.models.responses import CalculationMetadata, CapacityCheckResponse
-from app.repositories.cache_repository import get_cache_repository
-from app.repositories.hana_repository import get_hana_repository
-from app.services.capacity_service import get_capacity_service
-from app.services.decision_engine import get_decision_engine
+from app.repositories.audit_repository import get_audit_repository
+from app.services.decision_stats import get_decision_stats
+from app.services.threshold_table import (
+    SnapshotUnavailable,
+    get_threshold_tables,
+    load_threshold_table,
+)
 from app.services.workload_calculator import get_workload_calculator
 
 router = APIRouter()
 logger = get_logger(__name__)
 
 
+_request_model_adapter = TypeAdapter(CapacityCheckRequest)
+
+
+def _inline_refs(schema: Any, defs: dict[str, Any]) -> Any:
+    """Resolve local $defs references so the schema can be embedded standalone."""
+    if isinstance(schema, dict):
+        ref = schema.get("$ref")
+        if ref is not None and ref.startswith("#/$defs/"):
+            return _inline_refs(defs[ref.rsplit("/", 1)[-1]], defs)
+        return {key: _inline_refs(value, defs) for key, value in schema.items() if key != "$defs"}
+    if isinstance(schema, list):
+        return [_inline_refs(value, defs) for value in schema]
+    return schema
+
+
+def _request_body_schema() -> dict[str, Any]:
+    """OpenAPI requestBody for CapacityCheckRequest (the body is parsed manually)."""
+    schema = CapacityCheckRequest.model_json_schema()
+    return {
+        "required": True,
+        "content": {"application/json": {"schema": _inline_refs(schema, schema.get("$defs", {}))}},
+    }
+
+
+def _is_json_content_type(content_type: Optional[str]) -> bool:
+    """Same JSON content-type rule FastAPI applies to body parameters."""
+    if not content_type:
+        return False
+    message = email.message.Message()
+    message["content-type"] = content_type
+    if message.get_content_maintype() != "application":
+        return False
+    subtype = message.get_content_subtype()
+    return subtype == "json" or subtype.endswith("+json")
+
+
+def _validate_request_model(body: bytes, is_json: bool) -> CapacityCheckRequest:
+    """
+    Validate the body the way a CapacityCheckRequest body parameter would.
+
+    Used when the bulk parser rejects a body, so clients get exactly the
+    validation errors FastAPI reported before.
+
+    Raises:
+        RequestValidationError: Missing body, invalid JSON or invalid fields
+    """
+    missing = [{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}]
+    if not body:
+        raise RequestValidationError(missing)
+
+    value: Any = body
+    if is_json:
+        try:
+            value = json.loads(body)
+        except json.JSONDecodeError as e:
+            raise RequestValidationError(
+                [
+                    {
+                        "type": "json_invalid",
+                        "loc": ("body", e.pos),
+                        "msg": "JSON decode error",
+                        "input": {},
+                        "ctx": {"error": e.msg},
+                    }
+                ],
+                body=e.doc,
+            )
+        # FastAPI treats a JSON null like an absent body
+        if value is None:
+            raise RequestValidationError(missing)
+
+    try:
+        return _request_model_adapter.validate_python(value, from_attributes=True)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)],
+            body=value,
+        )
+
+
+async def parse_capacity_check(http_request: Request) -> ParsedCapacityCheck:
+    """
+    Parse a capacity check body straight into column-wise items.
+
+    Valid JSON bodies are validated from raw bytes into plain dicts by a
+    compiled TypeAdapter; no OrderItem model is built per item. Anything the
+    fast path rejects is re-validated against CapacityCheckRequest so error
+    responses stay unchanged.
+
+    Args:
+        http_request: Incoming request
+
+    Returns:
+        ParsedCapacityCheck
+
+    Raises:
+        RequestValidationError: If the body is not a valid CapacityCheckRequest
+    """
+    started = time.perf_counter()
+    try:
+        with stage("parse"):
+            body = await http_request.body()
+            is_json = _is_json_content_type(http_request.headers.get("content-type"))
+            if body and is_json:
+                try:
+                    payload = capacity_check_payload_adapter.validate_json(body)
+                except ValidationError:
+                    pass
+                else:
+                    return ParsedCapacityCheck.from_payload(payload)
+            return ParsedCapacityCheck.from_request(_validate_request_model(body, is_json))
+    finally:
+        request_parse_duration_seconds.labels(endpoint="/capacity/check").observe(
+            time.perf_counter() - started
+        )
+
+
+async def admit_capacity_check(
+    request: ParsedCapacityCheck = Depends(parse_capacity_check),
+) -> AsyncIterator[None]:
+    """
+    Hold an admission slot for a capacity check, by order priority.
+
+    VIP orders bypass the bulkhead queue and are never shed.
+
+    Raises:
+        AdmissionRejected: If the check is shed under overload
+    """
+    async with get_admission_controller().admit("capacity_check", request.priority):
+        yield
+
+
 @router.post(
     "/capacity/check",
     response_model=CapacityCheckResponse,
     summary="Check if order can ship today",
     description="Check warehouse capacity and determine if new order can be shipped today.",
     tags=["Capacity"],
+    openapi_extra={"requestBody": _request_body_schema()},
+    dependencies=[Depends(admit_capacity_check)],
 )
 async def check_capacity(
-    request: CapacityCheckRequest,
+    request: ParsedCapacityCheck = Depends(parse_capacity_check),
+    factors: bool = Query(
+        default=False, description="Include decision_factors (computed on demand)"
+    ),
     # Uncomment for auth: user: User = Depends(require_write_scope)
-) -> CapacityCheckResponse:
+) -> Response:
     """
     Check warehouse capacity for a new order.
 
     This endpoint:
     1. Calculates workload for the order
-    2. Queries current warehouse capacity from HANA
-    3. Applies decision logic
-    4. Returns decision with factors
+    2. Compares it with the warehouse's admission thresholds, reloading the
+       snapshot from HANA when the threshold table is stale
+    3. Returns the decision, with factors if requested
 
-    Response is cached for 60 seconds.
+    Each step is timed as a request stage (see app.core.timing). The response
+    is serialized here, so that serialization is a stage too.
     """
-    start_time = time.time()
-    cache_hit = False
-
-    # Try to get cached result
-    cache_repo = get_cache_repository()
-    cached_decision = await cache_repo.get_cached_decision(request)
-
-    if cached_decision:
-        cache_hit = True
-        calc_time_ms = int((time.time() - start_time) * 1000)
-
-        logger.info(
-            "capacity_check_cached",
-            warehouse_id=request.warehouse_id,
-            priority=request.priority.value,
-            item_count=len(request.items),
-            decision=cached_decision.can_ship_today,
-        )
-
-        return CapacityCheckResponse(
-            can_ship_today=cached_decision.can_ship_today,
-            confidence=cached_decision.confidence,
-            estimated_completion=cached_decision.estimated_completion,
-            current_utilization=cached_decision.current_utilization,
-            message=cached_decision.message,
-            decision_factors=cached_decision.factors,
-            metadata=CalculationMetadata(
-                calculated_at=cached_decision.calculated_at,
-                cache_hit=True,
-                calculation_time_ms=calc_time_ms,
-            ),
-        )
+    start_time = time.perf_counter()
 
     # Calculate workload
-    workload_calc = get_workload_calculator()
-    workload = workload_calc.calculate_order_workload(request.items)
+    with stage("workload"):
+        workload_calc = get_workload_calculator()
+        workload = workload_calc.calculate_columnar_workload(request.items)
 
     logger.info(
         "order_workload_calculated",
@@ -89,73 +212,73 @@ async def check_capacity(
         total_workload=float(workload.total_workload),
     )
 
-    # Get current warehouse capacity from HANA
-    hana_repo = get_hana_repository()
-    try:
-        capacity_data = await hana_repo.get_current_warehouse_capacity(request.warehouse_id)
-    except Exception as e:
-        logger.error("hana_query_failed", error=str(e))
-        raise HTTPException(
-            status_code=503,
-            detail="Failed to query warehouse capacity from database",
-        )
+    # Admission thresholds of the current snapshot
+    with stage("cache_lookup"):
+        table = get_threshold_tables().get(request.warehouse_id)
+    cache_hit = table is not None
+    if table is None:
+        try:
+            table = await load_threshold_table(request.warehouse_id)
+        except SnapshotUnavailable as e:
+            raise HTTPException(status_code=503, detail=str(e))
 
-    # Build capacity object
-    capacity_service = get_capacity_service()
-    warehouse_capacity = capacity_service.calculate_warehouse_capacity(
-        pickers=capacity_data["available_pickers"],
-        packers=capacity_data["available_packers"],
-        loaders=capacity_data["available_loaders"],
-    )
+    with stage("decision"):
+        decision = table.decide(workload.total_workload, request.priority)
+    if table.stale:
+        stale_snapshot_decisions_total.labels(warehouse_id=request.warehouse_id).inc()
 
-    # Get current workload from HANA
-    try:
-        cutoff_data = await hana_repo.get_cutoff_calculation(request.warehouse_id)
-        current_workload = cutoff_data["total_remaining_workload"]
-    except Exception as e:
-        logger.error("hana_cutoff_query_failed", error=str(e))
-        current_workload = Decimal("0.0")
-
-    # Make decision
-    decision_engine = get_decision_engine()
-    decision = decision_engine.make_decision(
-        new_workload=workload.total_workload,
-        current_workload=current_workload,
-        capacity=warehouse_capacity.usable_capacity,
-        bottleneck_resource=warehouse_capacity.bottleneck_resource.value,
-        priority=request.priority,
-    )
-
-    # Cache decision
-    await cache_repo.cache_decision(request, decision)
+    # Audit decision (buffered, flushed in the background)
+    audit_repo = get_audit_repository()
+    if audit_repo.is_running:
+        with stage("audit"):
+            audit_repo.record(
+                decision,
+                warehouse_id=request.warehouse_id,
+                priority=request.priority,
+                new_workload=float(workload.total_workload),
+                current_workload=float(table.current_workload),
+                capacity=float(table.capacity),
+                order_id=request.order_id,
+                snapshot_version=table.snapshot_version,
+            )
 
     # Record metrics
+    get_decision_stats().record(
+        request.warehouse_id,
+        can_ship_today=decision.can_ship_today,
+        priority=request.priority,
+        vip_override=decision.vip_override_used,
+    )
     capacity_checks_total.labels(
         decision="approved" if decision.can_ship_today else "rejected",
         priority=request.priority.value,
     ).inc()
 
-    calc_time_ms = int((time.time() - start_time) * 1000)
+    calc_time_ms = round((time.perf_counter() - start_time) * 1000, 3)
 
     logger.info(
         "capacity_check_completed",
         warehouse_id=request.warehouse_id,
         order_id=request.order_id,
         decision=decision.can_ship_today,
-        utilization=float(decision.current_utilization),
+        utilization=decision.utilization,
+        cache_hit=cache_hit,
+        snapshot_stale=table.stale,
         calc_time_ms=calc_time_ms,
     )
 
-    return CapacityCheckResponse(
-        can_ship_today=decision.can_ship_today,
-        confidence=decision.confidence,
-        estimated_completion=decision.estimated_completion,
-        current_utilization=decision.current_utilization,
-        message=decision.message,
-        decision_factors=decision.factors,
-        metadata=CalculationMetadata(
-            calculated_at=decision.calculated_at,
-            cache_hit=False,
-            calculation_time_ms=calc_time_ms,
-        ),
-    )
+    with stage("serialize"):
+        response = CapacityCheckResponse(
+            can_ship_today=decision.can_ship_today,
+            confidence=decision.confidence,
+            estimated_completion=decision.estimated_completion,
+            current_utilization=decision.current_utilization,
+            message=decision.message,
+            decision_factors=decision.factors().to_model() if factors else None,
+            metadata=CalculationMetadata(
+                calculated_at=decision.calculated_at,
+                cache_hit=cache_hit,
+                calculation_time_ms=calc_time_ms,
+            ),
+        )
+        return Response(response.model_dump_json(), media_type="application/json")
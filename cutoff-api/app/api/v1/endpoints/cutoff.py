@@ -1,17 +1,21 @@
 """
-Cutoff time endpoint.
+Cutoff time endpoints.
 GET /cutoff/current - Get current dynamic cutoff time.
+GET /cutoff/all - Get cutoff times for all (or selected) warehouses.
 """
 
 from datetime import datetime, timedelta
 from decimal import Decimal
+from typing import Any, Optional
 
 from fastapi import APIRouter, HTTPException, Query
 
 from app.core.logging import get_logger
 from app.models.domain import AlertLevel, DecisionStatus
-from app.models.responses import CutoffStatusResponse, StatusHistoryPoint
+from app.models.responses import CutoffStatusResponse, FleetCutoffResponse, StatusHistoryPoint
 from app.repositories.hana_repository import get_hana_repository
+from app.services.decision_engine import get_decision_engine
+from app.services.utilization_history import get_utilization_history
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -47,6 +51,88 @@ async def get_current_cutoff(
             detail="Failed to query cutoff calculation from database",
         )
 
+    return build_cutoff_status(warehouse_id, cutoff_data, datetime.now())
+
+
+@router.get(
+    "/cutoff/all",
+    response_model=FleetCutoffResponse,
+    summary="Get cutoff times for the fleet",
+    description=(
+        "Get the current dynamic cutoff time and status for every configured warehouse, "
+        "optionally filtered by warehouse_id."
+    ),
+    tags=["Cutoff"],
+)
+async def get_fleet_cutoff(
+    warehouse_id: Optional[list[str]] = Query(
+        default=None, description="Warehouse identifiers (repeatable; all if omitted)"
+    ),
+    # Uncomment for auth: user: User = Depends(require_read_scope)
+) -> FleetCutoffResponse:
+    """
+    Get current cutoff time and status for many warehouses at once.
+
+    All warehouses are read with a single batched HANA query, so latency stays
+    close to that of /cutoff/current regardless of fleet size.
+    """
+    hana_repo = get_hana_repository()
+
+    try:
+        configured = await hana_repo.list_warehouses()
+    except Exception as e:
+        logger.error("warehouse_list_query_failed", error=str(e))
+        raise HTTPException(
+            status_code=503,
+            detail="Failed to query warehouse registry from database",
+        )
+
+    if warehouse_id:
+        unknown = sorted(set(warehouse_id) - set(configured))
+        if unknown:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Unknown warehouse(s): {', '.join(unknown)}",
+            )
+        warehouse_ids = list(dict.fromkeys(warehouse_id))
+    else:
+        warehouse_ids = configured
+
+    try:
+        cutoff_rows = await hana_repo.get_cutoff_calculations(warehouse_ids)
+    except Exception as e:
+        logger.error("fleet_cutoff_query_failed", warehouse_count=len(warehouse_ids), error=str(e))
+        raise HTTPException(
+            status_code=503,
+            detail="Failed to query cutoff calculation from database",
+        )
+
+    now = datetime.now()
+    warehouses = [
+        build_cutoff_status(wh_id, cutoff_rows[wh_id], now)
+        for wh_id in warehouse_ids
+        if wh_id in cutoff_rows
+    ]
+
+    logger.info("fleet_cutoff_retrieved", warehouse_count=len(warehouses))
+
+    return FleetCutoffResponse(current_time=now, warehouses=warehouses)
+
+
+def build_cutoff_status(
+    warehouse_id: str, cutoff_data: dict[str, Any], now: datetime
+) -> CutoffStatusResponse:
+    """
+    Build the cutoff status for one warehouse from its V_CUTOFF_CALCULATION row.
+
+    Args:
+        warehouse_id: Warehouse identifier
+        cutoff_data: Cutoff calculation row
+        now: Current time
+
+    Returns:
+        CutoffStatusResponse
+    """
     # Extract data
     current_utilization = cutoff_data["current_utilization"]
     system_status = cutoff_data["system_status"]
@@ -54,7 +140,6 @@ async def get_current_cutoff(
     workload = cutoff_data["total_remaining_workload"]
 
     # Calculate cutoff time
-    now = datetime.now()
     hard_deadline = now.replace(hour=16, minute=0, second=0, microsecond=0)
     if now >= hard_deadline:
         hard_deadline += timedelta(days=1)
@@ -76,12 +161,9 @@ async def get_current_cutoff(
     orders_in_queue = 47
     estimated_orders_remaining = max(0, int((1 - float(current_utilization)) * 100))
 
-    # Determine trend (placeholder - would need historical data)
-    trend = "STABLE"
-    if current_utilization > Decimal("0.80"):
-        trend = "INCREASING"
-    elif current_utilization < Decimal("0.60"):
-        trend = "DECREASING"
+    # Record sample and derive trend from the smoothed utilization slope
+    series = get_utilization_history().record(warehouse_id, float(current_utilization))
+    trend = series.trend
 
     # Determine alert level
     if system_status == DecisionStatus.CLOSED:
@@ -93,24 +175,18 @@ async def get_current_cutoff(
     else:
         alert_level = AlertLevel.NONE
 
-    # Mock status history (TODO: Get from cache/database)
-    status_history = [
-        StatusHistoryPoint(
-            time="11:00",
-            status=DecisionStatus.ACCEPTING,
-            utilization=Decimal("0.65"),
-        ),
-        StatusHistoryPoint(
-            time="11:30",
-            status=DecisionStatus.ACCEPTING,
-            utilization=Decimal("0.71"),
-        ),
-        StatusHistoryPoint(
-            time="12:00",
-            status=system_status,
-            utilization=current_utilization,
-        ),
-    ]
+    # Status history from the downsampled utilization series
+    decision_engine = get_decision_engine()
+    status_history = []
+    for point_time, utilization in series.history():
+        utilization = Decimal(str(round(utilization, 4)))
+        status_history.append(
+            StatusHistoryPoint(
+                time=point_time.strftime("%H:%M"),
+                status=decision_engine.determine_status(utilization),
+                utilization=min(utilization, Decimal("1.0")),
+            )
+        )
 
     logger.info(
         "cutoff_retrieved",
@@ -121,6 +197,7 @@ async def get_current_cutoff(
     )
 
     return CutoffStatusResponse(
+        warehouse_id=warehouse_id,
         cutoff_time=cutoff_time,
         hard_deadline=hard_deadline,
         current_time=now,
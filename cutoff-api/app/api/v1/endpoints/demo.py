@@ -6,7 +6,9 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 
 from app.core.logging import get_logger
+from app.repositories.hana_repository import get_hana_repository
 from app.repositories.mock_hana_data import DEMO_SCENARIOS, set_demo_scenario
+from app.services.threshold_table import invalidate_threshold_table
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -80,6 +82,8 @@ async def set_scenario(scenario_name: str) -> dict:
 
     set_demo_scenario(scenario_name)
     scenario = DEMO_SCENARIOS[scenario_name]
+    for warehouse_id in await get_hana_repository().list_warehouses():
+        await invalidate_threshold_table(warehouse_id)
 
     logger.info("demo_scenario_changed", scenario=scenario_name)
 
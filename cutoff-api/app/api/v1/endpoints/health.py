@@ -1,6 +1,7 @@
 """
-Health check endpoint.
+Health check endpoints.
 GET /health - No authentication required.
+GET /ready - Readiness gate, no authentication required.
 """
 
 import time
@@ -11,7 +12,9 @@ from fastapi.responses import JSONResponse
 
 from app.config import get_settings
 from app.core.logging import get_logger
-from app.models.responses import HealthResponse
+from app.models.responses import ComponentHealth, HealthResponse, ReadinessResponse
+from app.services.health_prober import get_health_prober
+from app.warmup import get_warmup
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -31,16 +34,24 @@ async def health_check() -> HealthResponse:
     """
     Health check endpoint.
 
-    Returns overall health status and component checks.
+    Returns overall health status and component checks. Dependency status
+    comes from the background health prober, so this never waits on HANA
+    or Redis.
     """
     settings = get_settings()
 
-    # Check components
-    checks = {
-        "hana": "ok",  # TODO: Implement actual HANA health check
-        "redis": "ok",  # TODO: Implement actual Redis health check
-        "api": "ok",
+    # Latest background probe results
+    prober = get_health_prober()
+    components = {
+        name: ComponentHealth(
+            status=result.status,
+            latency_ms=result.latency_ms,
+            last_success=result.last_success,
+            last_error=result.last_error,
+        )
+        for name, result in prober.results.items()
     }
+    checks = {**prober.checks(), "api": "ok"}
 
     # Determine overall status
     if all(status == "ok" for status in checks.values()):
@@ -58,6 +69,7 @@ async def health_check() -> HealthResponse:
         version=settings.version,
         timestamp=datetime.now(),
         checks=checks,
+        components=components,
         uptime_seconds=uptime_seconds,
     )
 
@@ -71,3 +83,27 @@ async def health_check() -> HealthResponse:
     logger.debug("health_check_performed", status=overall_status, uptime=uptime_seconds)
 
     return response
+
+
+@router.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    summary="Readiness check",
+    description="Report ready once startup warm-up has finished. No authentication required.",
+    tags=["Health"],
+    responses={503: {"model": ReadinessResponse, "description": "Still warming up"}},
+)
+async def readiness_check() -> ReadinessResponse:
+    """
+    Readiness endpoint.
+
+    Returns 503 until warm-up has finished, so instances only receive
+    traffic once singletons, snapshots and the decision path are warm.
+    """
+    warmup = get_warmup()
+    if not warmup.ready:
+        return JSONResponse(
+            status_code=503,
+            content=ReadinessResponse(status="warming_up").model_dump(mode="json"),
+        )
+    return ReadinessResponse(status="ready", warmup_seconds=warmup.duration_seconds)
@@ -5,9 +5,11 @@ POST /simulate - What-if analysis.
 
 from datetime import datetime, timedelta
 from decimal import Decimal
+from typing import AsyncIterator
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from app.core.load_shedding import get_admission_controller
 from app.core.logging import get_logger
 from app.models.domain import DecisionStatus
 from app.models.requests import SimulateRequest
@@ -18,12 +20,27 @@ router = APIRouter()
 logger = get_logger(__name__)
 
 
+async def admit_simulation() -> AsyncIterator[None]:
+    """
+    Hold an admission slot for a simulation.
+
+    Simulations are background work: they are the first requests shed
+    under overload.
+
+    Raises:
+        AdmissionRejected: If the simulation is shed under overload
+    """
+    async with get_admission_controller().admit("simulate", None):
+        yield
+
+
 @router.post(
     "/simulate",
     response_model=SimulateResponse,
     summary="Simulate capacity impact",
     description="Perform what-if analysis to predict impact of new orders on capacity.",
     tags=["Simulation"],
+    dependencies=[Depends(admit_simulation)],
 )
 async def simulate_capacity_impact(
     request: SimulateRequest,
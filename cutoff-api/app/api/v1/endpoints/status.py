@@ -6,10 +6,10 @@ GET /status - Comprehensive dashboard data.
 from datetime import datetime
 from decimal import Decimal
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 
 from app.core.logging import get_logger
-from app.models.domain import AlertLevel, DecisionStatus, ResourceType
+from app.models.domain import AlertLevel, DecisionStatus, Priority, ResourceType
 from app.models.responses import (
     Alert,
     CapacityStatus,
@@ -19,6 +19,7 @@ from app.models.responses import (
     WarehouseStatusResponse,
     WorkloadBreakdown,
 )
+from app.services.decision_stats import get_decision_stats
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -32,6 +33,7 @@ logger = get_logger(__name__)
     tags=["Status"],
 )
 async def get_warehouse_status(
+    warehouse_id: str = Query(default="WH-MAIN", description="Warehouse identifier"),
     # Uncomment for auth: user: User = Depends(require_read_scope)
 ) -> WarehouseStatusResponse:
     """
@@ -48,7 +50,6 @@ async def get_warehouse_status(
     # This is a mock implementation
 
     now = datetime.now()
-    warehouse_id = "WH-MAIN"
 
     # Mock cutoff info
     cutoff = CutoffInfo(
@@ -94,13 +95,24 @@ async def get_warehouse_status(
         },
     )
 
-    # Mock decision stats
+    # Decision stats summed from pre-aggregated minute buckets
+    counts = await get_decision_stats().get_today_stats(warehouse_id)
+    total = counts["total"]
     decisions = DecisionStats(
-        total=285,
-        approved=234,
-        rejected=51,
-        vip_override=8,
-        approval_rate=Decimal("0.82"),
+        total=total,
+        approved=counts["approved"],
+        rejected=counts["rejected"],
+        vip_override=counts["vip_override"],
+        approval_rate=(
+            Decimal(counts["approved"]) / Decimal(total) if total else Decimal("0.0")
+        ),
+        by_priority={
+            priority.value: {
+                "approved": counts[f"{priority.value}:approved"],
+                "rejected": counts[f"{priority.value}:rejected"],
+            }
+            for priority in Priority
+        },
     )
 
     # Mock alerts
@@ -37,6 +37,10 @@ class Settings(BaseSettings):
         default_factory=lambda: ["http://localhost:3000", "http://localhost:8080"],
         description="CORS allowed origins",
     )
+    openapi_schema_path: str = Field(
+        default="app/openapi.json",
+        description="Pre-generated OpenAPI document (python -m app.openapi)",
+    )
 
     # HANA Database
     hana_host: str = Field(..., description="SAP HANA host")
@@ -46,6 +50,31 @@ class Settings(BaseSettings):
     hana_database: str = Field(default="SYSTEMDB", description="SAP HANA database name")
     hana_encrypt: bool = Field(default=True, description="Use encrypted connection")
     hana_pool_size: int = Field(default=10, ge=1, le=50, description="Connection pool size")
+    hana_query_timeout_seconds: float = Field(
+        default=2.0, gt=0, le=60, description="Timeout of a single HANA query (seconds)"
+    )
+    hana_bulk_query_timeout_seconds: float = Field(
+        default=120.0, gt=0, le=1800, description="Timeout of bulk snapshot loads (seconds)"
+    )
+    hana_breaker_failure_threshold: int = Field(
+        default=5, ge=1, description="Consecutive HANA failures that open the circuit breaker"
+    )
+    hana_breaker_reset_seconds: float = Field(
+        default=10.0, gt=0, le=300, description="Open breaker time before a trial query (seconds)"
+    )
+    hana_read_endpoints: list[str] = Field(
+        default_factory=list,
+        description="Read endpoints (host:port) for hedged reads; empty = hana_host only",
+    )
+    hana_hedge_quantile: float = Field(
+        default=0.95, ge=0.5, le=0.999, description="Latency quantile after which reads are hedged"
+    )
+    hana_hedge_min_delay_ms: float = Field(
+        default=2.0, ge=0, description="Lower bound of the hedge delay (milliseconds)"
+    )
+    hana_mock_latency_ms: float = Field(
+        default=0.0, ge=0, description="Median random latency of mock HANA reads (0 = none)"
+    )
 
     # Redis Cache
     redis_host: str = Field(default="localhost", description="Redis host")
@@ -53,6 +82,9 @@ class Settings(BaseSettings):
     redis_password: str | None = Field(default=None, description="Redis password")
     redis_db: int = Field(default=0, ge=0, le=15, description="Redis database number")
     redis_ttl: int = Field(default=60, ge=10, le=300, description="Default TTL (seconds)")
+    cache_epoch_refresh_seconds: float = Field(
+        default=1.0, gt=0, le=60, description="Interval between warehouse state epoch checks"
+    )
 
     @property
     def redis_url(self) -> str:
@@ -75,6 +107,36 @@ class Settings(BaseSettings):
     rate_limit_simulate: int = Field(
         default=10, ge=1, description="Rate limit for /simulate (per minute)"
     )
+    rate_limit_sync_interval_seconds: float = Field(
+        default=1.0,
+        gt=0,
+        le=60,
+        description="Interval between reconciliations of local rate limits through Redis",
+    )
+    rate_limit_trusted_proxies: list[str] = Field(
+        default_factory=list,
+        description="Proxy addresses or networks (CIDR) whose X-Forwarded-For is trusted",
+    )
+
+    # Admission Control
+    admission_enabled: bool = Field(
+        default=True, description="Shed low-priority requests under overload"
+    )
+    admission_lag_threshold_ms: float = Field(
+        default=100.0, gt=0, description="Event-loop lag at which low-priority work is shed"
+    )
+    admission_capacity_check_concurrency: int = Field(
+        default=64, ge=1, description="Concurrent /capacity/check requests per worker"
+    )
+    admission_simulate_concurrency: int = Field(
+        default=4, ge=1, description="Concurrent /simulate requests per worker"
+    )
+    admission_queue_size: int = Field(
+        default=128, ge=0, description="Requests allowed to wait for a bulkhead slot"
+    )
+    admission_queue_timeout_ms: float = Field(
+        default=500.0, gt=0, description="Longest wait for a bulkhead slot"
+    )
 
     # Business Logic Configuration
     max_utilization: float = Field(
@@ -89,11 +151,113 @@ class Settings(BaseSettings):
     congestion_alpha: float = Field(
         default=1.2, ge=0.5, le=2.0, description="Congestion factor alpha"
     )
+    threshold_table_max_age_seconds: float = Field(
+        default=5.0, ge=0, le=300, description="Reuse a warehouse threshold table for (seconds)"
+    )
+    stale_snapshot_max_age_seconds: float = Field(
+        default=900.0,
+        ge=0,
+        le=3600,
+        description="Oldest last-known-good snapshot used when HANA is unavailable (seconds)",
+    )
+    stale_snapshot_confidence_factor: float = Field(
+        default=0.5, ge=0, le=1, description="Confidence multiplier for stale-snapshot decisions"
+    )
+
+    # Shared Snapshot
+    shared_snapshot_enabled: bool = Field(
+        default=False, description="Share warehouse snapshots between workers via mmap"
+    )
+    shared_snapshot_path: str = Field(
+        default="/dev/shm/cutoff-warehouse-snapshot",
+        description="Memory-mapped snapshot file (the publisher lock is <path>.lock)",
+    )
+    shared_snapshot_max_warehouses: int = Field(
+        default=256, ge=1, le=65_536, description="Warehouse slots in the snapshot file"
+    )
+    shared_snapshot_interval_seconds: float = Field(
+        default=2.0, gt=0, le=60, description="Interval between snapshot publishes (seconds)"
+    )
+    shared_snapshot_max_age_seconds: float = Field(
+        default=15.0,
+        gt=0,
+        description="Older shared entries are served as stale snapshots (seconds)",
+    )
+
+    # Startup
+    warmup_enabled: bool = Field(
+        default=True, description="Warm up services before reporting ready on /ready"
+    )
+
+    # Health Probes
+    health_probe_interval_seconds: float = Field(
+        default=5.0, ge=0.5, le=300, description="Interval between dependency health probes"
+    )
+    health_probe_timeout_seconds: float = Field(
+        default=1.0, gt=0, le=30, description="Timeout of one health probe (seconds)"
+    )
+    health_probe_slow_ms: float = Field(
+        default=250.0, ge=0, description="Probe latency above which a component is degraded"
+    )
 
     # Monitoring
     metrics_enabled: bool = Field(default=True, description="Enable Prometheus metrics")
     metrics_path: str = Field(default="/metrics", description="Metrics endpoint path")
 
+    # Utilization History
+    utilization_history_dir: str | None = Field(
+        default=None, description="Directory for persisted utilization series (None = memory only)"
+    )
+    utilization_history_persist_seconds: float = Field(
+        default=60.0, ge=1, description="Interval between utilization history persists (seconds)"
+    )
+    utilization_history_max_warehouses: int = Field(
+        default=256, ge=1, description="Warehouse series kept before evicting the least recent"
+    )
+
+    # Decision Audit Log
+    audit_enabled: bool = Field(default=True, description="Record decisions to the audit log")
+    audit_dir: str = Field(default="audit", description="Directory for audit segment files")
+    audit_buffer_size: int = Field(
+        default=100_000, ge=1000, description="Maximum buffered audit records"
+    )
+    audit_batch_size: int = Field(
+        default=5_000, ge=1, description="Buffered records that trigger an early flush"
+    )
+    audit_flush_interval_seconds: float = Field(
+        default=1.0, gt=0, le=60, description="Maximum time between audit flushes (seconds)"
+    )
+    audit_segment_max_rows: int = Field(
+        default=1_000_000, ge=1000, description="Rows per audit segment before rotation"
+    )
+    audit_segment_max_age_seconds: float = Field(
+        default=300.0, gt=0, description="Age of an audit segment before rotation (seconds)"
+    )
+
+    # Event Ingestion
+    event_ingestion_enabled: bool = Field(
+        default=False, description="Consume order/delivery events from the Redis Stream"
+    )
+    event_stream_key: str = Field(default="cutoff:events", description="Redis Stream of events")
+    event_batch_size: int = Field(
+        default=1000, ge=1, le=10_000, description="Entries read per batch"
+    )
+    event_block_ms: int = Field(
+        default=1000, ge=0, description="Time a read blocks while the stream is idle (ms)"
+    )
+    event_dedupe_window: int = Field(
+        default=100_000, ge=1000, description="Recent event ids remembered for deduplication"
+    )
+
+    # Order Workload Snapshot
+    order_snapshot_path: str | None = Field(
+        default=None,
+        description="Parquet export of V_ORDER_WORKLOAD to load (None = fetch from HANA)",
+    )
+    order_snapshot_batch_size: int = Field(
+        default=65_536, ge=1024, description="Rows per Arrow record batch fetched from HANA"
+    )
+
     # Security
     jwt_secret_key: str = Field(
         default="changeme-in-production-use-strong-random-key",
@@ -103,6 +267,22 @@ class Settings(BaseSettings):
     jwt_expiration_minutes: int = Field(
         default=60, ge=5, le=1440, description="JWT expiration (minutes)"
     )
+    jwt_cache_size: int = Field(
+        default=10_000, ge=0, description="Verified tokens cached until expiry (0 = disabled)"
+    )
+    jwt_audience: str | None = Field(
+        default=None, description="Expected aud claim (required if tokens carry one)"
+    )
+    jwt_jwks_url: str | None = Field(
+        default=None,
+        description="JWKS URL or file path of the identity provider (None = shared secret)",
+    )
+    jwks_refresh_seconds: float = Field(
+        default=3600.0, ge=60, description="Background JWKS reload interval (jittered +/-10%)"
+    )
+    jwks_min_refresh_seconds: float = Field(
+        default=30.0, ge=0, description="Least time between JWKS reloads for unknown kids"
+    )
 
 
 @lru_cache
@@ -1,31 +1,57 @@
-"""Core utilities for Cutoff Time API."""
-
-from app.core.auth import (
-    User,
-    create_access_token,
-    get_current_user,
-    require_admin_scope,
-    require_read_scope,
-    require_write_scope,
-)
-from app.core.cache import CacheClient, get_cache
-from app.core.logging import configure_logging, get_logger
-from app.core.metrics import initialize_metrics
-
-__all__ = [
+"""Core utilities for Cutoff Time API.
+
+Names are resolved lazily (PEP 562) so that importing one submodule, e.g.
+app.core.logging, does not pull in auth (python-jose) or the Redis client.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    # Explicit "as" re-exports for type checkers; nothing is imported at runtime
+    from app.core.auth import User as User
+    from app.core.auth import create_access_token as create_access_token
+    from app.core.auth import get_current_user as get_current_user
+    from app.core.auth import require_admin_scope as require_admin_scope
+    from app.core.auth import require_read_scope as require_read_scope
+    from app.core.auth import require_write_scope as require_write_scope
+    from app.core.cache import CacheClient as CacheClient
+    from app.core.cache import get_cache as get_cache
+    from app.core.logging import configure_logging as configure_logging
+    from app.core.logging import get_logger as get_logger
+    from app.core.metrics import initialize_metrics as initialize_metrics
+
+_EXPORTS = {
     # Auth
-    "User",
-    "create_access_token",
-    "get_current_user",
-    "require_read_scope",
-    "require_write_scope",
-    "require_admin_scope",
+    "User": "app.core.auth",
+    "create_access_token": "app.core.auth",
+    "get_current_user": "app.core.auth",
+    "require_read_scope": "app.core.auth",
+    "require_write_scope": "app.core.auth",
+    "require_admin_scope": "app.core.auth",
     # Cache
-    "CacheClient",
-    "get_cache",
+    "CacheClient": "app.core.cache",
+    "get_cache": "app.core.cache",
     # Logging
-    "configure_logging",
-    "get_logger",
+    "configure_logging": "app.core.logging",
+    "get_logger": "app.core.logging",
     # Metrics
-    "initialize_metrics",
-]
+    "initialize_metrics": "app.core.metrics",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import the defining submodule on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Include lazily exported names."""
+    return sorted(set(globals()) | set(__all__))
@@ -3,16 +3,22 @@ Authentication and authorization utilities.
 JWT token validation and OAuth 2.0 integration placeholder.
 """
 
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
-from pydantic import BaseModel
+from jose.backends.base import Key
+from pydantic import BaseModel, PrivateAttr
 
 from app.config import get_settings
+from app.core.jwks import get_jwks_provider
 from app.core.logging import get_logger
+from app.core.metrics import cache_hits_total, cache_misses_total
 
 logger = get_logger(__name__)
 
@@ -34,6 +40,119 @@ class User(BaseModel):
     scopes: list[str] = []
     is_active: bool = True
 
+    # Scopes as a set, built once per verified token for O(1) scope checks
+    _scope_set: frozenset[str] = PrivateAttr(default=frozenset())
+
+    def model_post_init(self, __context: object) -> None:
+        """Precompute the scope set."""
+        self._scope_set = frozenset(self.scopes)
+
+    def has_scope(self, scope: str) -> bool:
+        """Check whether the user was granted a scope."""
+        return scope in self._scope_set
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of users of already verified tokens.
+
+    Entries are keyed by a digest of the token, so raw tokens are not kept
+    in memory, and expire with the token's exp claim. A token is verified
+    once and then served from the cache until it expires or is evicted, or
+    the JWKS key set changes (see sync_key_set).
+    """
+
+    def __init__(self, max_size: int = 10_000) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            max_size: Maximum number of cached tokens (0 disables caching)
+        """
+        self.max_size = max_size
+        self.key_set_version = 0
+        self._entries: OrderedDict[bytes, tuple[User, float]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        """Digest identifying a token."""
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str) -> Optional[User]:
+        """
+        Get the user of a verified, unexpired token.
+
+        Args:
+            token: JWT token string
+
+        Returns:
+            Cached user, or None if the token is unknown or expired
+        """
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        user, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return user
+
+    def put(self, token: str, user: User, expires_at: float) -> None:
+        """
+        Cache the user of a verified token.
+
+        Args:
+            token: JWT token string
+            user: User built from the token
+            expires_at: Token expiry (Unix time)
+        """
+        if self.max_size <= 0:
+            return
+        key = self._key(token)
+        self._entries[key] = (user, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached tokens (e.g. after rotating the signing key)."""
+        self._entries.clear()
+
+    def sync_key_set(self, key_set_version: int) -> None:
+        """
+        Drop all cached tokens if the signing keys changed since they were verified.
+
+        Args:
+            key_set_version: Current JWKSProvider.key_set_version
+        """
+        if key_set_version == self.key_set_version:
+            return
+        if self._entries:
+            logger.info("verified_tokens_cleared", tokens=len(self._entries))
+            self._entries.clear()
+        self.key_set_version = key_set_version
+
+    def __len__(self) -> int:
+        """Number of cached tokens."""
+        return len(self._entries)
+
+
+# Global verified-token cache
+_token_cache: Optional[VerifiedTokenCache] = None
+
+
+def get_token_cache() -> VerifiedTokenCache:
+    """Get global verified-token cache instance, cleared if the JWKS key set changed."""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = VerifiedTokenCache(max_size=get_settings().jwt_cache_size)
+    provider = get_jwks_provider()
+    if provider is not None:
+        _token_cache.sync_key_set(provider.key_set_version)
+    return _token_cache
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -61,12 +180,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> TokenData:
+def decode_access_token(token: str, key: Optional[Key] = None) -> TokenData:
     """
     Decode and validate JWT token.
 
     Args:
         token: JWT token string
+        key: Verification key (defaults to the shared jwt_secret_key)
 
     Returns:
         Token data
@@ -83,7 +203,10 @@ def decode_access_token(token: str) -> TokenData:
 
     try:
         payload = jwt.decode(
-            token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm]
+            token,
+            key if key is not None else settings.jwt_secret_key,
+            algorithms=[settings.jwt_algorithm],
+            audience=settings.jwt_audience,
         )
         username: Optional[str] = payload.get("sub")
         if username is None:
@@ -100,6 +223,38 @@ def decode_access_token(token: str) -> TokenData:
         raise credentials_exception
 
 
+async def _signing_key(token: str) -> Optional[Key]:
+    """
+    Look up the JWKS key a token was signed with.
+
+    Args:
+        token: JWT token string
+
+    Returns:
+        Key from the JWKS provider, or None to use the shared secret
+
+    Raises:
+        HTTPException: 401 if the token's kid matches no known key
+    """
+    provider = get_jwks_provider()
+    if provider is None:
+        return None
+
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+    except JWTError:
+        kid = None
+    key = await provider.get_key(kid)
+    if key is None:
+        logger.warning("jwt_unknown_kid", kid=kid)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return key
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> User:
@@ -116,7 +271,14 @@ async def get_current_user(
         HTTPException: If authentication fails
     """
     token = credentials.credentials
-    token_data = decode_access_token(token)
+    token_cache = get_token_cache()
+    cached = token_cache.get(token)
+    if cached is not None:
+        cache_hits_total.labels(cache_type="auth_token").inc()
+        return cached
+    cache_misses_total.labels(cache_type="auth_token").inc()
+
+    token_data = decode_access_token(token, await _signing_key(token))
 
     if token_data.username is None:
         raise HTTPException(
@@ -131,12 +293,16 @@ async def get_current_user(
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
 
+    # Tokens without exp are verified on every request
+    if token_data.exp is not None:
+        token_cache.put(token, user, token_data.exp.timestamp())
+
     return user
 
 
-async def require_scope(required_scope: str, user: User = Depends(get_current_user)) -> User:
+def require_scope(required_scope: str, user: User) -> User:
     """
-    Dependency to require specific scope.
+    Check that the user has a specific scope.
 
     Args:
         required_scope: Required scope (e.g., 'cutoff.read', 'cutoff.write')
@@ -148,7 +314,7 @@ async def require_scope(required_scope: str, user: User = Depends(get_current_us
     Raises:
         HTTPException: If user doesn't have required scope
     """
-    if required_scope not in user.scopes:
+    if not user.has_scope(required_scope):
         logger.warning(
             "scope_denied",
             user=user.username,
@@ -163,18 +329,18 @@ async def require_scope(required_scope: str, user: User = Depends(get_current_us
     return user
 
 
-# Dependency factories for common scopes
-def require_read_scope(user: User = Depends(get_current_user)) -> User:
+# Dependency factories for common scopes (async: no threadpool hop per request)
+async def require_read_scope(user: User = Depends(get_current_user)) -> User:
     """Require cutoff.read scope."""
     return require_scope("cutoff.read", user)
 
 
-def require_write_scope(user: User = Depends(get_current_user)) -> User:
+async def require_write_scope(user: User = Depends(get_current_user)) -> User:
     """Require cutoff.write scope."""
     return require_scope("cutoff.write", user)
 
 
-def require_admin_scope(user: User = Depends(get_current_user)) -> User:
+async def require_admin_scope(user: User = Depends(get_current_user)) -> User:
     """Require cutoff.admin scope."""
     return require_scope("cutoff.admin", user)
 
@@ -43,6 +43,16 @@ class CacheClient:
             await self._redis.close()
             logger.info("redis_disconnected")
 
+    async def ping(self) -> None:
+        """
+        Check that Redis answers.
+
+        Raises:
+            RuntimeError: If the client is not connected
+            redis.exceptions.RedisError: If Redis cannot be reached
+        """
+        await self.redis.ping()
+
     @property
     def redis(self) -> Redis:
         """Get Redis client instance."""
@@ -54,17 +64,19 @@ class CacheClient:
         """
         Generate cache key from prefix and parameters.
 
+        Parameters are serialized canonically (sorted keys, compact separators)
+        and hashed with 128-bit BLAKE2b, so collisions are negligible even at
+        billions of keys.
+
         Args:
             prefix: Key prefix (e.g., 'capacity', 'cutoff')
-            **kwargs: Parameters to include in key
+            **kwargs: Parameters to include in key (JSON-serializable or str()-able)
 
         Returns:
             Cache key string
         """
-        # Sort kwargs for consistent key generation
-        sorted_params = sorted(kwargs.items())
-        param_str = json.dumps(sorted_params, sort_keys=True)
-        param_hash = hashlib.md5(param_str.encode()).hexdigest()[:8]
+        param_str = json.dumps(kwargs, sort_keys=True, separators=(",", ":"), default=str)
+        param_hash = hashlib.blake2b(param_str.encode(), digest_size=16).hexdigest()
         return f"{prefix}:{param_hash}"
 
     async def get(self, key: str) -> Optional[str]:
@@ -88,6 +100,22 @@ class CacheClient:
             logger.error("cache_get_error", key=key, error=str(e))
             return None
 
+    async def get_many(self, keys: list[str]) -> Optional[list[Optional[str]]]:
+        """
+        Get several values in one round trip (MGET).
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Value per key (None where missing), or None if Redis is unavailable
+        """
+        try:
+            return await self.redis.mget(keys)
+        except Exception as e:
+            logger.error("cache_get_many_error", keys=len(keys), error=str(e))
+            return None
+
     async def set(
         self, key: str, value: str, ttl: Optional[int] = None
     ) -> bool:
@@ -147,6 +175,28 @@ class CacheClient:
             logger.error("cache_increment_error", key=key, error=str(e))
             return 0
 
+    async def increment_many(self, amounts: dict[str, int], ttl: int) -> Optional[dict[str, int]]:
+        """
+        Increment several counters and refresh their TTL, in one pipeline.
+
+        Args:
+            amounts: Amount to add per counter key
+            ttl: Time-to-live in seconds
+
+        Returns:
+            New counter value per key, or None if Redis is unavailable
+        """
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, amount in amounts.items():
+                pipe.incrby(key, amount)
+                pipe.expire(key, ttl)
+            results = await pipe.execute()
+            return {key: int(value) for key, value in zip(amounts, results[::2])}
+        except Exception as e:
+            logger.error("cache_increment_many_error", keys=len(amounts), error=str(e))
+            return None
+
     async def expire(self, key: str, ttl: int) -> bool:
         """
         Set TTL on existing key.
@@ -0,0 +1,169 @@
+"""
+Circuit breaker with per-call timeouts for calls to slow dependencies.
+
+    CLOSED     calls pass; consecutive failures (connection errors or
+               timeouts) are counted
+    OPEN       after failure_threshold failures calls fail fast with
+               CircuitOpenError until reset_timeout_seconds have passed
+    HALF_OPEN  one trial call is let through; success closes the breaker,
+               failure opens it again
+
+Every call is bounded by a timeout, so a dependency brownout costs at most
+failure_threshold timeouts before callers are failed in microseconds.
+
+Only failure_exceptions (by default OSError, which covers ConnectionError,
+and timeouts) count as failures. Any other exception, e.g. a
+SQL error or a bug in the caller's code, means the dependency answered: it
+is re-raised and counted as a success.
+"""
+
+import asyncio
+import time
+from enum import Enum
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from app.core.logging import get_logger
+from app.core.metrics import circuit_breaker_rejections_total, circuit_breaker_state
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class BreakerState(str, Enum):
+    """Circuit breaker state (gauge value in parentheses)."""
+
+    CLOSED = "closed"  # (0)
+    HALF_OPEN = "half_open"  # (1)
+    OPEN = "open"  # (2)
+
+
+_STATE_VALUES = {BreakerState.CLOSED: 0, BreakerState.HALF_OPEN: 1, BreakerState.OPEN: 2}
+
+# Connection errors and timeouts (asyncio.TimeoutError is an OSError since Python 3.11)
+DEFAULT_FAILURE_EXCEPTIONS: tuple[type[BaseException], ...] = (OSError, asyncio.TimeoutError)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the dependency while the breaker is open."""
+
+    def __init__(self, name: str, retry_after_seconds: float) -> None:
+        """
+        Initialize error.
+
+        Args:
+            name: Breaker name
+            retry_after_seconds: Time until the next trial call is allowed
+        """
+        super().__init__(f"Circuit '{name}' is open (retry in {retry_after_seconds:.1f}s)")
+        self.name = name
+        self.retry_after_seconds = retry_after_seconds
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for async calls."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+        failure_exceptions: tuple[type[BaseException], ...] = DEFAULT_FAILURE_EXCEPTIONS,
+    ) -> None:
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Dependency name (metrics label)
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout_seconds: Open time before a trial call is allowed
+            clock: Monotonic time source (injectable for tests)
+            failure_exceptions: Exceptions that count as dependency failures
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.failure_exceptions = failure_exceptions
+        self.clock = clock
+        self.state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        circuit_breaker_state.labels(breaker=name).set(0)
+
+    async def call(self, func: Callable[[], Awaitable[T]], timeout: Optional[float]) -> T:
+        """
+        Run func through the breaker.
+
+        Args:
+            func: Zero-argument coroutine function performing the call
+            timeout: Seconds before the call is cancelled and counted as failed
+
+        Returns:
+            Result of func
+
+        Raises:
+            CircuitOpenError: If the breaker is open (func is not called)
+            asyncio.TimeoutError: If the call timed out
+            Exception: Whatever func raised
+        """
+        self._before_call()
+        try:
+            result = await asyncio.wait_for(func(), timeout)
+        except asyncio.CancelledError:
+            # Caller went away: neither success nor failure of the dependency
+            self._trial_running = False
+            raise
+        except self.failure_exceptions:
+            self._on_failure()
+            raise
+        except Exception:
+            # The dependency answered; the error is the caller's to handle
+            self._on_success()
+            raise
+        self._on_success()
+        return result
+
+    def _before_call(self) -> None:
+        """Reject the call while open; let one trial through once the reset timeout passed."""
+        if self.state == BreakerState.CLOSED:
+            return
+
+        remaining = self._opened_at + self.reset_timeout_seconds - self.clock()
+        if self.state == BreakerState.OPEN and remaining <= 0:
+            self._set_state(BreakerState.HALF_OPEN)
+
+        if self.state == BreakerState.HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return
+
+        circuit_breaker_rejections_total.labels(breaker=self.name).inc()
+        raise CircuitOpenError(self.name, max(remaining, 0.0))
+
+    def _on_success(self) -> None:
+        """Close the breaker after a successful call."""
+        self._failures = 0
+        self._trial_running = False
+        if self.state != BreakerState.CLOSED:
+            self._set_state(BreakerState.CLOSED)
+
+    def _on_failure(self) -> None:
+        """Count a failure; open the breaker at the threshold or after a failed trial."""
+        self._failures += 1
+        self._trial_running = False
+        if self.state == BreakerState.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = self.clock()
+            self._set_state(BreakerState.OPEN)
+
+    def _set_state(self, state: BreakerState) -> None:
+        """Transition to a new state."""
+        logger.warning(
+            "circuit_breaker_state_changed",
+            breaker=self.name,
+            old_state=self.state.value,
+            new_state=state.value,
+            failures=self._failures,
+        )
+        self.state = state
+        circuit_breaker_state.labels(breaker=self.name).set(_STATE_VALUES[state])
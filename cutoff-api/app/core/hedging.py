@@ -0,0 +1,166 @@
+"""
+Hedged reads across equivalent endpoints (replicas).
+
+A read is sent to one endpoint. If it has not answered within the recent p95
+latency of that query type, the same read is sent to the next endpoint; the
+first successful answer wins and the other attempt is cancelled. Only the
+slowest ~5% of reads are duplicated, which cuts tail latency for a few
+percent of extra load.
+"""
+
+import asyncio
+import itertools
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from app.core.metrics import hedge_issued_total, hedge_reads_total, hedge_wins_total
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Sliding-window latency quantile of one query type."""
+
+    def __init__(self, quantile: float = 0.95, window: int = 256, min_samples: int = 20) -> None:
+        """
+        Initialize tracker.
+
+        Args:
+            quantile: Quantile used as the hedge delay
+            window: Number of recent latencies kept
+            min_samples: Samples needed before the quantile is trusted
+        """
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+        self._cached: Optional[float] = None
+        self._since_update = 0
+
+    def record(self, seconds: float) -> None:
+        """Record the latency of a completed attempt."""
+        self._samples.append(seconds)
+        self._since_update += 1
+        # Re-sorting every 16 samples keeps the quantile cheap to read
+        if self._since_update >= 16:
+            self._cached = None
+
+    def value(self) -> Optional[float]:
+        """
+        Current latency quantile.
+
+        Returns:
+            Quantile in seconds, or None until min_samples were recorded
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+        if self._cached is None:
+            ordered = sorted(self._samples)
+            rank = max(math.ceil(self.quantile * len(ordered)) - 1, 0)
+            self._cached = ordered[min(rank, len(ordered) - 1)]
+            self._since_update = 0
+        return self._cached
+
+
+class HedgedReader:
+    """Runs reads against a pool of endpoints, hedging slow ones."""
+
+    def __init__(
+        self,
+        endpoints: list[str],
+        quantile: float = 0.95,
+        min_delay_seconds: float = 0.002,
+        default_delay_seconds: float = 0.05,
+    ) -> None:
+        """
+        Initialize reader.
+
+        Args:
+            endpoints: Equivalent read endpoints; reads rotate over them
+            quantile: Latency quantile used as the hedge delay
+            min_delay_seconds: Lower bound of the hedge delay
+            default_delay_seconds: Hedge delay until enough latencies are known
+        """
+        if not endpoints:
+            raise ValueError("At least one read endpoint is required")
+        self.endpoints = list(endpoints)
+        self.quantile = quantile
+        self.min_delay_seconds = min_delay_seconds
+        self.default_delay_seconds = default_delay_seconds
+        self._trackers: dict[str, LatencyTracker] = {}
+        self._next = itertools.cycle(range(len(self.endpoints)))
+
+    def hedge_delay(self, query_type: str) -> float:
+        """
+        Delay before a read of this type is hedged.
+
+        Args:
+            query_type: Query name
+
+        Returns:
+            Seconds to wait for the primary attempt
+        """
+        tracker = self._trackers.get(query_type)
+        value = tracker.value() if tracker else None
+        if value is None:
+            return self.default_delay_seconds
+        return max(value, self.min_delay_seconds)
+
+    async def read(self, query_type: str, func: Callable[[str], Awaitable[T]]) -> T:
+        """
+        Run a read, hedging it on another endpoint if it is slow.
+
+        Args:
+            query_type: Query name (latencies are tracked per type)
+            func: Coroutine function performing the read against an endpoint
+
+        Returns:
+            First successful result
+
+        Raises:
+            Exception: The primary's error if every attempt failed
+        """
+        hedge_reads_total.labels(query_type=query_type).inc()
+        tracker = self._trackers.setdefault(query_type, LatencyTracker(self.quantile))
+
+        if len(self.endpoints) == 1:
+            return await self._timed(tracker, func, self.endpoints[0])
+
+        first = next(self._next)
+        primary = asyncio.ensure_future(self._timed(tracker, func, self.endpoints[first]))
+        hedge: Optional[asyncio.Future] = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay(query_type))
+            if done and primary.exception() is None:
+                return primary.result()
+
+            # Primary is slow (or failed fast): duplicate on the next endpoint
+            hedge_issued_total.labels(query_type=query_type).inc()
+            second = self.endpoints[(first + 1) % len(self.endpoints)]
+            hedge = asyncio.ensure_future(self._timed(tracker, func, second))
+            pending = {primary, hedge} - done
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            hedge_wins_total.labels(query_type=query_type).inc()
+                        return task.result()
+            # Both attempts failed: report the primary's error
+            return primary.result()
+        finally:
+            # Cancel the loser, or both attempts if the caller gave up
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    @staticmethod
+    async def _timed(
+        tracker: LatencyTracker, func: Callable[[str], Awaitable[T]], endpoint: str
+    ) -> T:
+        """Run one attempt and record its latency if it completes."""
+        started = time.perf_counter()
+        result = await func(endpoint)
+        tracker.record(time.perf_counter() - started)
+        return result
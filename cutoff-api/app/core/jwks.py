@@ -0,0 +1,241 @@
+"""
+JWKS signing-key provider for RS256 (OAuth/XSUAA) tokens.
+
+Keys are loaded from a JWKS URL or a local file, parsed once into key
+objects and cached by kid, so verifying a token never waits on the identity
+provider. A background task reloads the set on an interval with random
+jitter (workers do not refresh in lockstep) and keeps the previous keys if a
+reload fails. A token with an unknown kid, e.g. right after a key rotation,
+triggers one refresh that all concurrent requests share; such refreshes are
+throttled so random kids cannot hammer the identity provider.
+
+key_set_version changes whenever a reload adds, drops or replaces a key;
+the verified-token cache of app.core.auth is cleared when it does, so
+tokens signed by a withdrawn key are not served from the cache.
+"""
+
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import httpx
+from jose import jwk
+from jose.backends.base import Key
+
+from app.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import jwks_refresh_total
+
+logger = get_logger(__name__)
+
+
+class JWKSProvider:
+    """Caches JWKS signing keys by kid and keeps them fresh in the background."""
+
+    def __init__(
+        self,
+        source: str,
+        algorithm: str = "RS256",
+        refresh_interval_seconds: float = 3600.0,
+        refresh_jitter: float = 0.1,
+        min_refresh_interval_seconds: float = 30.0,
+        http_client: Optional[httpx.AsyncClient] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize provider.
+
+        Args:
+            source: JWKS URL (http/https) or local file path
+            algorithm: Algorithm of keys that do not declare one
+            refresh_interval_seconds: Interval between background reloads
+            refresh_jitter: Random +/- fraction applied to the interval
+            min_refresh_interval_seconds: Least time between reloads caused by unknown kids
+            http_client: Client used for URL sources (injectable for tests)
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.source = source
+        self.algorithm = algorithm
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.refresh_jitter = refresh_jitter
+        self.min_refresh_interval_seconds = min_refresh_interval_seconds
+        self.clock = clock
+        self.keys: dict[str, Key] = {}
+        self.key_set_version = 0
+        self._http_client = http_client
+        self._last_refresh: Optional[float] = None
+        self._refreshing: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_url(self) -> bool:
+        """Whether keys are fetched over HTTP."""
+        return self.source.startswith(("http://", "https://"))
+
+    async def start(self) -> None:
+        """Load the keys, then reload them in the background."""
+        if self._task is not None:
+            return
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.error("jwks_initial_load_failed", source=self.source, error=str(e))
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop background reloads."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    def next_refresh_delay(self) -> float:
+        """Interval until the next background reload, with jitter."""
+        jitter = random.uniform(-self.refresh_jitter, self.refresh_jitter)
+        return self.refresh_interval_seconds * (1 + jitter)
+
+    async def _run(self) -> None:
+        """Reload keys on a jittered interval; keep the old keys on failure."""
+        while True:
+            await asyncio.sleep(self.next_refresh_delay())
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("jwks_refresh_failed", source=self.source, error=str(e))
+
+    async def refresh(self) -> int:
+        """
+        Reload the key set, joining a reload that is already running.
+
+        Returns:
+            Number of keys loaded
+
+        Raises:
+            Exception: If the key set could not be fetched or parsed
+        """
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self._load())
+        # Shielded: a caller going away must not cancel the shared reload
+        return await asyncio.shield(self._refreshing)
+
+    async def _load(self) -> int:
+        """Fetch, parse and publish the key set."""
+        self._last_refresh = self.clock()
+        try:
+            document = await self._fetch()
+            keys = self.parse(document)
+        except Exception:
+            jwks_refresh_total.labels(result="error").inc()
+            raise
+        if self._key_material(keys) != self._key_material(self.keys):
+            self.key_set_version += 1
+        self.keys = keys
+        jwks_refresh_total.labels(result="ok").inc()
+        logger.info("jwks_refreshed", source=self.source, kids=sorted(keys))
+        return len(keys)
+
+    @staticmethod
+    def _key_material(keys: dict[str, Key]) -> dict[str, dict[str, Any]]:
+        """Comparable form of a key set."""
+        return {kid: key.to_dict() for kid, key in keys.items()}
+
+    async def _fetch(self) -> dict[str, Any]:
+        """Read the JWKS document from the URL or file."""
+        if not self.is_url:
+            text = await asyncio.to_thread(Path(self.source).read_text)
+            return json.loads(text)
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=5.0)
+        response = await self._http_client.get(self.source)
+        response.raise_for_status()
+        return response.json()
+
+    def parse(self, document: dict[str, Any]) -> dict[str, Key]:
+        """
+        Parse the signing keys of a JWKS document.
+
+        Args:
+            document: JWKS document ({"keys": [...]})
+
+        Returns:
+            Key objects by kid
+
+        Raises:
+            ValueError: If the document contains no usable signing key
+        """
+        keys = {}
+        for entry in document.get("keys", []):
+            if entry.get("use", "sig") != "sig" or "kid" not in entry:
+                continue
+            try:
+                keys[entry["kid"]] = jwk.construct(entry, entry.get("alg", self.algorithm))
+            except Exception as e:
+                logger.warning("jwks_key_skipped", kid=entry["kid"], error=str(e))
+        if not keys:
+            raise ValueError("JWKS contains no usable signing keys")
+        return keys
+
+    async def get_key(self, kid: Optional[str]) -> Optional[Key]:
+        """
+        Get the key for a token's kid, refreshing once if it is unknown.
+
+        Args:
+            kid: Key id from the token header (None if the header has none)
+
+        Returns:
+            Key object, or None if no key matches
+        """
+        key = self._lookup(kid)
+        if key is not None:
+            return key
+
+        # Unknown kid: possibly a rotated key, reload unless we just did
+        if (
+            self._last_refresh is None
+            or self.clock() - self._last_refresh >= self.min_refresh_interval_seconds
+            or (self._refreshing is not None and not self._refreshing.done())
+        ):
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("jwks_refresh_failed", source=self.source, error=str(e))
+        return self._lookup(kid)
+
+    def _lookup(self, kid: Optional[str]) -> Optional[Key]:
+        """Cached key by kid; a token without kid matches a single-key set."""
+        if kid is None:
+            return next(iter(self.keys.values())) if len(self.keys) == 1 else None
+        return self.keys.get(kid)
+
+
+# Global provider instance
+_jwks_provider: Optional[JWKSProvider] = None
+
+
+def get_jwks_provider() -> Optional[JWKSProvider]:
+    """
+    Get global JWKS provider instance.
+
+    Returns:
+        Provider, or None if no JWKS source is configured
+    """
+    global _jwks_provider
+    settings = get_settings()
+    if _jwks_provider is None and settings.jwt_jwks_url:
+        _jwks_provider = JWKSProvider(
+            source=settings.jwt_jwks_url,
+            algorithm=settings.jwt_algorithm,
+            refresh_interval_seconds=settings.jwks_refresh_seconds,
+            min_refresh_interval_seconds=settings.jwks_min_refresh_seconds,
+        )
+    return _jwks_provider
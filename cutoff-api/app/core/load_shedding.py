@@ -0,0 +1,316 @@
+"""
+Priority-aware admission control and load shedding.
+
+Requests to guarded endpoints pass through an AdmissionController:
+
+    event-loop lag   a background task measures how late the loop wakes up.
+                     Above the lag threshold, low-priority work is shed with
+                     503 before it adds more load: background work (e.g.
+                     /simulate) first, STANDARD at 2x the threshold,
+                     EXPRESS at 4x.
+    bulkheads        each endpoint has its own concurrency limit, so one
+                     endpoint cannot take every worker slot. Requests over
+                     the limit wait in a queue ordered by priority and are
+                     rejected with 429 if the queue is full or they waited
+                     too long.
+
+Priority.VIP requests are never shed and bypass the bulkhead queue.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from app.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import (
+    admission_in_flight,
+    admission_queue_wait_seconds,
+    admission_shed_total,
+    event_loop_lag_seconds,
+)
+from app.models.domain import Priority
+from app.models.responses import ErrorResponse
+
+logger = get_logger(__name__)
+
+# Lower rank = more important; None is background work without an order priority
+_RANKS = {Priority.VIP: 0, Priority.EXPRESS: 1, Priority.STANDARD: 2, None: 3}
+
+# Interval of the event-loop lag probe
+LAG_SAMPLE_INTERVAL_SECONDS = 0.05
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of being processed."""
+
+    def __init__(self, status_code: int, error: str, message: str, retry_after_seconds: int = 1):
+        """
+        Initialize error.
+
+        Args:
+            status_code: HTTP status (429 or 503)
+            error: Error code of the ErrorResponse
+            message: Error message
+            retry_after_seconds: Value of the Retry-After header
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.error = error
+        self.retry_after_seconds = retry_after_seconds
+
+
+class Bulkhead:
+    """Concurrency limit of one endpoint with a priority-ordered wait queue."""
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout_seconds: float,
+    ) -> None:
+        """
+        Initialize bulkhead.
+
+        Args:
+            name: Endpoint name (metrics label)
+            max_concurrent: Requests processed at the same time
+            max_queue: Requests allowed to wait for a slot
+            queue_timeout_seconds: Longest wait for a slot
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.active = 0
+        self.queued = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    async def acquire(self, rank: int, bypass: bool = False) -> None:
+        """
+        Take a slot, waiting in the queue if the endpoint is busy.
+
+        Args:
+            rank: Priority rank (lower is served first)
+            bypass: Take a slot immediately, even above the limit
+
+        Raises:
+            AdmissionRejected: 429 if the queue is full or the wait timed out
+        """
+        if bypass or (self.active < self.max_concurrent and not self.queued):
+            self.active += 1
+            return
+
+        if self.queued >= self.max_queue:
+            raise AdmissionRejected(
+                429, "TOO_MANY_REQUESTS", f"Too many concurrent {self.name} requests"
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (rank, next(self._seq), waiter))
+        self.queued += 1
+        try:
+            await asyncio.wait({waiter}, timeout=self.queue_timeout_seconds)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        if not waiter.done():
+            self._abandon(waiter)
+            raise AdmissionRejected(
+                429, "TOO_MANY_REQUESTS", f"Timed out waiting for a {self.name} slot"
+            )
+        # The releasing request handed its slot over (active is unchanged)
+
+    def release(self) -> None:
+        """Free a slot, handing it to the most important waiter if any."""
+        if self.active <= self.max_concurrent:
+            while self._waiters:
+                _, _, waiter = heapq.heappop(self._waiters)
+                if not waiter.done():
+                    self.queued -= 1
+                    waiter.set_result(None)
+                    return
+        self.active -= 1
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        """Leave the queue; give back the slot if it was handed over meanwhile."""
+        if waiter.done() and not waiter.cancelled():
+            self.release()
+            return
+        waiter.cancel()
+        self.queued -= 1
+
+
+class AdmissionController:
+    """Admits, queues or sheds requests by priority, loop lag and bulkhead."""
+
+    def __init__(
+        self,
+        bulkheads: dict[str, Bulkhead],
+        lag_threshold_seconds: float = 0.1,
+        enabled: bool = True,
+    ) -> None:
+        """
+        Initialize admission controller.
+
+        Args:
+            bulkheads: Bulkhead per endpoint name
+            lag_threshold_seconds: Event-loop lag at which shedding starts
+            enabled: Admit everything immediately when False
+        """
+        self.bulkheads = bulkheads
+        self.lag_threshold_seconds = lag_threshold_seconds
+        self.enabled = enabled
+        self.lag_seconds = 0.0
+        self.in_flight = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start measuring event-loop lag in the background."""
+        if self._task is None and self.enabled:
+            self._task = asyncio.create_task(self._measure_lag())
+
+    async def stop(self) -> None:
+        """Stop measuring event-loop lag."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.lag_seconds = 0.0
+
+    async def _measure_lag(self) -> None:
+        """Record how much later than requested the loop resumes a sleep."""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(LAG_SAMPLE_INTERVAL_SECONDS)
+            self.lag_seconds = max(loop.time() - started - LAG_SAMPLE_INTERVAL_SECONDS, 0.0)
+            event_loop_lag_seconds.set(self.lag_seconds)
+
+    def shed_rank(self) -> Optional[int]:
+        """
+        Lowest priority rank currently shed because of event-loop lag.
+
+        Returns:
+            Rank from which requests are shed, or None if nothing is shed
+        """
+        threshold = self.lag_threshold_seconds
+        if self.lag_seconds >= 4 * threshold:
+            return 1
+        if self.lag_seconds >= 2 * threshold:
+            return 2
+        if self.lag_seconds >= threshold:
+            return 3
+        return None
+
+    @asynccontextmanager
+    async def admit(self, endpoint: str, priority: Optional[Priority]) -> AsyncIterator[None]:
+        """
+        Hold an admission slot for the duration of a request.
+
+        Args:
+            endpoint: Endpoint name (selects the bulkhead)
+            priority: Order priority, or None for background work
+
+        Raises:
+            AdmissionRejected: If the request is shed
+        """
+        if not self.enabled:
+            yield
+            return
+
+        rank = _RANKS[priority]
+        priority_label = priority.value if priority else "BACKGROUND"
+        vip = priority == Priority.VIP
+
+        shed_rank = self.shed_rank()
+        if not vip and shed_rank is not None and rank >= shed_rank:
+            admission_shed_total.labels(
+                endpoint=endpoint, priority=priority_label, reason="event_loop_lag"
+            ).inc()
+            logger.warning(
+                "request_shed",
+                endpoint=endpoint,
+                priority=priority_label,
+                lag_ms=round(self.lag_seconds * 1000, 1),
+            )
+            raise AdmissionRejected(503, "SERVICE_OVERLOADED", "Service is overloaded")
+
+        bulkhead = self.bulkheads.get(endpoint)
+        if bulkhead is not None:
+            started = time.perf_counter()
+            try:
+                await bulkhead.acquire(rank, bypass=vip)
+            except AdmissionRejected:
+                admission_shed_total.labels(
+                    endpoint=endpoint, priority=priority_label, reason="bulkhead"
+                ).inc()
+                raise
+            admission_queue_wait_seconds.labels(endpoint=endpoint).observe(
+                time.perf_counter() - started
+            )
+
+        self.in_flight += 1
+        admission_in_flight.labels(endpoint=endpoint).inc()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            admission_in_flight.labels(endpoint=endpoint).dec()
+            if bulkhead is not None:
+                bulkhead.release()
+
+
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected) -> JSONResponse:
+    """Answer a shed request in the ErrorResponse format with Retry-After."""
+    error = ErrorResponse(
+        error=exc.error, message=str(exc), retry_after_seconds=exc.retry_after_seconds
+    )
+    return JSONResponse(
+        status_code=exc.status_code,
+        content=error.model_dump(mode="json", exclude_none=True),
+        headers={"Retry-After": str(exc.retry_after_seconds)},
+    )
+
+
+# Global controller instance
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get global admission controller instance."""
+    global _admission_controller
+    if _admission_controller is None:
+        settings = get_settings()
+        queue_timeout_seconds = settings.admission_queue_timeout_ms / 1000
+        _admission_controller = AdmissionController(
+            bulkheads={
+                "capacity_check": Bulkhead(
+                    "capacity_check",
+                    max_concurrent=settings.admission_capacity_check_concurrency,
+                    max_queue=settings.admission_queue_size,
+                    queue_timeout_seconds=queue_timeout_seconds,
+                ),
+                "simulate": Bulkhead(
+                    "simulate",
+                    max_concurrent=settings.admission_simulate_concurrency,
+                    max_queue=settings.admission_queue_size,
+                    queue_timeout_seconds=queue_timeout_seconds,
+                ),
+            },
+            lag_threshold_seconds=settings.admission_lag_threshold_ms / 1000,
+            enabled=settings.admission_enabled,
+        )
+    return _admission_controller
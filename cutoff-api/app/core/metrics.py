@@ -1,8 +1,33 @@
 """
 Prometheus metrics configuration and collectors.
+
+With several workers (gunicorn or uvicorn --workers), set
+PROMETHEUS_MULTIPROC_DIR to an empty directory shared by all workers before
+the process starts. Every worker then writes its values to mmap files there
+and /metrics aggregates all of them; gauges aggregate as declared by their
+multiprocess_mode. See gunicorn.conf.py for cleanup of exited workers.
 """
 
-from prometheus_client import Counter, Gauge, Histogram, Info
+import os
+from typing import Optional
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    make_asgi_app,
+    multiprocess,
+)
+from prometheus_client.mmap_dict import MmapedDict
+
+# Environment variable read by prometheus_client when it is first imported
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Metric files whose samples are summed across processes, so exited workers'
+# values can be folded into one archive file per type
+_SUMMED_FILE_TYPES = ("counter", "histogram", "summary")
+_ARCHIVE_SUFFIX = "archive"
 
 # API Request Metrics
 http_requests_total = Counter(
@@ -18,6 +43,54 @@ http_request_duration_seconds = Histogram(
     buckets=(0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0),
 )
 
+rate_limit_rejections_total = Counter(
+    "cutoff_rate_limit_rejections_total",
+    "Requests rejected with 429 by the rate limiter",
+    ["endpoint"],
+)
+
+admission_shed_total = Counter(
+    "cutoff_admission_shed_total",
+    "Requests shed by admission control",
+    ["endpoint", "priority", "reason"],
+)
+
+admission_queue_wait_seconds = Histogram(
+    "cutoff_admission_queue_wait_seconds",
+    "Time admitted requests waited for a bulkhead slot",
+    ["endpoint"],
+    buckets=(0.0001, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+admission_in_flight = Gauge(
+    "cutoff_admission_in_flight",
+    "Requests currently admitted per endpoint",
+    ["endpoint"],
+    multiprocess_mode="livesum",
+)
+
+event_loop_lag_seconds = Gauge(
+    "cutoff_event_loop_lag_seconds",
+    "Latest event-loop lag measured by admission control",
+    multiprocess_mode="livemax",
+)
+
+request_parse_duration_seconds = Histogram(
+    "cutoff_api_request_parse_duration_seconds",
+    "Request body parse and validation time in seconds",
+    ["endpoint"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+request_stage_duration_seconds = Histogram(
+    "cutoff_api_request_stage_duration_seconds",
+    "Time spent per request stage (as sent in the Server-Timing header)",
+    ["endpoint", "stage"],
+    buckets=(
+        0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0
+    ),
+)
+
 # Business Metrics
 capacity_checks_total = Counter(
     "cutoff_capacity_checks_total",
@@ -29,24 +102,28 @@ warehouse_utilization = Gauge(
     "cutoff_warehouse_utilization",
     "Current warehouse utilization (0-1)",
     ["warehouse_id"],
+    multiprocess_mode="mostrecent",
 )
 
 warehouse_capacity = Gauge(
     "cutoff_warehouse_capacity",
     "Current warehouse capacity in units",
     ["warehouse_id", "resource_type"],
+    multiprocess_mode="mostrecent",
 )
 
 orders_in_queue = Gauge(
     "cutoff_orders_in_queue",
     "Number of orders currently in queue",
     ["warehouse_id", "status"],
+    multiprocess_mode="mostrecent",
 )
 
 cutoff_time_remaining_minutes = Gauge(
     "cutoff_time_remaining_minutes",
     "Minutes remaining until cutoff",
     ["warehouse_id"],
+    multiprocess_mode="mostrecent",
 )
 
 # Cache Metrics
@@ -74,12 +151,129 @@ db_connection_pool_size = Gauge(
     "cutoff_db_connection_pool_size",
     "Database connection pool size",
     ["pool_name"],
+    multiprocess_mode="livesum",
+)
+
+hedge_reads_total = Counter(
+    "cutoff_hedge_reads_total",
+    "Reads run through the hedged reader",
+    ["query_type"],
+)
+
+hedge_issued_total = Counter(
+    "cutoff_hedge_issued_total",
+    "Reads duplicated on a second endpoint after the hedge delay",
+    ["query_type"],
+)
+
+hedge_wins_total = Counter(
+    "cutoff_hedge_wins_total",
+    "Hedged reads answered first by the duplicate",
+    ["query_type"],
+)
+
+circuit_breaker_state = Gauge(
+    "cutoff_circuit_breaker_state",
+    "Circuit breaker state (0=closed, 1=half-open, 2=open)",
+    ["breaker"],
+    multiprocess_mode="max",
+)
+
+circuit_breaker_rejections_total = Counter(
+    "cutoff_circuit_breaker_rejections_total",
+    "Calls failed fast because the circuit breaker was open",
+    ["breaker"],
+)
+
+stale_snapshot_decisions_total = Counter(
+    "cutoff_stale_snapshot_decisions_total",
+    "Capacity decisions made from a last-known-good snapshot",
+    ["warehouse_id"],
+)
+
+# Health Probe Metrics
+health_probe_duration_seconds = Histogram(
+    "cutoff_health_probe_duration_seconds",
+    "Background health probe duration in seconds",
+    ["component"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+health_probe_up = Gauge(
+    "cutoff_health_probe_up",
+    "Whether the last health probe of a component succeeded (1) or failed (0)",
+    ["component"],
+    multiprocess_mode="livemin",
+)
+
+health_probe_last_success_timestamp = Gauge(
+    "cutoff_health_probe_last_success_timestamp_seconds",
+    "Unix time of the last successful health probe",
+    ["component"],
+    multiprocess_mode="max",
+)
+
+# Auth Metrics
+jwks_refresh_total = Counter(
+    "cutoff_jwks_refresh_total",
+    "JWKS signing-key reloads",
+    ["result"],
 )
 
-# Application Info
-app_info = Info(
+# Audit Log Metrics
+audit_records_written_total = Counter(
+    "cutoff_audit_records_written_total",
+    "Decision audit records written to segment files",
+)
+
+audit_records_dropped_total = Counter(
+    "cutoff_audit_records_dropped_total",
+    "Decision audit records dropped because the buffer was full",
+)
+
+# Shared Snapshot Metrics
+shared_snapshot_publish_duration_seconds = Histogram(
+    "cutoff_shared_snapshot_publish_duration_seconds",
+    "Time to load all warehouses from HANA and publish the shared snapshot",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+shared_snapshot_publisher = Gauge(
+    "cutoff_shared_snapshot_publisher",
+    "Workers currently publishing the shared snapshot (should be 1)",
+    multiprocess_mode="livesum",
+)
+
+shared_snapshot_read_retries_total = Counter(
+    "cutoff_shared_snapshot_read_retries_total",
+    "Shared snapshot reads retried because a publish was in progress",
+)
+
+# Event Ingestion Metrics
+events_ingested_total = Counter(
+    "cutoff_events_ingested_total",
+    "Stream events handled by the ingestion worker",
+    ["type", "result"],
+)
+
+event_batch_size = Histogram(
+    "cutoff_event_batch_size",
+    "Entries per XREAD batch",
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+
+event_stream_lag = Gauge(
+    "cutoff_event_stream_lag_seconds",
+    "Age of the newest entry of the latest ingested batch",
+    multiprocess_mode="livemax",
+)
+
+# Application Info (a gauge set to 1: Info metrics are not supported in multi-process mode)
+app_info = Gauge(
     "cutoff_api_info",
     "Application information",
+    ["app_name", "version", "environment"],
+    multiprocess_mode="max",
 )
 
 
@@ -92,8 +286,88 @@ def initialize_metrics(app_name: str, version: str, environment: str) -> None:
         version: Application version
         environment: Environment (dev/staging/prod)
     """
-    app_info.info({
-        "app_name": app_name,
-        "version": version,
-        "environment": environment,
-    })
+    app_info.labels(app_name=app_name, version=version, environment=environment).set(1)
+
+
+def multiprocess_enabled() -> bool:
+    """Whether metrics are shared between worker processes."""
+    return bool(os.environ.get(MULTIPROC_DIR_ENV))
+
+
+def create_metrics_app():
+    """
+    Create the ASGI app serving /metrics.
+
+    Returns:
+        App exposing this process's registry, or the aggregate of all
+        workers' files in multi-process mode
+    """
+    if not multiprocess_enabled():
+        return make_asgi_app()
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return make_asgi_app(registry=registry)
+
+
+def mark_worker_dead(pid: Optional[int] = None) -> None:
+    """
+    Drop live-only gauge values of an exited worker.
+
+    Counters and histograms of the worker stay in the directory and keep
+    counting towards the totals until compact_worker_files folds them in.
+
+    Args:
+        pid: Worker process id (defaults to the current process)
+    """
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid if pid is not None else os.getpid())
+
+
+def compact_worker_files(pid: int, path: Optional[str] = None) -> int:
+    """
+    Fold an exited worker's counter and histogram files into archive files.
+
+    Totals are unchanged, but the directory (and every scrape, which reads
+    all files) no longer grows with each worker restart. Each archive is
+    rewritten to a temporary name and renamed over the old one before the
+    worker's file is removed; a scrape in between counts the worker twice
+    for that instant.
+
+    Must only be called once the worker has exited (gunicorn's child_exit).
+
+    Args:
+        pid: Exited worker's process id
+        path: Metrics directory (defaults to PROMETHEUS_MULTIPROC_DIR)
+
+    Returns:
+        Number of worker files removed
+    """
+    path = path or os.environ.get(MULTIPROC_DIR_ENV)
+    if not path:
+        return 0
+
+    removed = 0
+    for file_type in _SUMMED_FILE_TYPES:
+        worker_file = os.path.join(path, f"{file_type}_{pid}.db")
+        if not os.path.exists(worker_file):
+            continue
+        archive_file = os.path.join(path, f"{file_type}_{_ARCHIVE_SUFFIX}.db")
+        totals: dict[str, float] = {}
+        for source in (archive_file, worker_file):
+            if os.path.exists(source):
+                for key, value, _, _ in MmapedDict.read_all_values_from_file(source):
+                    totals[key] = totals.get(key, 0.0) + value
+
+        # Not matched by the collector's *.db glob while it is being written
+        staging_file = f"{archive_file}.tmp"
+        archive = MmapedDict(staging_file)
+        try:
+            for key, value in totals.items():
+                archive.write_value(key, value, 0.0)
+        finally:
+            archive.close()
+        os.replace(staging_file, archive_file)
+        os.remove(worker_file)
+        removed += 1
+    return removed
@@ -0,0 +1,333 @@
+"""
+Per-client rate limiting with local GCRA buckets and batched Redis reconciliation.
+
+Every request is admitted or rejected by a GCRA (generic cell rate
+algorithm) bucket held in process memory, so the hot path does no network
+I/O. Each bucket is a single theoretical arrival time (TAT): with an
+emission interval T = window / limit, a request at time t is admitted if
+TAT - (window - T) <= t, and then advances TAT by T. This admits the full
+limit as a burst and the steady rate afterwards.
+
+Once per sync interval all recently used buckets push the number of
+requests they admitted to shared Redis counters in one pipeline. The
+increase of a counter beyond the local contribution is what the other
+workers admitted; it is charged to the local bucket by advancing its TAT.
+Limits therefore hold across workers up to one sync interval of traffic.
+If Redis is unavailable, buckets keep limiting per worker.
+"""
+
+import asyncio
+import ipaddress
+import math
+import sys
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, Optional, Union
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import get_settings
+from app.core.cache import get_cache
+from app.core.logging import get_logger
+from app.core.metrics import rate_limit_rejections_total
+from app.models.responses import ErrorResponse
+
+logger = get_logger(__name__)
+
+# Limits are configured per minute
+WINDOW_SECONDS = 60.0
+
+# Slack for rounding in TAT sums, so a full burst of `limit` requests is admitted
+_TOLERANCE_SECONDS = 1e-9
+
+# Adds amounts to shared counters and returns their new totals (None on failure)
+CounterSync = Callable[[dict[str, int], int], Awaitable[Optional[dict[str, int]]]]
+
+
+@dataclass(slots=True)
+class _Bucket:
+    """GCRA state of one (route, client) pair."""
+
+    tat: float = 0.0  # Theoretical arrival time (clock seconds)
+    pending: int = 0  # Admitted locally since the last reconciliation
+    synced_total: Optional[int] = None  # Shared counter value at the last reconciliation
+
+
+class RateLimiter:
+    """In-process GCRA rate limiter reconciled across workers through Redis."""
+
+    def __init__(
+        self,
+        limits: dict[str, int],
+        sync_interval_seconds: float = 1.0,
+        counters: Optional[CounterSync] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize rate limiter.
+
+        Args:
+            limits: Requests allowed per minute, by route
+            sync_interval_seconds: Interval between Redis reconciliations
+            counters: Shared counter backend (defaults to Redis via the cache client)
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.limits = limits
+        self.sync_interval_seconds = sync_interval_seconds
+        self.clock = clock
+        self._counters = counters
+        self._intervals = {route: WINDOW_SECONDS / limit for route, limit in limits.items()}
+        self._buckets: dict[tuple[str, str], _Bucket] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def acquire(self, route: str, client: str) -> float:
+        """
+        Admit or reject one request.
+
+        Args:
+            route: Rate-limited route (a key of limits)
+            client: Client identifier
+
+        Returns:
+            0.0 if the request is admitted, else seconds until it would be
+        """
+        interval = self._intervals[route]
+        now = self.clock()
+        bucket = self._buckets.get((route, client))
+        if bucket is None:
+            bucket = self._buckets[(route, client)] = _Bucket(tat=now)
+
+        tat = max(bucket.tat, now)
+        allow_at = tat - (WINDOW_SECONDS - interval)
+        if allow_at > now + _TOLERANCE_SECONDS:
+            return allow_at - now
+
+        bucket.tat = tat + interval
+        bucket.pending += 1
+        return 0.0
+
+    def limit_description(self, route: str) -> str:
+        """Human-readable limit of a route, as in the API specification."""
+        return f"{self.limits[route]} requests per minute"
+
+    async def start(self) -> None:
+        """Start periodic reconciliation in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop reconciliation and push what is still pending."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.reconcile()
+
+    async def _run(self) -> None:
+        """Reconcile on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.sync_interval_seconds)
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error("rate_limit_reconcile_failed", error=str(e))
+
+    async def reconcile(self) -> None:
+        """
+        Exchange admitted counts with the other workers.
+
+        Pushes each active bucket's pending count to its shared counter and
+        charges the bucket for requests other workers admitted since the
+        previous reconciliation. Buckets that are full again and have
+        nothing pending are dropped.
+        """
+        now = self.clock()
+        active = {}
+        for key, bucket in list(self._buckets.items()):
+            if bucket.pending == 0 and bucket.tat <= now:
+                del self._buckets[key]
+            else:
+                active[key] = bucket
+        if not active:
+            return
+
+        sent = {key: bucket.pending for key, bucket in active.items()}
+        redis_keys = {key: f"ratelimit:{key[0]}:{key[1]}" for key in active}
+        counters = self._counters or get_cache().increment_many
+        totals = await counters(
+            {redis_keys[key]: amount for key, amount in sent.items()},
+            int(2 * WINDOW_SECONDS),
+        )
+        if totals is None:
+            return
+
+        now = self.clock()
+        for key, bucket in active.items():
+            total = totals.get(redis_keys[key])
+            if total is None:
+                continue
+            bucket.pending -= sent[key]
+            previous = bucket.synced_total
+            bucket.synced_total = total
+            # A counter below the local view means it expired: start a new baseline
+            if previous is None or total < previous + sent[key]:
+                continue
+            others = total - previous - sent[key]
+            if others:
+                bucket.tat = max(bucket.tat, now) + others * self._intervals[key[0]]
+
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def parse_networks(networks: Iterable[str]) -> tuple[Network, ...]:
+    """
+    Parse proxy addresses or CIDR networks.
+
+    Raises:
+        ValueError: If an entry is not an IP address or network
+    """
+    return tuple(ipaddress.ip_network(network, strict=False) for network in networks)
+
+
+def client_address(scope: Scope, trusted_proxies: tuple[Network, ...] = ()) -> Optional[str]:
+    """
+    Address of the client, looking through trusted proxies.
+
+    Behind a router (the Cloud Foundry gorouter and its load balancer) every
+    connection comes from a proxy address. When it is trusted, the
+    X-Forwarded-For chain is walked from the right, where each proxy appended
+    the address it received the request from, to the first untrusted
+    address. Entries left of that are supplied by the client and ignored.
+
+    Args:
+        scope: ASGI connection scope
+        trusted_proxies: Networks whose X-Forwarded-For entries are trusted
+
+    Returns:
+        Client address, or None if the scope has none
+    """
+    client = scope.get("client")
+    if not client:
+        return None
+    address = client[0]
+    if not trusted_proxies:
+        return address
+    forwarded = [
+        value.decode("latin-1") for name, value in scope["headers"] if name == b"x-forwarded-for"
+    ]
+    hops = [hop.strip() for hop in ",".join(forwarded).split(",") if hop.strip()]
+    for hop in [address, *reversed(hops)]:
+        try:
+            ip = ipaddress.ip_address(hop)
+        except ValueError:
+            break
+        address = hop
+        if not any(ip in network for network in trusted_proxies):
+            break
+    return address
+
+
+def client_key(scope: Scope, trusted_proxies: tuple[Network, ...] = ()) -> str:
+    """
+    Identify the client of a request.
+
+    A bearer token that authentication has already verified keys the
+    request by its subject; every other request, including one with a token
+    not verified yet, by client address (see client_address). The raw
+    Authorization header is never used: a client could otherwise get a
+    fresh bucket per request by varying it, and grow the bucket table
+    without bound.
+
+    Args:
+        scope: ASGI connection scope
+        trusted_proxies: Networks whose X-Forwarded-For entries are trusted
+
+    Returns:
+        Client identifier
+    """
+    # Verified tokens are cached by app.core.auth; if it was never imported
+    # (auth not in use), no token has been verified
+    auth = sys.modules.get("app.core.auth")
+    if auth is not None:
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    user = auth.get_token_cache().get(token.strip())
+                    if user is not None:
+                        return f"user-{user.username}"
+                break
+    address = client_address(scope, trusted_proxies)
+    return f"ip-{address}" if address else "ip-unknown"
+
+
+class RateLimitMiddleware:
+    """ASGI middleware answering 429 with Retry-After when a client exceeds its limit."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application
+        """
+        settings = get_settings()
+        self.app = app
+        self.enabled = settings.rate_limit_enabled
+        self.trusted_proxies = parse_networks(settings.rate_limit_trusted_proxies)
+        self.limiter = get_rate_limiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Apply the route's limit, if any, before calling the application."""
+        route = scope["path"] if scope["type"] == "http" else None
+        if not self.enabled or route not in self.limiter.limits:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = self.limiter.acquire(route, client_key(scope, self.trusted_proxies))
+        if retry_after <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        rate_limit_rejections_total.labels(endpoint=route).inc()
+        retry_after_seconds = math.ceil(retry_after)
+        error = ErrorResponse(
+            error="RATE_LIMIT_EXCEEDED",
+            message="Too many requests",
+            retry_after_seconds=retry_after_seconds,
+            limit=self.limiter.limit_description(route),
+        )
+        response = JSONResponse(
+            status_code=429,
+            content=error.model_dump(mode="json", exclude_none=True),
+            headers={"Retry-After": str(retry_after_seconds)},
+        )
+        await response(scope, receive, send)
+
+
+# Global limiter instance
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get global rate limiter instance."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        settings = get_settings()
+        prefix = settings.api_v1_prefix
+        _rate_limiter = RateLimiter(
+            limits={
+                f"{prefix}/capacity/check": settings.rate_limit_capacity_check,
+                f"{prefix}/cutoff/current": settings.rate_limit_cutoff,
+                f"{prefix}/status": settings.rate_limit_status,
+                f"{prefix}/simulate": settings.rate_limit_simulate,
+            },
+            sync_interval_seconds=settings.rate_limit_sync_interval_seconds,
+        )
+    return _rate_limiter
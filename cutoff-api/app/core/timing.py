@@ -0,0 +1,107 @@
+"""
+Request-scoped stage timing.
+
+The HTTP timing middleware starts a RequestTimer per request; code on the
+request path wraps its stages in ``stage(name)``. Spans are measured with
+time.perf_counter, so sub-millisecond stages are not rounded to zero. When
+the response is ready the middleware sends the spans as a Server-Timing
+header and observes them in cutoff_api_request_stage_duration_seconds.
+
+Outside a request (background tasks, startup) ``stage`` does nothing.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Iterator, Optional
+
+from app.core.metrics import request_stage_duration_seconds
+
+_current_timer: ContextVar[Optional["RequestTimer"]] = ContextVar(
+    "request_timer", default=None
+)
+
+
+class RequestTimer:
+    """
+    High-resolution stage spans of one request.
+
+    A stage entered several times (e.g. two HANA queries) accumulates its
+    spans; spans of stages that run concurrently add up, so their sum can
+    exceed the request's wall time.
+    """
+
+    __slots__ = ("started", "stages")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add a span to a stage."""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """Seconds since the request started."""
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total_seconds: Optional[float] = None) -> str:
+        """
+        Render the stages as a Server-Timing header value.
+
+        Args:
+            total_seconds: Request duration to append as ``total``
+
+        Returns:
+            e.g. ``parse;dur=0.182, hana;dur=12.407, total;dur=13.051`` (milliseconds)
+        """
+        metrics = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.stages.items()]
+        if total_seconds is not None:
+            metrics.append(f"total;dur={total_seconds * 1000:.3f}")
+        return ", ".join(metrics)
+
+    def observe(self, endpoint: str) -> None:
+        """Record every stage in the per-stage histogram."""
+        for name, seconds in self.stages.items():
+            request_stage_duration_seconds.labels(endpoint=endpoint, stage=name).observe(seconds)
+
+
+def start_request_timer() -> tuple[RequestTimer, Token]:
+    """
+    Start timing a request in the current context.
+
+    Returns:
+        The timer and the token to pass to stop_request_timer
+    """
+    timer = RequestTimer()
+    return timer, _current_timer.set(timer)
+
+
+def stop_request_timer(token: Token) -> None:
+    """Detach the request's timer from the context."""
+    _current_timer.reset(token)
+
+
+def current_timer() -> Optional[RequestTimer]:
+    """Timer of the request being handled, if any."""
+    return _current_timer.get()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a stage of the current request.
+
+    Args:
+        name: Stage name (a Server-Timing token: letters, digits, ``_``)
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - started)
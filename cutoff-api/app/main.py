@@ -2,21 +2,43 @@
 Main FastAPI application entry point.
 """
 
-import time
 from contextlib import asynccontextmanager
+from pathlib import Path
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from prometheus_client import make_asgi_app
 
 from app.api.v1.router import api_router
 from app.config import get_settings
 from app.core.cache import get_cache
+from app.core.load_shedding import (
+    AdmissionRejected,
+    admission_rejected_handler,
+    get_admission_controller,
+)
 from app.core.logging import configure_logging, get_logger
-from app.core.metrics import http_request_duration_seconds, http_requests_total, initialize_metrics
+from app.core.metrics import (
+    create_metrics_app,
+    http_request_duration_seconds,
+    http_requests_total,
+    initialize_metrics,
+    mark_worker_dead,
+)
+from app.core.rate_limit import RateLimitMiddleware, get_rate_limiter
+from app.core.timing import start_request_timer, stop_request_timer
+from app.openapi import install_openapi_schema
+from app.repositories.audit_repository import get_audit_repository
 from app.repositories.hana_repository import get_hana_repository
+from app.repositories.order_workload_snapshot import load_order_workload_snapshot
+from app.services.decision_stats import get_decision_stats
+from app.services.event_ingestion import get_event_ingestor
+from app.services.health_prober import get_health_prober
+from app.services.shared_snapshot import get_snapshot_publisher
+from app.services.threshold_table import get_threshold_tables
+from app.services.utilization_history import get_utilization_history
+from app.warmup import get_warmup
 
 # Configure logging first
 configure_logging()
@@ -57,6 +79,55 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("hana_connection_failed", error=str(e))
 
+    await get_decision_stats().start()
+    await get_utilization_history().start()
+    await get_health_prober().start()
+    await get_admission_controller().start()
+
+    # One worker publishes warehouse snapshots from HANA; all workers read them
+    snapshot_publisher = get_snapshot_publisher()
+    if snapshot_publisher is not None:
+        await snapshot_publisher.start()
+
+    # Drop threshold tables when another worker bumps a warehouse's state epoch
+    await get_threshold_tables().start()
+
+    if settings.rate_limit_enabled:
+        await get_rate_limiter().start()
+
+    if settings.audit_enabled:
+        try:
+            await get_audit_repository().start()
+        except Exception as e:
+            logger.warning("audit_log_start_failed", error=str(e))
+
+    if settings.event_ingestion_enabled:
+        ingestor = get_event_ingestor()
+        try:
+            # Events appended while the snapshot loads are applied on top of it
+            await ingestor.seek_to_end()
+            ingestor.load_snapshot(await load_order_workload_snapshot())
+        except Exception as e:
+            # Unseeded warehouses keep HANA's remaining workload
+            logger.warning("order_snapshot_load_failed", error=str(e))
+        try:
+            await ingestor.start()
+        except Exception as e:
+            logger.warning("event_ingestion_start_failed", error=str(e))
+
+    # RS256 signing keys; auth (python-jose) is only imported when configured
+    if settings.jwt_jwks_url:
+        from app.core.jwks import get_jwks_provider
+
+        await get_jwks_provider().start()
+
+    # Readiness (/ready) follows warm-up, which runs in the background
+    warmup = get_warmup()
+    if settings.warmup_enabled:
+        await warmup.start()
+    else:
+        warmup.ready = True
+
     logger.info("application_started")
 
     yield
@@ -64,6 +135,27 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("application_shutting_down")
 
+    await get_warmup().stop()
+    await get_event_ingestor().stop()
+    await get_health_prober().stop()
+    await get_admission_controller().stop()
+    if snapshot_publisher is not None:
+        await snapshot_publisher.stop()
+    await get_threshold_tables().stop()
+    await get_rate_limiter().stop()
+    await get_decision_stats().stop()
+    await get_utilization_history().stop()
+
+    if settings.jwt_jwks_url:
+        from app.core.jwks import get_jwks_provider
+
+        await get_jwks_provider().stop()
+
+    try:
+        await get_audit_repository().stop()
+    except Exception as e:
+        logger.warning("audit_log_stop_failed", error=str(e))
+
     try:
         cache = get_cache()
         await cache.disconnect()
@@ -78,6 +170,9 @@ async def lifespan(app: FastAPI):
     except Exception:
         pass
 
+    # Multi-process metrics: drop this worker's live gauges
+    mark_worker_dead()
+
     logger.info("application_stopped")
 
 
@@ -93,6 +188,12 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Shed requests with 429/503 in the ErrorResponse format
+app.add_exception_handler(AdmissionRejected, admission_rejected_handler)
+
+# Rate limiting (added before CORS so 429 responses carry CORS headers)
+app.add_middleware(RateLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -103,30 +204,63 @@ app.add_middleware(
 )
 
 
+# Metric label for requests no route matched (raw paths would be unbounded)
+UNMATCHED_ENDPOINT = "unmatched"
+
+
+def _endpoint_label(request: Request) -> str:
+    """
+    Route template of the request, e.g. /api/v1/demo/scenario/{scenario_name}.
+
+    Depending on the FastAPI version, routes of an included router carry
+    their path with or without the router's prefix. The matched route is
+    therefore fitted to the end of the request path and the (static) prefix
+    before it is kept.
+    """
+    route = request.scope.get("route")
+    path_regex = getattr(route, "path_regex", None)
+    if path_regex is None:
+        # Mounted apps (static files, /metrics) only leave their mount path
+        mount_path = request.scope.get("root_path", "")
+        if mount_path != request.scope.get("app_root_path", ""):
+            return mount_path
+        return UNMATCHED_ENDPOINT
+    path = request.scope["path"]
+    start = 0
+    while start != -1:
+        if path_regex.match(path[start:]):
+            return path[:start] + route.path
+        start = path.find("/", start + 1)
+    return route.path
+
+
 # Request timing middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     """Add timing and logging for all requests."""
-    start_time = time.time()
+    timer, timer_token = start_request_timer()
 
     # Process request
     try:
         response = await call_next(request)
-        process_time = time.time() - start_time
+        process_time = timer.elapsed_seconds
 
-        # Add timing header
+        # Add timing headers (per-stage spans recorded by the handler)
         response.headers["X-Process-Time"] = str(process_time)
+        response.headers["Server-Timing"] = timer.server_timing(process_time)
+        endpoint = _endpoint_label(request)
+        timer.observe(endpoint)
 
         # Record metrics
         http_requests_total.labels(
             method=request.method,
-            endpoint=request.url.path,
+            endpoint=endpoint,
             status=response.status_code,
         ).inc()
 
         http_request_duration_seconds.labels(
             method=request.method,
-            endpoint=request.url.path,
+            endpoint=endpoint,
         ).observe(process_time)
 
         # Log request
@@ -141,7 +275,7 @@ async def add_process_time_header(request: Request, call_next):
         return response
 
     except Exception as e:
-        process_time = time.time() - start_time
+        process_time = timer.elapsed_seconds
 
         logger.error(
             "request_failed",
@@ -154,7 +288,7 @@ async def add_process_time_header(request: Request, call_next):
         # Record error metric
         http_requests_total.labels(
             method=request.method,
-            endpoint=request.url.path,
+            endpoint=_endpoint_label(request),
             status=500,
         ).inc()
 
@@ -166,6 +300,9 @@ async def add_process_time_header(request: Request, call_next):
             },
         )
 
+    finally:
+        stop_request_timer(timer_token)
+
 
 # Include API router
 app.include_router(api_router, prefix=settings.api_v1_prefix)
@@ -175,9 +312,12 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # Mount Prometheus metrics endpoint
 if settings.metrics_enabled:
-    metrics_app = make_asgi_app()
+    metrics_app = create_metrics_app()
     app.mount(settings.metrics_path, metrics_app)
 
+# Serve the build-time OpenAPI document instead of generating it on first hit
+install_openapi_schema(app, Path(settings.openapi_schema_path))
+
 
 @app.get("/", include_in_schema=False)
 async def root():
@@ -18,9 +18,11 @@ from app.models.requests import CapacityCheckRequest, SimulateRequest
 from app.models.responses import (
     Alternative,
     CapacityCheckResponse,
+    ComponentHealth,
     CutoffStatusResponse,
     ErrorResponse,
     HealthResponse,
+    ReadinessResponse,
     SimulateResponse,
     WarehouseStatusResponse,
 )
@@ -45,9 +47,11 @@ __all__ = [
     # Response models
     "Alternative",
     "CapacityCheckResponse",
+    "ComponentHealth",
     "CutoffStatusResponse",
     "ErrorResponse",
     "HealthResponse",
+    "ReadinessResponse",
     "SimulateResponse",
     "WarehouseStatusResponse",
 ]
@@ -179,6 +179,13 @@ class DecisionFactors(BaseModel):
     vip_override_used: bool = Field(
         default=False, description="Whether VIP reserve was used"
     )
+    snapshot_stale: bool = Field(
+        default=False,
+        description="Whether the decision used a last-known-good snapshot (HANA unavailable)",
+    )
+    snapshot_age_seconds: Optional[float] = Field(
+        default=None, ge=0, description="Age of the stale snapshot (seconds)"
+    )
 
 
 class Decision(BaseModel):
@@ -0,0 +1,171 @@
+"""
+Internal domain objects used on the decision hot path.
+
+Frozen, slotted dataclasses mirroring the pydantic models in domain.py.
+Derived values (capacity rates, bottleneck, usable capacity, total workload)
+are computed once at construction instead of on every property access, and
+no validation runs: inputs come from the database or from already-validated
+requests. Conversion to the pydantic models happens only at the API edge,
+via to_model().
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from app.models import domain
+from app.models.domain import DecisionStatus, ResourceType
+
+# Capacity rates per resource type (units per minute)
+CAPACITY_RATES = {
+    ResourceType.PICKER: Decimal("1.2"),
+    ResourceType.PACKER: Decimal("0.8"),
+    ResourceType.LOADER: Decimal("2.0"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ResourceCapacity:
+    """Capacity for a specific resource type."""
+
+    resource_type: ResourceType
+    available_count: int
+    base_efficiency: Decimal = Decimal("1.0")
+    current_utilization: Decimal = Decimal("0.0")
+    capacity_per_minute: Decimal = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Compute the capacity rate once."""
+        object.__setattr__(
+            self,
+            "capacity_per_minute",
+            Decimal(self.available_count) * CAPACITY_RATES[self.resource_type],
+        )
+
+    def to_model(self) -> domain.ResourceCapacity:
+        """Convert to the pydantic model."""
+        return domain.ResourceCapacity(
+            resource_type=self.resource_type,
+            available_count=self.available_count,
+            base_efficiency=self.base_efficiency,
+            current_utilization=self.current_utilization,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class WarehouseCapacity:
+    """Total warehouse capacity across all resources."""
+
+    picker_capacity: ResourceCapacity
+    packer_capacity: ResourceCapacity
+    loader_capacity: ResourceCapacity
+    vip_reserve_percent: Decimal = Decimal("0.10")
+    bottleneck_resource: ResourceType = field(init=False)
+    usable_capacity: Decimal = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Identify the bottleneck and usable capacity once."""
+        bottleneck = min(
+            (self.picker_capacity, self.packer_capacity, self.loader_capacity),
+            key=lambda resource: resource.capacity_per_minute,
+        )
+        object.__setattr__(self, "bottleneck_resource", bottleneck.resource_type)
+        object.__setattr__(
+            self,
+            "usable_capacity",
+            bottleneck.capacity_per_minute * (Decimal("1.0") - self.vip_reserve_percent),
+        )
+
+    def to_model(self) -> domain.WarehouseCapacity:
+        """Convert to the pydantic model."""
+        return domain.WarehouseCapacity(
+            picker_capacity=self.picker_capacity.to_model(),
+            packer_capacity=self.packer_capacity.to_model(),
+            loader_capacity=self.loader_capacity.to_model(),
+            vip_reserve_percent=self.vip_reserve_percent,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Workload:
+    """Calculated workload for an order or warehouse."""
+
+    item_workload: Decimal = Decimal("0.0")
+    setup_time: Decimal = Decimal("2.0")
+    packing_base: Decimal = Decimal("3.0")
+    packing_per_item: Decimal = Decimal("0.5")
+    loading_time: Decimal = Decimal("1.5")
+    total_workload: Decimal = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Compute the total once (same formula as domain.Workload)."""
+        object.__setattr__(
+            self,
+            "total_workload",
+            self.item_workload + self.setup_time + self.packing_base + self.loading_time,
+        )
+
+    def to_model(self) -> domain.Workload:
+        """Convert to the pydantic model."""
+        return domain.Workload(
+            item_workload=self.item_workload,
+            setup_time=self.setup_time,
+            packing_base=self.packing_base,
+            packing_per_item=self.packing_per_item,
+            loading_time=self.loading_time,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class DecisionFactors:
+    """Factors influencing the capacity decision."""
+
+    workload_impact: Decimal
+    remaining_capacity: Decimal
+    time_buffer_minutes: int
+    bottleneck_resource: ResourceType
+    congestion_factor: Decimal = Decimal("1.0")
+    vip_override_used: bool = False
+    snapshot_stale: bool = False
+    snapshot_age_seconds: Optional[float] = None
+
+    def to_model(self) -> domain.DecisionFactors:
+        """Convert to the pydantic model."""
+        return domain.DecisionFactors(
+            workload_impact=self.workload_impact,
+            remaining_capacity=self.remaining_capacity,
+            time_buffer_minutes=self.time_buffer_minutes,
+            bottleneck_resource=self.bottleneck_resource,
+            congestion_factor=self.congestion_factor,
+            vip_override_used=self.vip_override_used,
+            snapshot_stale=self.snapshot_stale,
+            snapshot_age_seconds=self.snapshot_age_seconds,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Decision:
+    """Capacity check decision with metadata."""
+
+    can_ship_today: bool
+    status: DecisionStatus
+    confidence: Decimal
+    current_utilization: Decimal
+    estimated_completion: datetime
+    message: str
+    factors: DecisionFactors
+    calculated_at: datetime = field(default_factory=datetime.utcnow)
+
+    def to_model(self) -> domain.Decision:
+        """Convert to the pydantic model."""
+        return domain.Decision(
+            can_ship_today=self.can_ship_today,
+            status=self.status,
+            confidence=self.confidence,
+            current_utilization=self.current_utilization,
+            estimated_completion=self.estimated_completion,
+            message=self.message,
+            factors=self.factors.to_model(),
+            calculated_at=self.calculated_at,
+        )
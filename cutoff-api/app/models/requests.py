@@ -3,10 +3,14 @@ Request schemas for API endpoints.
 Based on API specification in docs/05-api-specification.md
 """
 
+from array import array
+from dataclasses import dataclass
 from datetime import date, datetime
-from typing import Optional
+from decimal import Decimal
+from typing import Annotated, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import NotRequired, TypedDict
 
 from app.models.domain import OrderItem, Priority
 
@@ -55,6 +59,107 @@ class CapacityCheckRequest(BaseModel):
         }
 
 
+class OrderItemPayload(TypedDict):
+    """Order item as validated by the bulk parser (same constraints as OrderItem)."""
+
+    product_id: str
+    quantity: Annotated[int, Field(gt=0)]
+    weight_factor: NotRequired[
+        Optional[Annotated[Decimal, Field(ge=Decimal("1.0"), le=Decimal("3.0"))]]
+    ]
+    location_factor: NotRequired[
+        Optional[Annotated[Decimal, Field(ge=Decimal("1.0"), le=Decimal("2.0"))]]
+    ]
+
+
+class CapacityCheckPayload(TypedDict):
+    """Capacity check body as validated by the bulk parser."""
+
+    order_id: NotRequired[Optional[Annotated[str, Field(max_length=50)]]]
+    customer_id: NotRequired[Optional[Annotated[str, Field(max_length=50)]]]
+    priority: NotRequired[Priority]
+    warehouse_id: NotRequired[Annotated[str, Field(max_length=10)]]
+    delivery_date: NotRequired[Optional[date]]
+    items: Annotated[list[OrderItemPayload], Field(min_length=1, max_length=1000)]
+
+
+# OrderItem default for omitted weight/location factors
+_DEFAULT_FACTOR = Decimal("1.0")
+
+# Compiled once: validates raw JSON bytes into plain dicts, no model instances
+capacity_check_payload_adapter = TypeAdapter(CapacityCheckPayload)
+
+
+@dataclass(frozen=True, slots=True)
+class OrderItemColumns:
+    """Order items stored column-wise (explicit None factors count as 1.0)."""
+
+    product_ids: list[str]
+    quantities: array
+    weight_factors: list[Optional[Decimal]]
+    location_factors: list[Optional[Decimal]]
+
+    def __len__(self) -> int:
+        """Number of items."""
+        return len(self.product_ids)
+
+    @classmethod
+    def from_payload(cls, items: list[OrderItemPayload]) -> "OrderItemColumns":
+        """Build columns from validated item dicts."""
+        return cls(
+            product_ids=[item["product_id"] for item in items],
+            quantities=array("q", [item["quantity"] for item in items]),
+            weight_factors=[item.get("weight_factor", _DEFAULT_FACTOR) for item in items],
+            location_factors=[item.get("location_factor", _DEFAULT_FACTOR) for item in items],
+        )
+
+    @classmethod
+    def from_items(cls, items: list[OrderItem]) -> "OrderItemColumns":
+        """Build columns from OrderItem models."""
+        return cls(
+            product_ids=[item.product_id for item in items],
+            quantities=array("q", [item.quantity for item in items]),
+            weight_factors=[item.weight_factor for item in items],
+            location_factors=[item.location_factor for item in items],
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedCapacityCheck:
+    """Validated capacity check request with column-wise items."""
+
+    items: OrderItemColumns
+    order_id: Optional[str] = None
+    customer_id: Optional[str] = None
+    priority: Priority = Priority.STANDARD
+    warehouse_id: str = "WH-MAIN"
+    delivery_date: Optional[date] = None
+
+    @classmethod
+    def from_payload(cls, payload: CapacityCheckPayload) -> "ParsedCapacityCheck":
+        """Build from a payload validated by capacity_check_payload_adapter."""
+        return cls(
+            items=OrderItemColumns.from_payload(payload["items"]),
+            order_id=payload.get("order_id"),
+            customer_id=payload.get("customer_id"),
+            priority=payload.get("priority", Priority.STANDARD),
+            warehouse_id=payload.get("warehouse_id", "WH-MAIN"),
+            delivery_date=payload.get("delivery_date"),
+        )
+
+    @classmethod
+    def from_request(cls, request: CapacityCheckRequest) -> "ParsedCapacityCheck":
+        """Build from a CapacityCheckRequest model."""
+        return cls(
+            items=OrderItemColumns.from_items(request.items),
+            order_id=request.order_id,
+            customer_id=request.customer_id,
+            priority=request.priority,
+            warehouse_id=request.warehouse_id,
+            delivery_date=request.delivery_date,
+        )
+
+
 class SimulateRequest(BaseModel):
     """
     Request schema for POST /simulate endpoint (what-if analysis).
@@ -17,7 +17,9 @@ class CalculationMetadata(BaseModel):
 
     calculated_at: datetime = Field(..., description="Timestamp of calculation")
     cache_hit: bool = Field(..., description="Whether result was cached")
-    calculation_time_ms: int = Field(..., description="Calculation time in milliseconds")
+    calculation_time_ms: float = Field(
+        ..., description="Calculation time in milliseconds (microsecond resolution)"
+    )
     request_id: Optional[str] = Field(None, description="Request tracking ID")
 
 
@@ -52,7 +54,9 @@ class CapacityCheckResponse(BaseModel):
     estimated_completion: datetime = Field(..., description="Estimated completion time")
     current_utilization: Decimal = Field(..., ge=0, description="Current warehouse utilization")
     message: str = Field(..., description="Human-readable decision message")
-    decision_factors: DecisionFactors = Field(..., description="Factors influencing decision")
+    decision_factors: Optional[DecisionFactors] = Field(
+        None, description="Factors influencing decision (when requested with ?factors=true)"
+    )
     metadata: CalculationMetadata = Field(..., description="Calculation metadata")
 
     # Optional fields for rejection scenarios
@@ -77,7 +81,7 @@ class CapacityCheckResponse(BaseModel):
                 "metadata": {
                     "calculated_at": "2024-01-15T12:00:00Z",
                     "cache_hit": False,
-                    "calculation_time_ms": 45,
+                    "calculation_time_ms": 0.412,
                 },
             }
         }
@@ -110,6 +114,7 @@ class CutoffStatusResponse(BaseModel):
         }
     """
 
+    warehouse_id: Optional[str] = Field(None, description="Warehouse identifier")
     cutoff_time: datetime = Field(..., description="Current dynamic cutoff time")
     hard_deadline: datetime = Field(..., description="Hard deadline (end of shift)")
     current_time: datetime = Field(..., description="Current server time")
@@ -125,6 +130,13 @@ class CutoffStatusResponse(BaseModel):
     )
 
 
+class FleetCutoffResponse(BaseModel):
+    """Response schema for GET /cutoff/all endpoint."""
+
+    current_time: datetime = Field(..., description="Current server time")
+    warehouses: list[CutoffStatusResponse] = Field(..., description="Cutoff status per warehouse")
+
+
 class ResourceStatus(BaseModel):
     """Status of a specific resource type."""
 
@@ -169,6 +181,9 @@ class DecisionStats(BaseModel):
     rejected: int = Field(..., ge=0, description="Rejected orders")
     vip_override: int = Field(..., ge=0, description="VIP overrides")
     approval_rate: Decimal = Field(..., ge=0, le=1, description="Approval rate")
+    by_priority: dict[str, dict[str, int]] = Field(
+        default_factory=dict, description="Approved/rejected counts by priority"
+    )
 
 
 class Alert(BaseModel):
@@ -229,6 +244,15 @@ class HealthCheck(BaseModel):
     message: Optional[str] = Field(None, description="Additional message")
 
 
+class ComponentHealth(BaseModel):
+    """Latest background probe result of one dependency."""
+
+    status: str = Field(..., description="Component status: ok, degraded, down, unknown")
+    latency_ms: Optional[float] = Field(None, description="Latency of the last successful probe")
+    last_success: Optional[datetime] = Field(None, description="Time of the last successful probe")
+    last_error: Optional[str] = Field(None, description="Error of the last failed probe")
+
+
 class HealthResponse(BaseModel):
     """Response schema for GET /health endpoint."""
 
@@ -236,9 +260,19 @@ class HealthResponse(BaseModel):
     version: str = Field(..., description="API version")
     timestamp: datetime = Field(..., description="Health check timestamp")
     checks: dict[str, str] = Field(..., description="Component health statuses")
+    components: dict[str, ComponentHealth] = Field(
+        default_factory=dict, description="Latest probe result per dependency"
+    )
     uptime_seconds: int = Field(..., ge=0, description="Uptime in seconds")
 
 
+class ReadinessResponse(BaseModel):
+    """Response schema for GET /ready endpoint."""
+
+    status: str = Field(..., description="Readiness: ready or warming_up")
+    warmup_seconds: Optional[float] = Field(None, description="Warm-up duration once finished")
+
+
 class ErrorDetail(BaseModel):
     """Error detail for validation errors."""
 
@@ -0,0 +1,136 @@
+"""
+Pre-generated OpenAPI document.
+
+FastAPI builds the schema on the first /openapi.json or /docs request by
+walking every route and model, which adds ~120 ms to the first docs hit of
+each new instance. The document is generated at build time instead:
+
+    python -m app.openapi --output app/openapi.json
+
+and served from that file at runtime. The document records a fingerprint
+of everything it is generated from (the app package's source, the app's
+metadata and its routes); a missing file, or one whose fingerprint differs
+from the running code's, falls back to FastAPI's on-demand generation.
+"""
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Optional
+
+from fastapi import FastAPI
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Top-level extension field holding the fingerprint of a generated document
+FINGERPRINT_FIELD = "x-source-fingerprint"
+
+_PACKAGE_DIR = Path(__file__).resolve().parent
+
+
+def schema_fingerprint(app: FastAPI) -> str:
+    """
+    Fingerprint the inputs of the app's OpenAPI document.
+
+    Hashing the generated schema would mean generating it, which is what
+    the pre-generated file avoids. Its inputs are hashed instead: the source
+    of the app package (routes, models, descriptions) plus the app metadata
+    and route table, which also depend on settings. Reading the sources
+    takes a few milliseconds.
+
+    Args:
+        app: Application to describe
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([app.title, app.version, app.description, app.openapi_url]).encode())
+    for route in app.routes:
+        methods = sorted(getattr(route, "methods", None) or ())
+        digest.update(f"{getattr(route, 'path', '')} {','.join(methods)}\n".encode())
+    for source in sorted(_PACKAGE_DIR.rglob("*.py")):
+        digest.update(source.relative_to(_PACKAGE_DIR).as_posix().encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def load_openapi_schema(path: Path, fingerprint: str) -> Optional[dict[str, Any]]:
+    """
+    Load a pre-generated OpenAPI document.
+
+    Args:
+        path: Path of the generated JSON document
+        fingerprint: Expected fingerprint (see schema_fingerprint)
+
+    Returns:
+        Schema dict, or None if the file is missing, unreadable or stale
+    """
+    try:
+        schema = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("openapi_schema_load_failed", path=str(path), error=str(e))
+        return None
+
+    if schema.get(FINGERPRINT_FIELD) != fingerprint:
+        logger.warning(
+            "openapi_schema_stale",
+            path=str(path),
+            schema_fingerprint=schema.get(FINGERPRINT_FIELD),
+            fingerprint=fingerprint,
+        )
+        return None
+    return schema
+
+
+def install_openapi_schema(app: FastAPI, path: Path) -> bool:
+    """
+    Serve the pre-generated document from app.openapi() when available.
+
+    Args:
+        app: Application whose schema is replaced
+        path: Path of the generated JSON document
+
+    Returns:
+        True if the pre-generated document is used
+    """
+    schema = load_openapi_schema(path, schema_fingerprint(app))
+    if schema is None:
+        return False
+    app.openapi_schema = schema
+    logger.debug("openapi_schema_loaded", path=str(path))
+    return True
+
+
+def write_openapi_schema(app: FastAPI, path: Path) -> None:
+    """
+    Generate the document and write it to path.
+
+    Args:
+        app: Application to describe
+        path: Output path
+    """
+    app.openapi_schema = None
+    schema = {**app.openapi(), FINGERPRINT_FIELD: schema_fingerprint(app)}
+    path.write_text(json.dumps(schema, ensure_ascii=False), encoding="utf-8")
+
+
+def main() -> None:
+    """Write the OpenAPI document of app.main:app."""
+    parser = argparse.ArgumentParser(description="Generate the OpenAPI document")
+    parser.add_argument("--output", type=Path, default=Path("app/openapi.json"))
+    args = parser.parse_args()
+
+    from app.main import app
+
+    write_openapi_schema(app, args.output)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
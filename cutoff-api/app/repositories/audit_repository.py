@@ -0,0 +1,428 @@
+"""
+Append-only decision audit log.
+
+Every capacity decision is appended to a bounded in-memory buffer on the
+request path (a single deque append). A background task drains the buffer in
+batches and writes them to rotating Arrow IPC segment files from a worker
+thread, so the event loop never waits on disk I/O.
+
+Segments are written as ``decisions-<timestamp>-<pid>-<seq>.arrow.tmp`` and
+renamed to ``.arrow`` once rotated (by row count or age), so readers only
+ever see complete files. The writing process holds an flock on its
+in-progress segment; a ``.tmp`` segment nobody holds was left by a crashed
+worker and is recovered on the next start (see recover_orphaned_segments).
+
+Records hold the compact fields of a threshold-table decision only. Status
+and congestion factor follow from the utilization and are derived when the
+log is read, so recording never materializes the decision factors.
+"""
+
+import asyncio
+import fcntl
+import itertools
+import os
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from app.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import audit_records_dropped_total, audit_records_written_total
+from app.models.domain import DecisionStatus, Priority
+from app.services.decision_engine import STATUS_THRESHOLDS
+
+if TYPE_CHECKING:
+    from app.services.threshold_table import TableDecision
+
+logger = get_logger(__name__)
+
+
+def _audit_schema() -> Any:
+    """Arrow schema for audit segments (pyarrow imported lazily)."""
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("recorded_at", pa.timestamp("us")),
+            ("warehouse_id", pa.dictionary(pa.int16(), pa.string())),
+            ("order_id", pa.string()),
+            ("priority", pa.dictionary(pa.int8(), pa.string())),
+            ("snapshot_version", pa.string()),
+            ("new_workload", pa.float64()),
+            ("current_workload", pa.float64()),
+            ("capacity", pa.float64()),
+            ("can_ship_today", pa.bool_()),
+            ("confidence", pa.float32()),
+            ("utilization", pa.float64()),
+            ("time_buffer_minutes", pa.int32()),
+            ("bottleneck_resource", pa.dictionary(pa.int8(), pa.string())),
+            ("vip_override_used", pa.bool_()),
+            ("snapshot_stale", pa.bool_()),
+        ]
+    )
+
+
+class AuditRepository:
+    """Buffered, append-only writer of decision audit records."""
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        buffer_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_seconds: Optional[float] = None,
+        segment_max_rows: Optional[int] = None,
+        segment_max_age_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize audit repository.
+
+        Args:
+            directory: Segment directory (defaults to settings.audit_dir)
+            buffer_size: Maximum buffered records before new ones are dropped
+            batch_size: Buffered records that trigger an early flush
+            flush_interval_seconds: Maximum time between flushes
+            segment_max_rows: Rows per segment before rotating to a new file
+            segment_max_age_seconds: Age of a segment before rotating to a new file
+        """
+        settings = get_settings()
+        self.directory = Path(directory or settings.audit_dir)
+        self.buffer_size = buffer_size or settings.audit_buffer_size
+        self.batch_size = batch_size or settings.audit_batch_size
+        self.flush_interval_seconds = (
+            flush_interval_seconds or settings.audit_flush_interval_seconds
+        )
+        self.segment_max_rows = segment_max_rows or settings.audit_segment_max_rows
+        self.segment_max_age_seconds = (
+            segment_max_age_seconds or settings.audit_segment_max_age_seconds
+        )
+
+        self._buffer: deque[tuple] = deque()
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        # Serializes segment writes; a write runs in a thread and cannot be cancelled
+        self._write_lock = asyncio.Lock()
+        self._writer: Any = None
+        self._segment_path: Optional[Path] = None
+        self._segment_lock_fd: Optional[int] = None
+        self._segment_opened_at = 0.0
+        self._segment_rows = 0
+        self._segment_seq = itertools.count()
+
+    def record(
+        self,
+        decision: "TableDecision",
+        warehouse_id: str,
+        priority: Priority,
+        new_workload: float,
+        current_workload: float,
+        capacity: float,
+        order_id: Optional[str] = None,
+        snapshot_version: Optional[str] = None,
+    ) -> bool:
+        """
+        Append a decision to the buffer. Never blocks and never does I/O.
+
+        Args:
+            decision: Decision of the warehouse's threshold table
+            warehouse_id: Warehouse identifier
+            priority: Order priority
+            new_workload: Workload of the order (minutes)
+            current_workload: Warehouse workload the decision was based on
+            capacity: Usable capacity the decision was based on
+            order_id: Order identifier, if known
+            snapshot_version: Version of the warehouse snapshot used
+
+        Returns:
+            True if buffered, False if dropped because the buffer is full
+        """
+        if len(self._buffer) >= self.buffer_size:
+            audit_records_dropped_total.inc()
+            return False
+
+        # Tuple layout matches the column order of _audit_schema()
+        table = decision.table
+        self._buffer.append(
+            (
+                decision.calculated_at,
+                warehouse_id,
+                order_id,
+                priority.value,
+                snapshot_version,
+                new_workload,
+                current_workload,
+                capacity,
+                decision.can_ship_today,
+                float(decision.confidence),
+                decision.utilization,
+                decision.time_buffer_minutes,
+                table.bottleneck_resource,
+                decision.vip_override_used,
+                table.stale,
+            )
+        )
+
+        if self._flush_requested is not None and len(self._buffer) >= self.batch_size:
+            self._flush_requested.set()
+        return True
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background flush task is active."""
+        return self._task is not None
+
+    async def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is not None:
+            return
+        # Fail fast at startup rather than on the first flush
+        import pyarrow  # noqa: F401
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(recover_orphaned_segments, self.directory)
+        self._stopping = False
+        self._flush_requested = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info("audit_log_started", directory=str(self.directory))
+
+    async def stop(self) -> None:
+        """Stop the flush task, write remaining records and close the segment."""
+        if self._task is None:
+            return
+        # Let the task finish its in-flight flush instead of cancelling it:
+        # cancelling would not stop the writer thread
+        assert self._flush_requested is not None
+        self._stopping = True
+        self._flush_requested.set()
+        await self._task
+        self._task = None
+        await self.flush()
+        async with self._write_lock:
+            await asyncio.to_thread(self._close_segment)
+        logger.info("audit_log_stopped")
+
+    async def flush(self) -> int:
+        """
+        Drain the buffer and write it as one record batch.
+
+        Also rotates the current segment once it is old enough, so readers
+        see quiet periods' records without waiting for the row limit.
+
+        Returns:
+            Number of records written
+        """
+        async with self._write_lock:
+            batch = self._drain()
+            if batch or self._segment_due():
+                await asyncio.to_thread(self._write_batch, batch)
+        return len(batch)
+
+    async def _run(self) -> None:
+        """Flush on interval or when the buffer reaches batch size, until stopped."""
+        assert self._flush_requested is not None
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self.flush_interval_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("audit_flush_failed", error=str(e))
+
+    def _drain(self) -> list[tuple]:
+        """Take everything currently buffered."""
+        count = len(self._buffer)
+        return [self._buffer.popleft() for _ in range(count)]
+
+    def _segment_due(self) -> bool:
+        """Whether the current segment has reached its row or age limit."""
+        return self._writer is not None and (
+            self._segment_rows >= self.segment_max_rows
+            or time.monotonic() - self._segment_opened_at >= self.segment_max_age_seconds
+        )
+
+    def _write_batch(self, rows: list[tuple]) -> None:
+        """Write rows to the current segment, rotating when it is due (worker thread)."""
+        import pyarrow as pa
+
+        if rows:
+            schema = _audit_schema()
+            columns = list(zip(*rows))
+            record_batch = pa.RecordBatch.from_arrays(
+                [
+                    (
+                        pa.array(column, type=field.type)
+                        if not pa.types.is_dictionary(field.type)
+                        else pa.array(column, type=pa.string()).dictionary_encode().cast(field.type)
+                    )
+                    for column, field in zip(columns, schema)
+                ],
+                schema=schema,
+            )
+
+            if self._writer is None:
+                self._open_segment(schema)
+            self._writer.write_batch(record_batch)
+            self._segment_rows += len(rows)
+            audit_records_written_total.inc(len(rows))
+
+        if self._segment_due():
+            self._close_segment()
+
+    def _open_segment(self, schema: Any) -> None:
+        """Open a new in-progress segment file, locked for as long as it is written."""
+        import pyarrow as pa
+
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        seq = next(self._segment_seq)
+        path = self.directory / f"decisions-{stamp}-{os.getpid()}-{seq:04d}.arrow.tmp"
+        self._segment_lock_fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o644)
+        fcntl.flock(self._segment_lock_fd, fcntl.LOCK_EX)
+        self._segment_path = path
+        self._writer = pa.ipc.new_file(str(path), schema)
+        self._segment_opened_at = time.monotonic()
+        self._segment_rows = 0
+
+    def _close_segment(self) -> None:
+        """Finalize the current segment so readers can map it."""
+        if self._writer is None or self._segment_path is None:
+            return
+        self._writer.close()
+        final_path = self._segment_path.with_suffix("")
+        self._segment_path.rename(final_path)
+        if self._segment_lock_fd is not None:
+            os.close(self._segment_lock_fd)
+        logger.info("audit_segment_rotated", path=str(final_path), rows=self._segment_rows)
+        self._writer = None
+        self._segment_path = None
+        self._segment_lock_fd = None
+        self._segment_rows = 0
+
+
+def recover_orphaned_segments(directory: Path) -> int:
+    """
+    Finalize in-progress segments left behind by crashed writers.
+
+    A segment whose flock can be taken has no live writer. Its complete
+    record batches are rewritten as a finished ``.arrow`` segment (a
+    truncated last batch is dropped). Segments with no readable batch are
+    renamed to ``.arrow.orphaned`` so they are kept for inspection but never
+    read. Segments still locked by a live worker are left alone.
+
+    Args:
+        directory: Segment directory
+
+    Returns:
+        Number of records recovered
+    """
+    import pyarrow as pa
+
+    recovered = 0
+    for path in sorted(directory.glob("decisions-*.arrow.tmp")):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue
+            # A writer that just created the file locks it before writing
+            if os.fstat(fd).st_size == 0:
+                continue
+
+            batches = []
+            try:
+                source = pa.memory_map(str(path), "r")
+                # The file format is magic (8 bytes) + stream + footer; the footer is missing
+                reader = pa.ipc.open_stream(pa.BufferReader(source.read_buffer().slice(8)))
+                while True:
+                    batches.append(reader.read_next_batch())
+            except StopIteration:
+                pass
+            except (pa.ArrowInvalid, OSError) as e:
+                if not batches:
+                    path.rename(path.with_suffix(".orphaned"))
+                    logger.warning("audit_segment_orphaned", path=str(path), error=str(e))
+                    continue
+
+            final_path = path.with_suffix("")
+            partial_path = path.with_name(f"{path.name}.part")
+            with pa.ipc.new_file(str(partial_path), batches[0].schema) as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
+            partial_path.rename(final_path)
+            path.unlink()
+            rows = sum(batch.num_rows for batch in batches)
+            recovered += rows
+            logger.warning("audit_segment_recovered", path=str(final_path), rows=rows)
+        except OSError as e:
+            logger.error("audit_segment_recovery_failed", path=str(path), error=str(e))
+        finally:
+            os.close(fd)
+    return recovered
+
+
+def read_audit_log(directory: Optional[Path] = None) -> Any:
+    """
+    Load all completed audit segments as one Arrow table.
+
+    In-progress (``.tmp``) and unrecoverable (``.orphaned``) segments are
+    not read.
+
+    Segments are memory-mapped, so columns are read lazily from the page cache
+    instead of being copied into process memory. The ``status`` and
+    ``congestion_factor`` columns are derived from ``utilization`` (with the
+    current congestion alpha).
+
+    Args:
+        directory: Segment directory (defaults to settings.audit_dir)
+
+    Returns:
+        pyarrow.Table with one row per decision
+    """
+    import pyarrow as pa
+
+    directory = Path(directory or get_settings().audit_dir)
+    tables = []
+    for path in sorted(directory.glob("decisions-*.arrow")):
+        # The mapping stays alive for as long as the table references it
+        source = pa.memory_map(str(path), "r")
+        tables.append(pa.ipc.open_file(source).read_all())
+
+    table = pa.concat_tables(tables) if tables else _audit_schema().empty_table()
+    return _with_derived_columns(table)
+
+
+def _with_derived_columns(table: Any) -> Any:
+    """Append the status and congestion factor of each decision."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    utilization = table.column("utilization")
+    status = pa.scalar(DecisionStatus.CLOSED.value)
+    for upper_bound, bound_status in reversed(STATUS_THRESHOLDS):
+        status = pc.if_else(pc.less(utilization, float(upper_bound)), bound_status.value, status)
+
+    alpha = get_settings().congestion_alpha
+    congestion_factor = pc.add(1.0, pc.multiply(alpha, pc.multiply(utilization, utilization)))
+    return table.append_column("status", status.dictionary_encode()).append_column(
+        "congestion_factor", congestion_factor
+    )
+
+
+# Global repository instance
+_audit_repository: Optional[AuditRepository] = None
+
+
+def get_audit_repository() -> AuditRepository:
+    """Get global audit repository instance."""
+    global _audit_repository
+    if _audit_repository is None:
+        _audit_repository = AuditRepository()
+    return _audit_repository
@@ -1,16 +1,24 @@
 """
-Cache repository for storing and retrieving cached capacity decisions.
+Cache repository for Redis-backed counters.
+
+Capacity decisions are not cached here: the capacity check decides against
+the warehouse's in-process threshold table (app.services.threshold_table),
+which is cheaper than a Redis round trip.
+
+What Redis does hold is a state epoch per warehouse,
+
+    cache_epoch:{warehouse_id}
+
+bumped whenever the warehouse's state must be reloaded (see
+invalidate_warehouse_cache). Every worker compares the epochs against the
+ones its threshold tables were built under, so invalidation is a single
+INCR however many workers and instances hold tables.
 """
 
-import json
-from datetime import datetime
-from decimal import Decimal
-from typing import Any, Optional
+from typing import Optional
 
 from app.core.cache import get_cache
 from app.core.logging import get_logger
-from app.models.domain import Decision
-from app.models.requests import CapacityCheckRequest
 
 logger = get_logger(__name__)
 
@@ -22,111 +30,48 @@ class CacheRepository:
         """Initialize cache repository."""
         self._cache = get_cache()
 
-    def _serialize_decision(self, decision: Decision) -> str:
-        """
-        Serialize Decision object to JSON string.
-
-        Args:
-            decision: Decision object
-
-        Returns:
-            JSON string
-        """
-        # Convert to dict and handle Decimal/datetime serialization
-        data = decision.model_dump(mode="json")
-        return json.dumps(data, default=str)
-
-    def _deserialize_decision(self, data: str) -> Decision:
-        """
-        Deserialize JSON string to Decision object.
-
-        Args:
-            data: JSON string
-
-        Returns:
-            Decision object
-        """
-        parsed = json.loads(data)
-        return Decision(**parsed)
-
-    async def get_cached_decision(
-        self, request: CapacityCheckRequest
-    ) -> Optional[Decision]:
-        """
-        Get cached decision for a capacity check request.
-
-        Args:
-            request: Capacity check request
+    @staticmethod
+    def _epoch_key(warehouse_id: str) -> str:
+        """Counter holding a warehouse's state epoch."""
+        return f"cache_epoch:{warehouse_id}"
 
-        Returns:
-            Cached Decision or None
-        """
-        # Generate cache key from request parameters
-        key = self._cache.generate_key(
-            "capacity",
-            warehouse_id=request.warehouse_id,
-            priority=request.priority.value,
-            items=[(item.product_id, item.quantity) for item in request.items],
-        )
-
-        cached_data = await self._cache.get(key)
-        if cached_data:
-            try:
-                decision = self._deserialize_decision(cached_data)
-                logger.info("cache_decision_hit", key=key)
-                return decision
-            except Exception as e:
-                logger.error("cache_deserialize_error", key=key, error=str(e))
-                return None
-
-        logger.debug("cache_decision_miss", key=key)
-        return None
-
-    async def cache_decision(
-        self, request: CapacityCheckRequest, decision: Decision, ttl: Optional[int] = None
-    ) -> bool:
+    async def get_warehouse_epochs(self, warehouse_ids: list[str]) -> Optional[dict[str, int]]:
         """
-        Cache a capacity decision.
+        Get the current state epochs of several warehouses in one round trip.
 
         Args:
-            request: Capacity check request
-            decision: Decision to cache
-            ttl: Time-to-live in seconds
+            warehouse_ids: Warehouse identifiers
 
         Returns:
-            True if successful
+            Epoch per warehouse (0 if never bumped), or None if Redis is unavailable
         """
-        key = self._cache.generate_key(
-            "capacity",
-            warehouse_id=request.warehouse_id,
-            priority=request.priority.value,
-            items=[(item.product_id, item.quantity) for item in request.items],
-        )
-
-        try:
-            serialized = self._serialize_decision(decision)
-            result = await self._cache.set(key, serialized, ttl)
-            if result:
-                logger.info("cache_decision_stored", key=key, ttl=ttl)
-            return result
-        except Exception as e:
-            logger.error("cache_store_error", key=key, error=str(e))
-            return False
+        if not warehouse_ids:
+            return {}
+        values = await self._cache.get_many([self._epoch_key(w) for w in warehouse_ids])
+        if values is None:
+            return None
+        return {
+            warehouse_id: int(value) if value else 0
+            for warehouse_id, value in zip(warehouse_ids, values)
+        }
 
     async def invalidate_warehouse_cache(self, warehouse_id: str) -> int:
         """
-        Invalidate all cache entries for a warehouse.
+        Invalidate a warehouse's cached state by advancing its epoch.
+
+        O(1) whatever the keyspace: nothing is deleted, every worker drops
+        threshold tables built under an older epoch when it sees the new one.
 
         Args:
             warehouse_id: Warehouse identifier
 
         Returns:
-            Number of keys deleted
+            New epoch, or 0 if Redis is unavailable
         """
-        # TODO: Implement pattern-based deletion
-        # This requires SCAN command in Redis
-        logger.info("cache_invalidate_warehouse", warehouse_id=warehouse_id)
-        return 0
+        epoch = await self._cache.increment(self._epoch_key(warehouse_id))
+        if epoch:
+            logger.info("cache_epoch_bumped", warehouse_id=warehouse_id, epoch=epoch)
+        return epoch
 
     async def increment_rate_limit(
         self, user_id: str, endpoint: str, window_seconds: int = 60
@@ -3,31 +3,130 @@ SAP HANA repository for querying CDS views.
 Placeholder implementation - requires actual HANA connection setup.
 """
 
+import asyncio
+import functools
+import time
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional, TypeVar
 
 from app.config import get_settings
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.hedging import HedgedReader
 from app.core.logging import get_logger
+from app.core.metrics import db_query_duration_seconds
+from app.core.timing import stage
 from app.models.domain import DecisionStatus, OrderStatus, ResourceType
-from app.repositories.mock_hana_data import get_mock_data
+from app.repositories.mock_hana_data import get_mock_data, mock_query_latency
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+
+def guarded_query(
+    query_type: str, bulk: bool = False
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Run a repository query through the HANA circuit breaker with a timeout.
+
+    Bulk loads (startup snapshots, seconds long by design) bypass the
+    breaker and get their own, longer timeout: they would always exceed the
+    request timeout and open the breaker for every request query.
+
+    The query is timed as the request's ``hana`` stage.
+
+    Args:
+        query_type: Query name for the db_query_duration_seconds metric
+        bulk: Use hana_bulk_query_timeout_seconds and skip the breaker
+
+    Returns:
+        Decorator for async HANARepository methods
+    """
+
+    def decorator(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(method)
+        async def wrapper(self: "HANARepository", *args: Any, **kwargs: Any) -> T:
+            started = time.perf_counter()
+            try:
+                with stage("hana"):
+                    if bulk:
+                        return await asyncio.wait_for(
+                            method(self, *args, **kwargs), self.bulk_query_timeout_seconds
+                        )
+                    return await self.breaker.call(
+                        lambda: method(self, *args, **kwargs), timeout=self.query_timeout_seconds
+                    )
+            finally:
+                db_query_duration_seconds.labels(query_type=query_type).observe(
+                    time.perf_counter() - started
+                )
+
+        return wrapper
+
+    return decorator
+
 
 class HANARepository:
     """Repository for SAP HANA database operations."""
 
-    def __init__(self, use_mock: bool = True) -> None:
+    def __init__(
+        self,
+        use_mock: bool = True,
+        read_endpoints: Optional[list[str]] = None,
+        mock_latency: Optional[Callable[[str], float]] = None,
+    ) -> None:
         """
         Initialize HANA repository.
 
         Args:
             use_mock: Use mock data for demo (default True)
+            read_endpoints: Endpoints for hedged reads (defaults to
+                settings.hana_read_endpoints, or hana_host alone)
+            mock_latency: Seconds a mock read takes on a given endpoint
+                (defaults to random latency around settings.hana_mock_latency_ms)
         """
+        settings = get_settings()
         self._connection = None
         self._use_mock = use_mock
         self._mock_data = get_mock_data() if use_mock else None
+        self._mock_latency = mock_latency
+        self._mock_latency_ms = settings.hana_mock_latency_ms
+        self.reader = HedgedReader(
+            read_endpoints
+            or settings.hana_read_endpoints
+            or [f"{settings.hana_host}:{settings.hana_port}"],
+            quantile=settings.hana_hedge_quantile,
+            min_delay_seconds=settings.hana_hedge_min_delay_ms / 1000,
+        )
+        self.query_timeout_seconds = settings.hana_query_timeout_seconds
+        self.bulk_query_timeout_seconds = settings.hana_bulk_query_timeout_seconds
+        self.breaker = CircuitBreaker(
+            "hana",
+            failure_threshold=settings.hana_breaker_failure_threshold,
+            reset_timeout_seconds=settings.hana_breaker_reset_seconds,
+        )
+
+    async def _mock_read(self, query_type: str, produce: Callable[[], T]) -> T:
+        """
+        Serve mock data through the hedged reader, with simulated latency.
+
+        Args:
+            query_type: Query name (hedge delay is tracked per type)
+            produce: Returns the mock result
+
+        Returns:
+            Mock result
+        """
+
+        async def attempt(endpoint: str) -> T:
+            if self._mock_latency is not None:
+                await asyncio.sleep(self._mock_latency(endpoint))
+            elif self._mock_latency_ms > 0:
+                await asyncio.sleep(mock_query_latency(self._mock_latency_ms))
+            return produce()
+
+        return await self.reader.read(query_type, attempt)
 
     async def connect(self) -> None:
         """Establish connection to HANA database."""
@@ -47,6 +146,7 @@ class HANARepository:
             # TODO: Close connection
             logger.info("hana_disconnection_placeholder")
 
+    @guarded_query("order_workload")
     async def get_order_workload(self, order_id: str) -> Optional[Decimal]:
         """
         Get workload for a specific order from V_ORDER_WORKLOAD_AGG.
@@ -72,6 +172,7 @@ class HANARepository:
         logger.debug("query_order_workload", order_id=order_id, query="V_ORDER_WORKLOAD_AGG")
         return Decimal("15.5")
 
+    @guarded_query("warehouse_capacity")
     async def get_current_warehouse_capacity(
         self, warehouse_id: str, resource_date: Optional[date] = None
     ) -> dict[str, Any]:
@@ -89,7 +190,9 @@ class HANARepository:
 
         if self._use_mock and self._mock_data:
             # Return mock capacity data
-            return self._mock_data.get_warehouse_capacity(warehouse_id)
+            return await self._mock_read(
+                "warehouse_capacity", lambda: self._mock_data.get_warehouse_capacity(warehouse_id)
+            )
 
         # TODO: Implement actual query
         query = """
@@ -122,6 +225,7 @@ class HANARepository:
             "usable_capacity": Decimal("3.6"),
         }
 
+    @guarded_query("cutoff_calculation")
     async def get_cutoff_calculation(self, warehouse_id: str) -> dict[str, Any]:
         """
         Get current cutoff calculation from V_CUTOFF_CALCULATION.
@@ -134,7 +238,9 @@ class HANARepository:
         """
         if self._use_mock and self._mock_data:
             # Return mock cutoff calculation
-            return self._mock_data.get_cutoff_calculation(warehouse_id)
+            return await self._mock_read(
+                "cutoff_calculation", lambda: self._mock_data.get_cutoff_calculation(warehouse_id)
+            )
 
         # TODO: Implement actual query
         query = """
@@ -163,6 +269,91 @@ class HANARepository:
             "system_status": DecisionStatus.WARNING,
         }
 
+    @guarded_query("ping")
+    async def ping(self) -> None:
+        """Run a trivial query to check that HANA answers."""
+        if self._use_mock:
+            await self._mock_read("ping", lambda: None)
+            return
+        await self.execute_query("SELECT 1 FROM DUMMY")
+
+    @guarded_query("list_warehouses")
+    async def list_warehouses(self) -> list[str]:
+        """
+        Get identifiers of all configured warehouses.
+
+        Returns:
+            Warehouse identifiers
+        """
+        if self._use_mock and self._mock_data:
+            return list(self._mock_data.warehouses)
+
+        query = """
+        SELECT DISTINCT warehouse_id
+        FROM V_WAREHOUSE_CAPACITY
+        WHERE resource_date = CURRENT_DATE
+        """
+        rows = await self.execute_query(query)
+        return [row["warehouse_id"] for row in rows]
+
+    @guarded_query("cutoff_calculations")
+    async def get_cutoff_calculations(
+        self, warehouse_ids: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Get cutoff calculations for many warehouses in one V_CUTOFF_CALCULATION query.
+
+        Args:
+            warehouse_ids: Warehouse identifiers
+
+        Returns:
+            Cutoff calculation data keyed by warehouse identifier
+        """
+        if not warehouse_ids:
+            return {}
+
+        if self._use_mock and self._mock_data:
+            return await self._mock_read(
+                "cutoff_calculations",
+                lambda: {
+                    warehouse_id: self._mock_data.get_cutoff_calculation(warehouse_id)
+                    for warehouse_id in warehouse_ids
+                },
+            )
+
+        placeholders = ", ".join("?" for _ in warehouse_ids)
+        query = f"""
+        SELECT
+            warehouse_id,
+            calc_date,
+            calc_time,
+            total_remaining_workload,
+            current_capacity,
+            current_utilization,
+            system_status
+        FROM V_CUTOFF_CALCULATION
+        WHERE warehouse_id IN ({placeholders})
+        """
+        logger.debug(
+            "query_cutoff_calculations",
+            warehouse_count=len(warehouse_ids),
+            query="V_CUTOFF_CALCULATION",
+        )
+
+        params = tuple(warehouse_ids)
+        rows = await self.reader.read(
+            "cutoff_calculations",
+            lambda endpoint: self.execute_query(query, params, endpoint=endpoint),
+        )
+        return {
+            row["warehouse_id"]: {
+                **row,
+                "system_status": DecisionStatus(row["system_status"]),
+            }
+            for row in rows
+        }
+
+    @guarded_query("orders_by_status")
     async def get_orders_by_status(
         self, warehouse_id: str, status: Optional[OrderStatus] = None
     ) -> list[dict[str, Any]]:
@@ -210,6 +401,55 @@ class HANARepository:
             },
         ]
 
+    @guarded_query("order_workload_batches", bulk=True)
+    async def get_order_workload_batches(self, batch_size: Optional[int] = None) -> list[Any]:
+        """
+        Fetch all open order lines from V_ORDER_WORKLOAD as Arrow record batches.
+
+        Args:
+            batch_size: Rows per record batch (defaults to settings.order_snapshot_batch_size)
+
+        Returns:
+            pyarrow.RecordBatch objects with the order workload snapshot columns
+        """
+        import pyarrow as pa
+
+        from app.repositories.order_workload_snapshot import order_workload_schema
+
+        schema = order_workload_schema()
+        batch_size = batch_size or get_settings().order_snapshot_batch_size
+
+        if self._use_mock and self._mock_data:
+            return await self._mock_read(
+                "order_workload_batches",
+                lambda: [pa.RecordBatch.from_pylist(self._mock_order_lines(), schema=schema)],
+            )
+
+        # TODO: Implement actual query; fetchmany(batch_size) row tuples of
+        #   SELECT werks AS warehouse_id, vbeln AS order_id, item_workload, status
+        #   FROM V_ORDER_WORKLOAD
+        # are transposed into one column list per field, then one RecordBatch.
+        # Until then, fail loudly: an empty snapshot would read as "no open orders".
+        logger.debug("query_order_workload_batches", batch_size=batch_size)
+        raise NotImplementedError("V_ORDER_WORKLOAD batch query is not implemented")
+
+    def _mock_order_lines(self) -> list[dict[str, Any]]:
+        """Order lines of the demo orders, weighted like V_ORDER_WORKLOAD."""
+        lines = []
+        for order in self._mock_data.orders:
+            for item in order["items"]:
+                weights = self._mock_data.get_product_weight_config(item["product_id"])
+                lines.append({
+                    "warehouse_id": "WH-MAIN",
+                    "order_id": order["order_id"],
+                    "item_workload": float(
+                        item["quantity"] * weights["weight_factor"] * weights["location_factor"]
+                    ),
+                    "status": order["status"].value,
+                })
+        return lines
+
+    @guarded_query("product_weight")
     async def get_product_weight_config(self, product_id: str) -> dict[str, Decimal]:
         """
         Get product weight configuration from ZCUSTOM_WEIGHT.
@@ -241,13 +481,16 @@ class HANARepository:
             "handling_time": Decimal("0.0"),
         }
 
-    async def execute_query(self, query: str, params: Optional[tuple] = None) -> list[dict]:
+    async def execute_query(
+        self, query: str, params: Optional[tuple] = None, endpoint: Optional[str] = None
+    ) -> list[dict]:
         """
         Execute raw SQL query.
 
         Args:
             query: SQL query string
             params: Query parameters
+            endpoint: Read endpoint to run on (None = primary connection)
 
         Returns:
             Query results as list of dictionaries
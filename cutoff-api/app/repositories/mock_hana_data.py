@@ -275,6 +275,20 @@ class MockHANAData:
 _mock_data: MockHANAData | None = None
 
 
+def mock_query_latency(median_ms: float, sigma: float = 0.6) -> float:
+    """
+    Random query latency with a long right tail (log-normal).
+
+    Args:
+        median_ms: Median latency in milliseconds
+        sigma: Spread of the underlying normal distribution
+
+    Returns:
+        Latency in seconds
+    """
+    return random.lognormvariate(0.0, sigma) * median_ms / 1000
+
+
 def get_mock_data(scenario: str = "normal") -> MockHANAData:
     """Get or create mock data instance."""
     global _mock_data
@@ -0,0 +1,252 @@
+"""
+Bulk snapshot of open order lines (V_ORDER_WORKLOAD) in columnar form.
+
+Rebuilding warehouse state row by row from HANA does not scale to 100k+
+open lines. A snapshot is instead materialized as one Arrow table, either
+from record batches fetched from HANA or from a periodic Parquet export of
+V_ORDER_WORKLOAD (a single file, or a directory holding the part files of
+one export). Parquet files are memory-mapped and the table references the
+Arrow buffers directly; per-warehouse and per-order aggregates are computed
+with Arrow compute kernels, never row by row in Python.
+
+Columns:
+
+    warehouse_id   string (dictionary-encoded)
+    order_id       string
+    item_workload  float64, workload of the line in minutes
+    status         string (dictionary-encoded), OrderStatus of the order
+"""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from app.config import get_settings
+from app.core.logging import get_logger
+from app.models.domain import OrderStatus
+from app.repositories.hana_repository import get_hana_repository
+from app.services.workload_calculator import WorkloadCalculator
+
+logger = get_logger(__name__)
+
+# Remaining share of an order's workload by status
+_PROGRESS = {
+    status.value: float(factor) for status, factor in WorkloadCalculator.PROGRESS_FACTORS.items()
+}
+
+
+def order_workload_schema() -> Any:
+    """Arrow schema of snapshot tables (pyarrow imported lazily)."""
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("warehouse_id", pa.dictionary(pa.int32(), pa.string())),
+            ("order_id", pa.string()),
+            ("item_workload", pa.float64()),
+            ("status", pa.dictionary(pa.int8(), pa.string())),
+        ]
+    )
+
+
+def _check_columns(names: list[str]) -> None:
+    """
+    Check that the snapshot columns are present.
+
+    Raises:
+        ValueError: If a column is missing
+    """
+    missing = [name for name in order_workload_schema().names if name not in names]
+    if missing:
+        raise ValueError(f"Order workload snapshot is missing columns: {', '.join(missing)}")
+
+
+class OrderWorkloadSnapshot:
+    """Open order lines of all warehouses as one Arrow table."""
+
+    def __init__(self, table: Any, source: str) -> None:
+        """
+        Initialize snapshot.
+
+        Args:
+            table: pyarrow.Table with at least the snapshot columns
+            source: Where the rows came from (for logging)
+
+        Raises:
+            ValueError: If a column is missing or has an incompatible type,
+                or a status is not an OrderStatus
+        """
+        schema = order_workload_schema()
+        _check_columns(table.column_names)
+        try:
+            # One dictionary per column across all chunks (indices are remapped, not copied)
+            self.table = table.select(schema.names).cast(schema).unify_dictionaries()
+        except Exception as e:  # pyarrow raises ArrowInvalid / ArrowNotImplementedError
+            raise ValueError(f"Order workload snapshot has incompatible columns: {e}") from e
+        self.source = source
+        self._remaining = self._remaining_column()
+
+    @classmethod
+    def from_batches(
+        cls, batches: Iterable[Any], source: str = "batches"
+    ) -> "OrderWorkloadSnapshot":
+        """
+        Build a snapshot from Arrow record batches without copying them.
+
+        Args:
+            batches: pyarrow.RecordBatch objects sharing one schema
+            source: Where the batches came from (for logging)
+
+        Returns:
+            Snapshot over the batches
+        """
+        import pyarrow as pa
+
+        batches = list(batches)
+        if not batches:
+            return cls(order_workload_schema().empty_table(), source)
+        return cls(pa.Table.from_batches(batches), source)
+
+    @classmethod
+    def from_parquet(cls, path: str | Path) -> "OrderWorkloadSnapshot":
+        """
+        Read a Parquet export of V_ORDER_WORKLOAD.
+
+        Args:
+            path: Parquet file, or directory of part files of one export
+
+        Returns:
+            Snapshot over the export
+
+        Raises:
+            RuntimeError: If pyarrow is not installed
+            FileNotFoundError: If the path does not exist
+        """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Loading Parquet snapshots requires pyarrow") from e
+
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(path)
+        dataset = pq.ParquetDataset(path, memory_map=True)
+        _check_columns(dataset.schema.names)
+        table = dataset.read(columns=order_workload_schema().names, use_threads=True)
+        return cls(table, str(path))
+
+    @property
+    def num_rows(self) -> int:
+        """Number of order lines."""
+        return self.table.num_rows
+
+    def _remaining_column(self) -> Any:
+        """Remaining workload per line: item workload x progress factor of its status."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        chunks = []
+        for chunk in self.table.column("status").chunks:
+            # One factor per dictionary value, gathered by the chunk's indices
+            if chunk.null_count:
+                raise ValueError("Order workload snapshot has lines without status")
+            values = chunk.dictionary.to_pylist()
+            unknown = [value for value in values if value not in _PROGRESS]
+            if unknown:
+                raise ValueError(f"Unknown order status in snapshot: {', '.join(unknown)}")
+            factors = pa.array([_PROGRESS[value] for value in values], pa.float64())
+            chunks.append(factors.take(chunk.indices))
+        progress = pa.chunked_array(chunks, pa.float64())
+        return pc.multiply(pc.fill_null(self.table.column("item_workload"), 0.0), progress)
+
+    def remaining_workload_by_warehouse(self) -> dict[str, float]:
+        """
+        Total remaining workload per warehouse.
+
+        Returns:
+            Remaining workload in minutes by warehouse id
+        """
+        import pyarrow as pa
+
+        totals = (
+            pa.table(
+                {
+                    "warehouse_id": self.table.column("warehouse_id"),
+                    "remaining": self._remaining,
+                }
+            )
+            .group_by("warehouse_id")
+            .aggregate([("remaining", "sum")])
+        )
+        return dict(
+            zip(
+                totals.column("warehouse_id").to_pylist(),
+                totals.column("remaining_sum").to_pylist(),
+            )
+        )
+
+    def orders(self) -> Iterator[tuple[str, str, float, OrderStatus]]:
+        """
+        Order-level rows: lines summed per (warehouse, order).
+
+        Returns:
+            Iterator of (warehouse_id, order_id, workload, status)
+        """
+        import pyarrow as pa
+
+        if self.num_rows == 0:
+            return
+        status = self.table.column("status")
+        # Dictionaries are unified, so indices of all chunks refer to the same values
+        statuses = [OrderStatus(value) for value in status.chunk(0).dictionary.to_pylist()]
+        lines = pa.table(
+            {
+                "warehouse_id": self.table.column("warehouse_id"),
+                "order_id": self.table.column("order_id"),
+                "item_workload": self.table.column("item_workload"),
+                "status": pa.chunked_array([chunk.indices for chunk in status.chunks]),
+            }
+        )
+        orders = (
+            lines.group_by(["warehouse_id", "order_id"], use_threads=False)
+            .aggregate([("item_workload", "sum"), ("status", "first")])
+            .unify_dictionaries()
+        )
+        # Converting dictionary arrays value by value is slow: map the indices instead
+        warehouse_ids = orders.column("warehouse_id")
+        names = warehouse_ids.chunk(0).dictionary.to_pylist()
+        for warehouse_index, order_id, workload, status_index in zip(
+            pa.chunked_array([chunk.indices for chunk in warehouse_ids.chunks]).to_pylist(),
+            orders.column("order_id").to_pylist(),
+            orders.column("item_workload_sum").to_pylist(),
+            orders.column("status_first").to_pylist(),
+        ):
+            yield names[warehouse_index], order_id, workload or 0.0, statuses[status_index]
+
+
+async def load_order_workload_snapshot(path: Optional[str] = None) -> OrderWorkloadSnapshot:
+    """
+    Load the current order-workload snapshot.
+
+    Args:
+        path: Parquet export to read (defaults to settings.order_snapshot_path;
+            None fetches Arrow batches from HANA)
+
+    Returns:
+        Snapshot of all open order lines
+    """
+    path = path or get_settings().order_snapshot_path
+    started = time.perf_counter()
+    if path:
+        snapshot = await asyncio.to_thread(OrderWorkloadSnapshot.from_parquet, path)
+    else:
+        batches = await get_hana_repository().get_order_workload_batches()
+        snapshot = OrderWorkloadSnapshot.from_batches(batches, source="hana")
+    logger.info(
+        "order_snapshot_loaded",
+        source=snapshot.source,
+        rows=snapshot.num_rows,
+        duration_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+    return snapshot
@@ -7,7 +7,8 @@ from decimal import Decimal
 from typing import Optional
 
 from app.core.logging import get_logger
-from app.models.domain import ResourceCapacity, ResourceType, WarehouseCapacity
+from app.models.domain import ResourceType
+from app.models.internal import ResourceCapacity, WarehouseCapacity
 
 logger = get_logger(__name__)
 
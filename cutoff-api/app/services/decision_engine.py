@@ -3,18 +3,26 @@ Decision engine - core business logic for capacity decisions.
 Implements algorithm from docs/03-algorithm.md
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Optional
+from typing import Callable, Optional
 
 from app.config import get_settings
 from app.core.logging import get_logger
-from app.models.domain import Decision, DecisionFactors, DecisionStatus, Priority
+from app.models.domain import DecisionStatus, Priority, ResourceType
+from app.models.internal import Decision, DecisionFactors
 from app.services.capacity_service import CapacityService
 from app.services.workload_calculator import WorkloadCalculator
 
 logger = get_logger(__name__)
 
+# Exclusive upper utilization bound of each status; at or above the last it is CLOSED
+STATUS_THRESHOLDS = (
+    (Decimal("0.70"), DecisionStatus.ACCEPTING),
+    (Decimal("0.85"), DecisionStatus.WARNING),
+    (Decimal("0.95"), DecisionStatus.CRITICAL),
+)
+
 
 class DecisionEngine:
     """
@@ -36,6 +44,7 @@ class DecisionEngine:
         self,
         workload_calculator: WorkloadCalculator,
         capacity_service: CapacityService,
+        clock: Callable[[], datetime] = datetime.now,
     ) -> None:
         """
         Initialize decision engine.
@@ -43,11 +52,41 @@ class DecisionEngine:
         Args:
             workload_calculator: Workload calculation service
             capacity_service: Capacity calculation service
+            clock: Source of the current time (injectable for replay/backtests)
         """
         self.workload_calculator = workload_calculator
         self.capacity_service = capacity_service
+        self.clock = clock
         self.settings = get_settings()
 
+    @staticmethod
+    def calculated_at(now: datetime) -> datetime:
+        """
+        Decision timestamp for a clock reading, in naive UTC like datetime.utcnow().
+
+        Args:
+            now: Clock reading (naive local time, or timezone-aware)
+
+        Returns:
+            The same instant in naive UTC
+        """
+        return now.astimezone(timezone.utc).replace(tzinfo=None)
+
+    def shift_deadline(self, now: datetime) -> datetime:
+        """
+        Default deadline: end of the current shift at 16:00.
+
+        Args:
+            now: Current time
+
+        Returns:
+            Today's 16:00, or tomorrow's once it has passed
+        """
+        deadline = now.replace(hour=16, minute=0, second=0, microsecond=0)
+        if now >= deadline:
+            deadline += timedelta(days=1)
+        return deadline
+
     def calculate_processing_time(
         self, workload: Decimal, capacity: Decimal, utilization: Decimal
     ) -> Decimal:
@@ -96,14 +135,10 @@ class DecisionEngine:
         Returns:
             DecisionStatus
         """
-        if utilization < Decimal("0.70"):
-            return DecisionStatus.ACCEPTING
-        elif utilization < Decimal("0.85"):
-            return DecisionStatus.WARNING
-        elif utilization < Decimal("0.95"):
-            return DecisionStatus.CRITICAL
-        else:
-            return DecisionStatus.CLOSED
+        for upper_bound, status in STATUS_THRESHOLDS:
+            if utilization < upper_bound:
+                return status
+        return DecisionStatus.CLOSED
 
     def calculate_confidence(
         self,
@@ -171,12 +206,11 @@ class DecisionEngine:
         Returns:
             Decision object
         """
-        # Set default deadline (end of shift at 16:00)
+        # Read the clock once so all time-derived values are consistent
+        now = self.clock()
+
         if deadline is None:
-            now = datetime.now()
-            deadline = now.replace(hour=16, minute=0, second=0, microsecond=0)
-            if now >= deadline:
-                deadline += timedelta(days=1)
+            deadline = self.shift_deadline(now)
 
         # Calculate projected utilization
         projected_workload = current_workload + new_workload
@@ -193,10 +227,10 @@ class DecisionEngine:
         )
 
         # Estimate completion time
-        estimated_completion = datetime.now() + timedelta(minutes=float(processing_time))
+        estimated_completion = now + timedelta(minutes=float(processing_time))
 
         # Calculate time buffer
-        time_remaining = (deadline - datetime.now()).total_seconds() / 60
+        time_remaining = (deadline - now).total_seconds() / 60
         safety_buffer = self.settings.safety_buffer_minutes
         time_buffer = int(time_remaining - float(processing_time))
 
@@ -238,7 +272,7 @@ class DecisionEngine:
             workload_impact=new_workload,
             remaining_capacity=capacity - projected_workload,
             time_buffer_minutes=time_buffer,
-            bottleneck_resource=bottleneck_resource,
+            bottleneck_resource=ResourceType(bottleneck_resource),
             congestion_factor=self.workload_calculator.calculate_congestion_factor(
                 projected_utilization
             ),
@@ -254,6 +288,7 @@ class DecisionEngine:
             estimated_completion=estimated_completion,
             message=message,
             factors=factors,
+            calculated_at=self.calculated_at(now),
         )
 
         logger.info(
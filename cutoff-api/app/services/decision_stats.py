@@ -0,0 +1,209 @@
+"""
+Time-bucketed decision counters for the /status dashboard.
+
+Decisions are counted in-process per warehouse and per minute, then flushed
+to Redis hashes in batches (one hash per warehouse-minute):
+
+    decision_stats:{warehouse_id}:{YYYYMMDD}:{HHMM}
+        total, approved, rejected, vip_override,
+        {priority}:approved, {priority}:rejected
+
+Today's statistics are answered by summing the pre-aggregated minute buckets,
+so the cost is bounded by the number of minutes elapsed (≤ 1440), never by
+the number of decisions.
+"""
+
+import asyncio
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from app.core.cache import get_cache
+from app.core.logging import get_logger
+from app.models.domain import Priority
+
+logger = get_logger(__name__)
+
+KEY_PREFIX = "decision_stats"
+BUCKET_TTL_SECONDS = 2 * 24 * 3600
+
+# (warehouse_id, "YYYYMMDD", "HHMM")
+BucketKey = tuple[str, str, str]
+
+
+class DecisionStatsRecorder:
+    """Per-warehouse, per-minute decision counters with batched Redis flushes."""
+
+    def __init__(
+        self,
+        flush_interval_seconds: float = 5.0,
+        clock: Callable[[], datetime] = datetime.now,
+    ) -> None:
+        """
+        Initialize recorder.
+
+        Args:
+            flush_interval_seconds: Time between Redis flushes
+            clock: Source of the current time
+        """
+        self.flush_interval_seconds = flush_interval_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        # Counts not yet written to Redis
+        self._pending: dict[BucketKey, Counter] = defaultdict(Counter)
+        # Today's counts seen by this process (fallback when Redis is unavailable)
+        self._local: dict[BucketKey, Counter] = defaultdict(Counter)
+        self._local_day: Optional[str] = None
+        # Held while a batch is between _pending and Redis, so readers see it exactly once
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(
+        self,
+        warehouse_id: str,
+        can_ship_today: bool,
+        priority: Priority,
+        vip_override: bool = False,
+    ) -> None:
+        """
+        Count one decision in the current minute bucket.
+
+        Args:
+            warehouse_id: Warehouse identifier
+            can_ship_today: Decision outcome
+            priority: Order priority
+            vip_override: Whether the VIP reserve was used
+        """
+        now = self.clock()
+        day = now.strftime("%Y%m%d")
+        bucket = (warehouse_id, day, now.strftime("%H%M"))
+        outcome = "approved" if can_ship_today else "rejected"
+
+        with self._lock:
+            if day != self._local_day:
+                self._local.clear()
+                self._local_day = day
+            for counts in (self._pending[bucket], self._local[bucket]):
+                counts["total"] += 1
+                counts[outcome] += 1
+                counts[f"{priority.value}:{outcome}"] += 1
+                if vip_override:
+                    counts["vip_override"] += 1
+
+    async def flush(self) -> int:
+        """
+        Write pending counts to Redis in a single pipeline.
+
+        Returns:
+            Number of buckets flushed
+        """
+        async with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, defaultdict(Counter)
+            if not pending:
+                return 0
+
+            try:
+                pipe = get_cache().redis.pipeline(transaction=False)
+                for bucket, counts in pending.items():
+                    key = _bucket_key(*bucket)
+                    for field, amount in counts.items():
+                        pipe.hincrby(key, field, amount)
+                    pipe.expire(key, BUCKET_TTL_SECONDS)
+                await pipe.execute()
+            except Exception as e:
+                # Put the counts back so the next flush retries them
+                with self._lock:
+                    for bucket, counts in pending.items():
+                        self._pending[bucket].update(counts)
+                logger.warning("decision_stats_flush_failed", error=str(e))
+                return 0
+
+        logger.debug("decision_stats_flushed", buckets=len(pending))
+        return len(pending)
+
+    async def get_today_stats(self, warehouse_id: str) -> Counter:
+        """
+        Sum today's minute buckets for a warehouse.
+
+        Reads flushed buckets from Redis (shared by all workers) plus this
+        process's unflushed counts. A flush in progress is waited for, so its
+        batch is counted once: in Redis, or back in the pending counts if the
+        flush failed. Falls back to this process's own buckets when Redis is
+        unavailable.
+
+        Args:
+            warehouse_id: Warehouse identifier
+
+        Returns:
+            Counter with total/approved/rejected/vip_override and per-priority fields
+        """
+        now = self.clock()
+        day = now.strftime("%Y%m%d")
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        minutes = int((now - midnight).total_seconds() // 60) + 1
+
+        totals: Counter = Counter()
+        try:
+            async with self._flush_lock:
+                pipe = get_cache().redis.pipeline(transaction=False)
+                for offset in range(minutes):
+                    minute = (midnight + timedelta(minutes=offset)).strftime("%H%M")
+                    pipe.hgetall(_bucket_key(warehouse_id, day, minute))
+                for bucket in await pipe.execute():
+                    for field, value in bucket.items():
+                        totals[field] += int(value)
+                with self._lock:
+                    for (wh, bucket_day, _), counts in self._pending.items():
+                        if wh == warehouse_id and bucket_day == day:
+                            totals.update(counts)
+        except Exception as e:
+            logger.warning("decision_stats_redis_unavailable", error=str(e))
+            totals = Counter()
+            with self._lock:
+                for (wh, bucket_day, _), counts in self._local.items():
+                    if wh == warehouse_id and bucket_day == day:
+                        totals.update(counts)
+
+        return totals
+
+    async def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write remaining counts."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        """Flush pending counts on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
+
+
+def _bucket_key(warehouse_id: str, day: str, minute: str) -> str:
+    """Redis hash key for one warehouse-minute bucket."""
+    return f"{KEY_PREFIX}:{warehouse_id}:{day}:{minute}"
+
+
+# Global recorder instance
+_decision_stats: Optional[DecisionStatsRecorder] = None
+
+
+def get_decision_stats() -> DecisionStatsRecorder:
+    """Get global decision stats recorder instance."""
+    global _decision_stats
+    if _decision_stats is None:
+        _decision_stats = DecisionStatsRecorder()
+    return _decision_stats
@@ -0,0 +1,326 @@
+"""
+Order and delivery event ingestion from a Redis Stream.
+
+Event Mesh publishes order-created, order-changed and delivery-status events
+to a Redis Stream (docs/04-data-model.md, real-time refresh). Every API
+worker decides capacity checks from its own in-memory state, so every
+worker reads every event: each one follows the stream with plain XREAD from
+its last entry id (no consumer group, nothing to acknowledge):
+
+    XREAD   up to batch_size entries after the last id, blocking while idle
+    dedupe  event ids seen recently are skipped (publishers deliver at
+            least once)
+    apply   order workload and status update per-warehouse state in memory;
+            remaining workload is maintained incrementally
+
+The state lives only in memory, so a restarted worker does not resume from
+where it stopped: it notes the end of the stream (seek_to_end), seeds the
+state in bulk from an order workload snapshot (load_snapshot) and then
+applies the events appended since. An event the snapshot already reflects
+sets an order to the values it already has, so the overlap is harmless.
+Threshold tables take a warehouse's remaining workload from this state only
+for warehouses the snapshot seeded (see app.services.threshold_table); events
+alone do not know the orders opened before the worker started. Shipped orders
+no longer count and are dropped, so the state holds open orders only.
+Stream fields (all strings):
+
+    event_id      unique id from the publisher (defaults to the entry id)
+    type          order_created | order_changed | delivery_status
+    warehouse_id  warehouse of the order
+    order_id      order identifier
+    workload      order workload in minutes, finite and non-negative
+                  (order_created, optional on change)
+    status        OrderStatus value (optional, NEW for new orders)
+"""
+
+import asyncio
+import math
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Optional
+
+from app.config import get_settings
+from app.core.cache import get_cache
+from app.core.logging import get_logger
+from app.core.metrics import (
+    event_batch_size,
+    event_stream_lag,
+    events_ingested_total,
+)
+from app.models.domain import OrderStatus
+from app.repositories.order_workload_snapshot import OrderWorkloadSnapshot
+from app.services.workload_calculator import WorkloadCalculator
+
+logger = get_logger(__name__)
+
+EVENT_TYPES = ("order_created", "order_changed", "delivery_status")
+
+# Remaining share of an order's workload by status
+_PROGRESS = {
+    status: float(factor) for status, factor in WorkloadCalculator.PROGRESS_FACTORS.items()
+}
+
+
+class WarehouseEventState:
+    """Orders of one warehouse as known from events."""
+
+    __slots__ = ("orders", "remaining_workload", "status_counts", "last_event_ms")
+
+    def __init__(self) -> None:
+        """Initialize empty state."""
+        # order_id -> (workload, status)
+        self.orders: dict[str, tuple[float, OrderStatus]] = {}
+        self.remaining_workload = 0.0
+        self.status_counts: Counter[OrderStatus] = Counter()
+        self.last_event_ms = 0
+
+    def upsert(
+        self, order_id: str, workload: Optional[float], status: Optional[OrderStatus]
+    ) -> None:
+        """
+        Create or update an order, adjusting the aggregates by the difference.
+
+        An order that reaches SHIPPED no longer contributes and is removed.
+
+        Args:
+            order_id: Order identifier
+            workload: New workload in minutes (None keeps the current one)
+            status: New status (None keeps the current one)
+        """
+        previous = self.orders.get(order_id)
+        if previous is not None:
+            old_workload, old_status = previous
+            self.remaining_workload -= old_workload * _PROGRESS[old_status]
+            self.status_counts[old_status] -= 1
+        else:
+            old_workload, old_status = 0.0, OrderStatus.NEW
+
+        new_workload = old_workload if workload is None else workload
+        new_status = old_status if status is None else status
+        if new_status == OrderStatus.SHIPPED:
+            self.orders.pop(order_id, None)
+            return
+        self.orders[order_id] = (new_workload, new_status)
+        self.remaining_workload += new_workload * _PROGRESS[new_status]
+        self.status_counts[new_status] += 1
+
+
+class EventIngestor:
+    """Consumes the order event stream into in-memory warehouse state."""
+
+    def __init__(
+        self,
+        stream: str,
+        batch_size: int = 1000,
+        block_ms: int = 1000,
+        dedupe_window: int = 100_000,
+    ) -> None:
+        """
+        Initialize ingestor.
+
+        Args:
+            stream: Stream key
+            batch_size: Entries read per XREAD
+            block_ms: Time XREAD blocks while the stream is idle
+            dedupe_window: Recent event ids remembered for deduplication
+        """
+        self.stream = stream
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.dedupe_window = dedupe_window
+        self.warehouses: dict[str, WarehouseEventState] = {}
+        # Warehouses whose state starts from a loaded, non-empty snapshot
+        self.seeded: frozenset[str] = frozenset()
+        # Id of the last entry read (None until seek_to_end)
+        self.last_id: Optional[str] = None
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether events are being consumed."""
+        return self._task is not None
+
+    def state(self, warehouse_id: str) -> Optional[WarehouseEventState]:
+        """Event-derived state of a warehouse, if any event was applied."""
+        return self.warehouses.get(warehouse_id)
+
+    def is_seeded(self, warehouse_id: str) -> bool:
+        """Whether the warehouse's state covers orders opened before ingestion started."""
+        return warehouse_id in self.seeded
+
+    def load_snapshot(self, snapshot: OrderWorkloadSnapshot) -> None:
+        """
+        Replace the warehouse state with a bulk-loaded snapshot.
+
+        Every warehouse with a line in the snapshot counts as seeded; an
+        empty snapshot seeds none.
+
+        Args:
+            snapshot: Open order lines of all warehouses
+        """
+        warehouses: dict[str, WarehouseEventState] = {}
+        for warehouse_id, order_id, workload, status in snapshot.orders():
+            state = warehouses.get(warehouse_id)
+            if state is None:
+                state = warehouses[warehouse_id] = WarehouseEventState()
+            if status != OrderStatus.SHIPPED:
+                state.orders[order_id] = (workload, status)
+        # Aggregates in bulk rather than per order
+        for warehouse_id, remaining in snapshot.remaining_workload_by_warehouse().items():
+            warehouses[warehouse_id].remaining_workload = remaining
+        for state in warehouses.values():
+            state.status_counts = Counter(status for _, status in state.orders.values())
+        self.warehouses = warehouses
+        self.seeded = frozenset(warehouses)
+        logger.info(
+            "event_state_seeded",
+            source=snapshot.source,
+            warehouses=len(warehouses),
+            orders=sum(len(state.orders) for state in warehouses.values()),
+        )
+
+    def apply_batch(self, entries: list[tuple[str, dict[str, str]]]) -> Counter[tuple[str, str]]:
+        """
+        Apply stream entries to warehouse state.
+
+        Args:
+            entries: (entry id, fields) pairs in stream order
+
+        Returns:
+            Event counts by (type, result), result being applied, duplicate
+            or invalid
+        """
+        counts: Counter[tuple[str, str]] = Counter()
+        seen = self._seen
+        for entry_id, fields in entries:
+            event_type = fields.get("type", "unknown")
+            event_id = fields.get("event_id") or entry_id
+            if event_id in seen:
+                counts[(event_type, "duplicate")] += 1
+                continue
+            seen[event_id] = None
+            if len(seen) > self.dedupe_window:
+                seen.popitem(last=False)
+
+            try:
+                self._apply(entry_id, event_type, fields)
+            except (KeyError, ValueError) as e:
+                logger.warning("event_invalid", entry_id=entry_id, type=event_type, error=str(e))
+                counts[(event_type, "invalid")] += 1
+            else:
+                counts[(event_type, "applied")] += 1
+        return counts
+
+    def _apply(self, entry_id: str, event_type: str, fields: dict[str, str]) -> None:
+        """Apply one event."""
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown event type '{event_type}'")
+        warehouse_id = fields["warehouse_id"]
+        order_id = fields["order_id"]
+        workload = fields.get("workload")
+        status = fields.get("status")
+
+        if event_type == "order_created":
+            if workload is None:
+                raise KeyError("workload")
+            status = status or OrderStatus.NEW.value
+        elif event_type == "delivery_status" and status is None:
+            raise KeyError("status")
+
+        if workload is not None:
+            workload = float(workload)
+            if not math.isfinite(workload) or workload < 0:
+                raise ValueError(f"Invalid workload {workload!r}")
+
+        state = self.warehouses.get(warehouse_id)
+        if state is None:
+            state = self.warehouses[warehouse_id] = WarehouseEventState()
+        state.upsert(
+            order_id,
+            workload,
+            OrderStatus(status) if status is not None else None,
+        )
+        state.last_event_ms = int(entry_id.split("-", 1)[0])
+
+    async def seek_to_end(self) -> None:
+        """Continue after the newest entry currently in the stream."""
+        newest = await get_cache().redis.xrevrange(self.stream, count=1)
+        self.last_id = newest[0][0] if newest else "0-0"
+
+    async def start(self) -> None:
+        """Start consuming (from the end of the stream unless already positioned)."""
+        if self._task is not None:
+            return
+        if self.last_id is None:
+            await self.seek_to_end()
+        self._task = asyncio.create_task(self._run())
+        logger.info("event_ingestion_started", stream=self.stream, last_id=self.last_id)
+
+    async def stop(self) -> None:
+        """Stop consuming."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        """Consume new entries until cancelled."""
+        redis = get_cache().redis
+        while True:
+            try:
+                await self.consume_once(redis)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("event_ingestion_failed", error=str(e))
+                await asyncio.sleep(1.0)
+
+    async def consume_once(self, redis: Any) -> int:
+        """
+        Read and apply one batch of entries after last_id.
+
+        Args:
+            redis: Redis client
+
+        Returns:
+            Number of entries handled
+        """
+        response = await redis.xread(
+            {self.stream: self.last_id or "0-0"}, count=self.batch_size, block=self.block_ms
+        )
+        entries = response[0][1] if response else []
+        if not entries:
+            return 0
+
+        counts = self.apply_batch(entries)
+        self.last_id = entries[-1][0]
+
+        event_batch_size.observe(len(entries))
+        for (event_type, result), count in counts.items():
+            events_ingested_total.labels(type=event_type, result=result).inc(count)
+        newest_ms = int(entries[-1][0].split("-", 1)[0])
+        event_stream_lag.set(max(time.time() - newest_ms / 1000, 0.0))
+        return len(entries)
+
+
+# Global ingestor instance
+_event_ingestor: Optional[EventIngestor] = None
+
+
+def get_event_ingestor() -> EventIngestor:
+    """Get global event ingestor instance."""
+    global _event_ingestor
+    if _event_ingestor is None:
+        settings = get_settings()
+        _event_ingestor = EventIngestor(
+            stream=settings.event_stream_key,
+            batch_size=settings.event_batch_size,
+            block_ms=settings.event_block_ms,
+            dedupe_window=settings.event_dedupe_window,
+        )
+    return _event_ingestor
@@ -0,0 +1,191 @@
+"""
+Background health prober for service dependencies.
+
+Redis is pinged and HANA runs a trivial query on a fixed interval, each
+bounded by a timeout. The latest result per component is kept in memory, so
+GET /health answers in constant time without touching a dependency, however
+often it is polled.
+
+Component status:
+
+    unknown   not probed yet
+    ok        last probe succeeded within the slow threshold
+    degraded  last probe was slow, or failed with a success less than
+              DOWN_AFTER_INTERVALS intervals ago
+    down      no successful probe for DOWN_AFTER_INTERVALS intervals
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+
+from app.config import get_settings
+from app.core.cache import get_cache
+from app.core.logging import get_logger
+from app.core.metrics import (
+    health_probe_duration_seconds,
+    health_probe_last_success_timestamp,
+    health_probe_up,
+)
+from app.repositories.hana_repository import get_hana_repository
+
+logger = get_logger(__name__)
+
+# Failed intervals after the last success before a component is reported down
+DOWN_AFTER_INTERVALS = 3
+
+
+@dataclass(slots=True)
+class ComponentProbe:
+    """Latest probe result of one component."""
+
+    status: str = "unknown"
+    latency_ms: Optional[float] = None
+    last_success: Optional[datetime] = None
+    last_error: Optional[str] = None
+    # Monotonic time of the last success (for the down threshold)
+    last_success_monotonic: Optional[float] = None
+
+
+class HealthProber:
+    """Probes dependencies in the background and caches their health."""
+
+    def __init__(
+        self,
+        probes: dict[str, Callable[[], Awaitable[Any]]],
+        interval_seconds: float = 5.0,
+        timeout_seconds: float = 1.0,
+        slow_ms: float = 250.0,
+    ) -> None:
+        """
+        Initialize prober.
+
+        Args:
+            probes: Coroutine function per component; raising means unhealthy
+            interval_seconds: Time between probe rounds
+            timeout_seconds: Time before a probe is counted as failed
+            slow_ms: Probe latency above which a component is degraded
+        """
+        self.probes = probes
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.slow_ms = slow_ms
+        self.results: dict[str, ComponentProbe] = {name: ComponentProbe() for name in probes}
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start probing in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop probing."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        """Probe all components, then wait for the next round."""
+        while True:
+            await self.probe_all()
+            await asyncio.sleep(self.interval_seconds)
+
+    async def probe_all(self) -> None:
+        """Probe all components concurrently and update their results."""
+        await asyncio.gather(*(self.probe(name) for name in self.probes))
+
+    async def probe(self, name: str) -> ComponentProbe:
+        """
+        Probe one component and record its result.
+
+        Args:
+            name: Component name
+
+        Returns:
+            Updated probe result
+        """
+        previous = self.results[name]
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.probes[name](), self.timeout_seconds)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            elapsed = time.perf_counter() - started
+            since_success = (
+                None
+                if previous.last_success_monotonic is None
+                else time.monotonic() - previous.last_success_monotonic
+            )
+            recent = (
+                since_success is not None
+                and since_success < DOWN_AFTER_INTERVALS * self.interval_seconds
+            )
+            result = ComponentProbe(
+                status="degraded" if recent else "down",
+                latency_ms=None,
+                last_success=previous.last_success,
+                last_error=error,
+                last_success_monotonic=previous.last_success_monotonic,
+            )
+            if previous.status != result.status:
+                logger.warning(
+                    "health_probe_failed", component=name, status=result.status, error=error
+                )
+            health_probe_up.labels(component=name).set(0)
+        else:
+            elapsed = time.perf_counter() - started
+            latency_ms = elapsed * 1000
+            result = ComponentProbe(
+                status="ok" if latency_ms <= self.slow_ms else "degraded",
+                latency_ms=round(latency_ms, 3),
+                last_success=datetime.now(),
+                last_error=None,
+                last_success_monotonic=time.monotonic(),
+            )
+            if previous.status != result.status:
+                logger.info("health_probe_status_changed", component=name, status=result.status)
+            health_probe_up.labels(component=name).set(1)
+            health_probe_last_success_timestamp.labels(component=name).set(time.time())
+
+        health_probe_duration_seconds.labels(component=name).observe(elapsed)
+        self.results[name] = result
+        return result
+
+    def checks(self) -> dict[str, str]:
+        """Latest status per component."""
+        return {name: result.status for name, result in self.results.items()}
+
+
+async def _ping_redis() -> None:
+    """Ping Redis through the shared cache client."""
+    await get_cache().ping()
+
+
+async def _ping_hana() -> None:
+    """Run a trivial HANA query."""
+    await get_hana_repository().ping()
+
+
+# Global prober instance
+_health_prober: Optional[HealthProber] = None
+
+
+def get_health_prober() -> HealthProber:
+    """Get global health prober instance."""
+    global _health_prober
+    if _health_prober is None:
+        settings = get_settings()
+        _health_prober = HealthProber(
+            probes={"hana": _ping_hana, "redis": _ping_redis},
+            interval_seconds=settings.health_probe_interval_seconds,
+            timeout_seconds=settings.health_probe_timeout_seconds,
+            slow_ms=settings.health_probe_slow_ms,
+        )
+    return _health_prober
@@ -0,0 +1,280 @@
+"""
+Historical replay / backtest harness for the decision engine.
+
+Streams a recorded day of warehouse snapshots, order events and shipments
+through the decision path under a virtual clock and scores the decisions
+against what actually shipped (accuracy metrics from docs/03-algorithm.md):
+
+    False Positive Rate = "Ship today" decisions that did not ship today
+    False Negative Rate = "Ship tomorrow" decisions that shipped today anyway
+
+Event format (one JSON object per line, or one row per event in Parquet):
+
+    {"type": "snapshot", "ts": "...", "warehouse_id": "WH-MAIN",
+     "current_workload": 280.5, "capacity": 3.6, "bottleneck_resource": "PACKER"}
+    {"type": "order", "ts": "...", "order_id": "SO-1", "warehouse_id": "WH-MAIN",
+     "priority": "STANDARD", "workload": 12.5}
+    {"type": "shipment", "ts": "...", "order_id": "SO-1"}
+
+Orders may carry "items" ([{"product_id", "quantity", ...}]) instead of a
+precomputed "workload". Events must be ordered by "ts".
+"""
+
+import json
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from pydantic import BaseModel, Field
+
+from app.core.logging import get_logger
+from app.models.domain import OrderItem, Priority
+from app.services.capacity_service import CapacityService
+from app.services.decision_engine import DecisionEngine
+from app.services.threshold_table import ThresholdTable
+from app.services.workload_calculator import WorkloadCalculator
+
+logger = get_logger(__name__)
+
+_PRIORITIES = {priority.value: priority for priority in Priority}
+
+
+class VirtualClock:
+    """Manually advanced clock used in place of datetime.now() during replay."""
+
+    def __init__(self, start: Optional[datetime] = None) -> None:
+        """
+        Initialize virtual clock.
+
+        Args:
+            start: Initial time (defaults to epoch start)
+        """
+        self._now = start or datetime(1970, 1, 1)
+
+    def now(self) -> datetime:
+        """Return the current virtual time."""
+        return self._now
+
+    def advance_to(self, moment: datetime) -> None:
+        """
+        Move the clock forward.
+
+        Args:
+            moment: New current time (ignored if it lies in the past)
+        """
+        if moment > self._now:
+            self._now = moment
+
+
+class ReplayReport(BaseModel):
+    """Outcome of a replay run, scored against actual shipments."""
+
+    decisions: int = Field(default=0, ge=0, description="Decisions made")
+    approved: int = Field(default=0, ge=0, description="'Ship today' decisions")
+    rejected: int = Field(default=0, ge=0, description="'Ship tomorrow' decisions")
+    true_positives: int = Field(default=0, ge=0, description="Approved and shipped today")
+    false_positives: int = Field(default=0, ge=0, description="Approved but not shipped today")
+    true_negatives: int = Field(default=0, ge=0, description="Rejected and not shipped today")
+    false_negatives: int = Field(default=0, ge=0, description="Rejected but shipped today")
+    skipped_orders: int = Field(default=0, ge=0, description="Orders without a prior snapshot")
+    elapsed_seconds: float = Field(default=0.0, ge=0, description="Wall-clock replay time")
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Share of 'ship today' promises that did not ship today."""
+        return self.false_positives / self.approved if self.approved else 0.0
+
+    @property
+    def false_negative_rate(self) -> float:
+        """Share of 'ship tomorrow' decisions that shipped today anyway."""
+        return self.false_negatives / self.rejected if self.rejected else 0.0
+
+    @property
+    def accuracy(self) -> float:
+        """Share of decisions matching the actual outcome."""
+        correct = self.true_positives + self.true_negatives
+        return correct / self.decisions if self.decisions else 0.0
+
+    @property
+    def decisions_per_second(self) -> float:
+        """Replay throughput."""
+        return self.decisions / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+class ReplayEngine:
+    """
+    Replays recorded events through the decision path under a virtual clock.
+
+    Each snapshot is solved into a ThresholdTable once and used for every
+    order that follows it, as the capacity check endpoint does.
+    """
+
+    def __init__(
+        self,
+        workload_calculator: Optional[WorkloadCalculator] = None,
+        capacity_service: Optional[CapacityService] = None,
+    ) -> None:
+        """
+        Initialize replay engine.
+
+        Args:
+            workload_calculator: Workload calculation service
+            capacity_service: Capacity calculation service
+        """
+        self.clock = VirtualClock()
+        self.workload_calculator = workload_calculator or WorkloadCalculator()
+        self.decision_engine = DecisionEngine(
+            workload_calculator=self.workload_calculator,
+            capacity_service=capacity_service or CapacityService(),
+            clock=self.clock.now,
+        )
+
+    def run(self, events: Iterable[dict[str, Any]]) -> ReplayReport:
+        """
+        Replay a stream of events.
+
+        Args:
+            events: Time-ordered snapshot, order and shipment events
+
+        Returns:
+            ReplayReport with confusion counts and throughput
+        """
+        tables: dict[str, ThresholdTable] = {}
+        # order_id -> (decision, order date)
+        decisions: dict[str, tuple[bool, date]] = {}
+        shipped_on: dict[str, date] = {}
+        report = ReplayReport()
+
+        started = time.perf_counter()
+        for event in events:
+            event_type = event["type"]
+            moment = _parse_ts(event["ts"])
+            self.clock.advance_to(moment)
+
+            if event_type == "snapshot":
+                tables[event["warehouse_id"]] = ThresholdTable(
+                    self.decision_engine,
+                    warehouse_id=event["warehouse_id"],
+                    current_workload=Decimal(str(event["current_workload"])),
+                    capacity=Decimal(str(event["capacity"])),
+                    bottleneck_resource=event.get("bottleneck_resource") or "PACKER",
+                    snapshot_version=event["ts"] if isinstance(event["ts"], str) else None,
+                )
+            elif event_type == "order":
+                table = tables.get(event["warehouse_id"])
+                if table is None:
+                    report.skipped_orders += 1
+                    continue
+                decision = table.decide(
+                    self._order_workload(event),
+                    _PRIORITIES[event.get("priority") or Priority.STANDARD.value],
+                )
+                decisions[event["order_id"]] = (decision.can_ship_today, moment.date())
+            elif event_type == "shipment":
+                shipped_on[event["order_id"]] = moment.date()
+        report.elapsed_seconds = time.perf_counter() - started
+
+        for order_id, (can_ship_today, order_date) in decisions.items():
+            shipped_today = shipped_on.get(order_id) == order_date
+            report.decisions += 1
+            if can_ship_today:
+                report.approved += 1
+                if shipped_today:
+                    report.true_positives += 1
+                else:
+                    report.false_positives += 1
+            else:
+                report.rejected += 1
+                if shipped_today:
+                    report.false_negatives += 1
+                else:
+                    report.true_negatives += 1
+
+        logger.info(
+            "replay_completed",
+            decisions=report.decisions,
+            false_positive_rate=report.false_positive_rate,
+            false_negative_rate=report.false_negative_rate,
+            decisions_per_second=round(report.decisions_per_second),
+        )
+
+        return report
+
+    def _order_workload(self, event: dict[str, Any]) -> float:
+        """Return the recorded workload, or compute it from line items."""
+        if event.get("workload") is not None:
+            return float(event["workload"])
+        items = [OrderItem(**item) for item in event["items"]]
+        return float(self.workload_calculator.calculate_order_workload(items).total_workload)
+
+
+def _parse_ts(value: Any) -> datetime:
+    """Parse an ISO timestamp (Parquet readers already yield datetimes)."""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def load_events(path: str | Path) -> Iterator[dict[str, Any]]:
+    """
+    Stream events from a JSONL or Parquet file.
+
+    Args:
+        path: File path; ".parquet" files require pyarrow
+
+    Returns:
+        Iterator of event dictionaries
+    """
+    path = Path(path)
+    if path.suffix == ".parquet":
+        return _load_parquet(path)
+    return _load_jsonl(path)
+
+
+def _load_jsonl(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream events from a JSON-lines file."""
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _load_parquet(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream events from a Parquet file batch by batch."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Replaying Parquet files requires pyarrow") from e
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches():
+        yield from batch.to_pylist()
+
+
+if __name__ == "__main__":
+    import logging
+    import sys
+
+    import structlog
+
+    # Per-decision logging would dominate replay time
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING),
+        cache_logger_on_first_use=True,
+    )
+
+    replay_report = ReplayEngine().run(load_events(sys.argv[1]))
+    print(
+        json.dumps(
+            {
+                **replay_report.model_dump(),
+                "false_positive_rate": replay_report.false_positive_rate,
+                "false_negative_rate": replay_report.false_negative_rate,
+                "accuracy": replay_report.accuracy,
+                "decisions_per_second": replay_report.decisions_per_second,
+            },
+            indent=2,
+        )
+    )
@@ -0,0 +1,420 @@
+"""
+Warehouse snapshot shared by all worker processes through a memory-mapped file.
+
+Without it every worker queries HANA for every warehouse and holds its own
+copy of the result. Instead, one worker (the publisher, elected by an
+exclusive flock on "<path>.lock") loads all warehouses from HANA on an
+interval and writes them into a fixed-layout file; the other workers map the
+same file and build their threshold tables from it. If the publisher dies,
+the kernel releases its lock and another worker takes over at its next
+attempt. Placing the file on tmpfs (/dev/shm) keeps it in shared memory.
+
+Layout (little-endian):
+
+    header   magic, layout version, warehouse count, sequence, epoch,
+             published_at (wall clock)
+    slots    one fixed-size record per warehouse: id, current workload,
+             usable capacity, utilization, loaded_at (CLOCK_MONOTONIC, shared
+             by all processes of a host), snapshot version, bottleneck resource
+
+Readers build their threshold tables from workload and capacity, so the
+thresholds always follow the reader's own settings and ingested events.
+
+Readers and the single writer synchronize with a seqlock: the writer makes
+the sequence odd, updates the slots and makes it even again. A reader
+decodes the slots straight from the mapping and retries if the sequence was
+odd or changed meanwhile. While the sequence is unchanged, readers reuse
+their last decoded result and read nothing but the sequence.
+"""
+
+import asyncio
+import fcntl
+import mmap
+import os
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from app.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import (
+    shared_snapshot_publish_duration_seconds,
+    shared_snapshot_publisher,
+    shared_snapshot_read_retries_total,
+)
+from app.models.domain import ResourceType
+from app.repositories.hana_repository import get_hana_repository
+from app.services.capacity_service import get_capacity_service
+
+logger = get_logger(__name__)
+
+MAGIC = b"CUTSNAP\x00"
+LAYOUT_VERSION = 2
+
+# magic, layout version, count, sequence, epoch, published_at
+_HEADER = struct.Struct("<8sIIQQd")
+_SEQUENCE = struct.Struct("<Q")
+_SEQUENCE_OFFSET = 16
+# id, workload, capacity, utilization, loaded_at, version, bottleneck
+_SLOT = struct.Struct("<16sdddd32sB7x")
+
+_RESOURCES = list(ResourceType)
+
+# Attempts before a reader gives up on a snapshot that keeps changing
+MAX_READ_ATTEMPTS = 100
+
+
+@dataclass(frozen=True, slots=True)
+class WarehouseSnapshot:
+    """State of one warehouse as published to the shared snapshot."""
+
+    warehouse_id: str
+    current_workload: float
+    capacity: float
+    current_utilization: float
+    bottleneck_resource: ResourceType
+    snapshot_version: str
+    loaded_at: float  # time.monotonic() when loaded from HANA
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the warehouse was loaded from HANA."""
+        return time.monotonic() - self.loaded_at
+
+
+class SharedSnapshot:
+    """Fixed-layout warehouse snapshot in a file mapped by every worker."""
+
+    def __init__(self, path: str | Path, max_warehouses: int = 256) -> None:
+        """
+        Map (and create if needed) the snapshot file.
+
+        Args:
+            path: Snapshot file, ideally on tmpfs
+            max_warehouses: Slots in the file
+        """
+        self.path = Path(path)
+        self.max_warehouses = max_warehouses
+        self.size = _HEADER.size + max_warehouses * _SLOT.size
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size < self.size:
+                os.ftruncate(fd, self.size)
+            self._mmap = mmap.mmap(fd, self.size)
+        finally:
+            os.close(fd)
+        self._cached_sequence: Optional[int] = None
+        self._cached: dict[str, WarehouseSnapshot] = {}
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._mmap.close()
+
+    @property
+    def sequence(self) -> int:
+        """Current seqlock sequence (odd while a write is in progress)."""
+        return _SEQUENCE.unpack_from(self._mmap, _SEQUENCE_OFFSET)[0]
+
+    @property
+    def epoch(self) -> int:
+        """Number of snapshots published to the file."""
+        return _HEADER.unpack_from(self._mmap, 0)[4]
+
+    def write(self, entries: list[WarehouseSnapshot]) -> int:
+        """
+        Publish warehouse states (single writer only).
+
+        Args:
+            entries: All warehouses; replaces the previous snapshot
+
+        Returns:
+            Epoch of the published snapshot
+
+        Raises:
+            ValueError: If there are more warehouses than slots, or an id or
+                version does not fit its field
+        """
+        if len(entries) > self.max_warehouses:
+            raise ValueError(
+                f"{len(entries)} warehouses exceed the snapshot's {self.max_warehouses} slots"
+            )
+        for entry in entries:
+            if len(entry.warehouse_id.encode()) > 16 or len(entry.snapshot_version.encode()) > 32:
+                raise ValueError(f"Warehouse {entry.warehouse_id!r} does not fit a snapshot slot")
+        mm = self._mmap
+        magic, layout_version, _, sequence, epoch, _ = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or layout_version != LAYOUT_VERSION:
+            sequence, epoch = 0, 0
+        # A sequence left odd by a writer that died mid-write is completed first
+        sequence += 2 if sequence % 2 == 0 else 1
+
+        _SEQUENCE.pack_into(mm, _SEQUENCE_OFFSET, sequence - 1)
+        for index, entry in enumerate(entries):
+            _SLOT.pack_into(
+                mm,
+                _HEADER.size + index * _SLOT.size,
+                entry.warehouse_id.encode(),
+                entry.current_workload,
+                entry.capacity,
+                entry.current_utilization,
+                entry.loaded_at,
+                entry.snapshot_version.encode(),
+                _RESOURCES.index(entry.bottleneck_resource),
+            )
+        _HEADER.pack_into(
+            mm, 0, MAGIC, LAYOUT_VERSION, len(entries), sequence - 1, epoch + 1, time.time()
+        )
+        _SEQUENCE.pack_into(mm, _SEQUENCE_OFFSET, sequence)
+        return epoch + 1
+
+    def read(self) -> dict[str, WarehouseSnapshot]:
+        """
+        Consistent view of all published warehouses.
+
+        Returns:
+            Warehouse states by id (the last consistent view if the snapshot
+            kept changing for MAX_READ_ATTEMPTS attempts)
+        """
+        mm = self._mmap
+        for _ in range(MAX_READ_ATTEMPTS):
+            before = _SEQUENCE.unpack_from(mm, _SEQUENCE_OFFSET)[0]
+            if before == self._cached_sequence:
+                return self._cached
+            if before % 2:
+                shared_snapshot_read_retries_total.inc()
+                time.sleep(0)
+                continue
+
+            magic, layout_version, count, _, _, _ = _HEADER.unpack_from(mm, 0)
+            entries = {}
+            if magic == MAGIC and layout_version == LAYOUT_VERSION:
+                for index in range(min(count, self.max_warehouses)):
+                    entry = _decode(mm, _HEADER.size + index * _SLOT.size)
+                    entries[entry.warehouse_id] = entry
+
+            if _SEQUENCE.unpack_from(mm, _SEQUENCE_OFFSET)[0] == before:
+                self._cached_sequence = before
+                self._cached = entries
+                return entries
+            shared_snapshot_read_retries_total.inc()
+        return self._cached
+
+    def get(
+        self, warehouse_id: str, max_age_seconds: Optional[float] = None
+    ) -> Optional[WarehouseSnapshot]:
+        """
+        Published state of one warehouse.
+
+        Args:
+            warehouse_id: Warehouse identifier
+            max_age_seconds: Treat older states as missing
+
+        Returns:
+            WarehouseSnapshot, or None if not published or too old
+        """
+        entry = self.read().get(warehouse_id)
+        if entry is None or (max_age_seconds is not None and entry.age_seconds > max_age_seconds):
+            return None
+        return entry
+
+
+def _decode(buffer: mmap.mmap, offset: int) -> WarehouseSnapshot:
+    """Decode one slot."""
+    (
+        warehouse_id,
+        current_workload,
+        capacity,
+        current_utilization,
+        loaded_at,
+        snapshot_version,
+        bottleneck,
+    ) = _SLOT.unpack_from(buffer, offset)
+    return WarehouseSnapshot(
+        warehouse_id=warehouse_id.rstrip(b"\x00").decode(),
+        current_workload=current_workload,
+        capacity=capacity,
+        current_utilization=current_utilization,
+        bottleneck_resource=_RESOURCES[bottleneck],
+        snapshot_version=snapshot_version.rstrip(b"\x00").decode(),
+        loaded_at=loaded_at,
+    )
+
+
+class SnapshotPublisher:
+    """Elects one publishing worker and refreshes the shared snapshot from HANA."""
+
+    def __init__(
+        self,
+        snapshot: SharedSnapshot,
+        loader: Callable[[], Awaitable[list[WarehouseSnapshot]]],
+        interval_seconds: float = 2.0,
+    ) -> None:
+        """
+        Initialize publisher.
+
+        Args:
+            snapshot: Shared snapshot to write
+            loader: Loads the current state of all warehouses
+            interval_seconds: Time between publishes (and leadership attempts)
+        """
+        self.snapshot = snapshot
+        self.loader = loader
+        self.interval_seconds = interval_seconds
+        self.lock_path = snapshot.path.with_name(snapshot.path.name + ".lock")
+        self._lock_fd: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this process holds the publisher lock."""
+        return self._lock_fd is not None
+
+    def try_acquire(self) -> bool:
+        """
+        Try to become the publisher without blocking.
+
+        Returns:
+            True if this process is the publisher
+        """
+        if self._lock_fd is not None:
+            return True
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        shared_snapshot_publisher.set(1)
+        logger.info("snapshot_publisher_elected", path=str(self.snapshot.path), pid=os.getpid())
+        return True
+
+    def release(self) -> None:
+        """Give up the publisher role."""
+        if self._lock_fd is None:
+            return
+        fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+        os.close(self._lock_fd)
+        self._lock_fd = None
+        shared_snapshot_publisher.set(0)
+
+    async def start(self) -> None:
+        """Start publishing (or waiting for the publisher role) in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop publishing and release the publisher role."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.release()
+
+    async def _run(self) -> None:
+        """Publish while leader; otherwise retry the lock every interval."""
+        while True:
+            if self.try_acquire():
+                try:
+                    await self.publish_once()
+                except Exception as e:
+                    logger.error("snapshot_publish_failed", error=str(e) or type(e).__name__)
+            await asyncio.sleep(self.interval_seconds)
+
+    async def publish_once(self) -> int:
+        """
+        Load all warehouses and publish them.
+
+        Returns:
+            Epoch of the published snapshot
+        """
+        started = time.perf_counter()
+        entries = await self.loader()
+        epoch = self.snapshot.write(entries)
+        shared_snapshot_publish_duration_seconds.observe(time.perf_counter() - started)
+        logger.debug("snapshot_published", epoch=epoch, warehouses=len(entries))
+        return epoch
+
+
+async def load_warehouse_snapshots() -> list[WarehouseSnapshot]:
+    """
+    Load the state of every warehouse from HANA.
+
+    Returns:
+        One WarehouseSnapshot per warehouse that could be loaded
+    """
+    hana_repo = get_hana_repository()
+    warehouse_ids = await hana_repo.list_warehouses()
+    cutoff_rows = await hana_repo.get_cutoff_calculations(warehouse_ids)
+    capacities = await asyncio.gather(
+        *(hana_repo.get_current_warehouse_capacity(warehouse) for warehouse in warehouse_ids),
+        return_exceptions=True,
+    )
+
+    entries = []
+    for warehouse_id, capacity_data in zip(warehouse_ids, capacities):
+        cutoff_data = cutoff_rows.get(warehouse_id)
+        if isinstance(capacity_data, BaseException) or cutoff_data is None:
+            logger.warning("snapshot_warehouse_skipped", warehouse_id=warehouse_id)
+            continue
+        warehouse_capacity = get_capacity_service().calculate_warehouse_capacity(
+            pickers=capacity_data["available_pickers"],
+            packers=capacity_data["available_packers"],
+            loaders=capacity_data["available_loaders"],
+        )
+        entries.append(
+            WarehouseSnapshot(
+                warehouse_id=warehouse_id,
+                current_workload=float(cutoff_data["total_remaining_workload"]),
+                capacity=float(warehouse_capacity.usable_capacity),
+                current_utilization=float(cutoff_data["current_utilization"]),
+                bottleneck_resource=warehouse_capacity.bottleneck_resource,
+                snapshot_version=f"{cutoff_data['calc_date']}T{cutoff_data['calc_time']}",
+                loaded_at=time.monotonic(),
+            )
+        )
+    return entries
+
+
+# Global instances
+_shared_snapshot: Optional[SharedSnapshot] = None
+_snapshot_publisher: Optional[SnapshotPublisher] = None
+
+
+def get_shared_snapshot() -> Optional[SharedSnapshot]:
+    """
+    Get global shared snapshot instance.
+
+    Returns:
+        SharedSnapshot, or None if the shared snapshot is disabled
+    """
+    global _shared_snapshot
+    settings = get_settings()
+    if _shared_snapshot is None and settings.shared_snapshot_enabled:
+        _shared_snapshot = SharedSnapshot(
+            settings.shared_snapshot_path, max_warehouses=settings.shared_snapshot_max_warehouses
+        )
+    return _shared_snapshot
+
+
+def get_snapshot_publisher() -> Optional[SnapshotPublisher]:
+    """
+    Get global snapshot publisher instance.
+
+    Returns:
+        SnapshotPublisher, or None if the shared snapshot is disabled
+    """
+    global _snapshot_publisher
+    snapshot = get_shared_snapshot()
+    if _snapshot_publisher is None and snapshot is not None:
+        _snapshot_publisher = SnapshotPublisher(
+            snapshot,
+            load_warehouse_snapshots,
+            interval_seconds=get_settings().shared_snapshot_interval_seconds,
+        )
+    return _snapshot_publisher
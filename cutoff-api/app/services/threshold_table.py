@@ -0,0 +1,723 @@
+"""
+Precomputed admission thresholds per warehouse snapshot.
+
+For a fixed snapshot (current workload C, usable capacity K) the decision rule
+of DecisionEngine.make_decision reduces to
+
+    accept  <=>  new_workload < W_util(priority)  and  new_workload <= W_time(now)
+
+    W_util = U_max * K - C              (U_max + 0.10 for VIP reserve)
+    W_time = u* * K - C,  where u* solves  u + α·u³ = T - S
+
+T is the time left until the shift deadline and S the safety buffer. The
+processing time of the projected workload is (W / K)·(1 + α·(W / K)²) = u + α·u³,
+which is strictly increasing in u, so the cubic has exactly one real root
+(Cardano's formula). W_util is solved once per snapshot; W_time only depends
+on the clock and costs one square root and two cube roots per check.
+
+A check is then a workload sum plus two comparisons. Decision factors are
+only materialized when the caller asks for them. This replaces the decision
+cache keyed on workload buckets: the accept region per priority is exactly
+[0, min(W_util, W_time)), so every order that shares a decision with another
+is already answered without a cache lookup or bucket widths to prove.
+
+The registry also keeps each warehouse's last successfully loaded table. When
+HANA is unavailable, a stale copy of it keeps decisions flowing with lowered
+confidence and the snapshot age reported in the decision factors.
+
+Tables are versioned by the warehouse's state epoch (see
+CacheRepository.invalidate_warehouse_cache). The registry polls the epochs
+of its warehouses in the background and drops tables, and shared snapshot
+entries loaded before the change, as soon as an epoch moves on, so one
+invalidation reaches every worker within cache_epoch_refresh_seconds.
+
+load_threshold_table builds a warehouse's table from the shared snapshot or
+from HANA; the capacity check and startup warm-up both use it. While event
+ingestion runs, the table's current workload is the remaining workload
+ingested from the order event stream, which is fresher than the snapshot.
+"""
+
+import asyncio
+import copy
+import math
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from app.config import get_settings
+from app.core.logging import get_logger
+from app.core.timing import stage
+from app.models.domain import DecisionStatus, Priority, ResourceType
+from app.models.internal import Decision, DecisionFactors
+from app.repositories.cache_repository import get_cache_repository
+from app.repositories.hana_repository import get_hana_repository
+from app.services.capacity_service import get_capacity_service
+from app.services.decision_engine import DecisionEngine, get_decision_engine
+from app.services.event_ingestion import get_event_ingestor
+from app.services.shared_snapshot import WarehouseSnapshot, get_shared_snapshot
+from app.services.utilization_history import get_utilization_history
+
+logger = get_logger(__name__)
+
+# Utilization headroom granted to VIP orders on top of max_utilization
+VIP_UTILIZATION_RESERVE = 0.10
+
+
+class SnapshotUnavailable(Exception):
+    """Raised when neither HANA nor a recent enough snapshot can supply a table."""
+
+
+def solve_processing_utilization(budget_minutes: float, alpha: float) -> float:
+    """
+    Largest utilization whose processing time fits the budget.
+
+    Solves u + α·u³ = budget for its single real root.
+
+    Args:
+        budget_minutes: Minutes available for processing (T - S)
+        alpha: Congestion coefficient
+
+    Returns:
+        Utilization u* (negative budgets yield a negative root)
+    """
+    if alpha <= 0:
+        return budget_minutes
+    # Depressed cubic u³ + p·u + q = 0 with p = 1/α > 0, q = -budget/α
+    p = 1.0 / alpha
+    half_q = -budget_minutes / (2.0 * alpha)
+    root = math.sqrt(half_q * half_q + (p / 3.0) ** 3)
+    return math.cbrt(-half_q + root) + math.cbrt(-half_q - root)
+
+
+class TableDecision:
+    """Outcome of a threshold-table check; factors are built on demand."""
+
+    __slots__ = (
+        "table",
+        "workload",
+        "can_ship_today",
+        "utilization_ok",
+        "vip_override_used",
+        "utilization",
+        "time_buffer_minutes",
+        "estimated_completion",
+        "calculated_at",
+        "_status",
+        "_confidence",
+    )
+
+    def __init__(
+        self,
+        table: "ThresholdTable",
+        workload: float,
+        can_ship_today: bool,
+        utilization_ok: bool,
+        vip_override_used: bool,
+        utilization: float,
+        time_buffer_minutes: int,
+        estimated_completion: datetime,
+        calculated_at: datetime,
+    ) -> None:
+        """Initialize decision (see ThresholdTable.decide)."""
+        self.table = table
+        self.workload = workload
+        self.can_ship_today = can_ship_today
+        self.utilization_ok = utilization_ok
+        self.vip_override_used = vip_override_used
+        self.utilization = utilization
+        self.time_buffer_minutes = time_buffer_minutes
+        self.estimated_completion = estimated_completion
+        self.calculated_at = calculated_at
+        self._status: Optional[DecisionStatus] = None
+        self._confidence: Optional[Decimal] = None
+
+    @property
+    def current_utilization(self) -> Decimal:
+        """Projected utilization including this order."""
+        return Decimal(repr(self.utilization))
+
+    @property
+    def status(self) -> DecisionStatus:
+        """Warehouse status at the projected utilization."""
+        if self._status is None:
+            self._status = self.table.engine.determine_status(self.current_utilization)
+        return self._status
+
+    @property
+    def confidence(self) -> Decimal:
+        """Decision confidence (0-1)."""
+        if self._confidence is None:
+            confidence = self.table.engine.calculate_confidence(
+                self.current_utilization, self.time_buffer_minutes, self.vip_override_used
+            )
+            if self.table.stale:
+                confidence *= Decimal(
+                    str(self.table.engine.settings.stale_snapshot_confidence_factor)
+                )
+            self._confidence = confidence
+        return self._confidence
+
+    @property
+    def message(self) -> str:
+        """Human-readable decision message."""
+        if self.can_ship_today:
+            return "Wysyłka dziś możliwa ✓"
+        if not self.utilization_ok:
+            return "Wysyłka jutro - przekroczono capacity ✗"
+        return "Wysyłka jutro - niewystarczający czas ✗"
+
+    def factors(self) -> DecisionFactors:
+        """Build the full decision factors."""
+        table = self.table
+        return DecisionFactors(
+            workload_impact=Decimal(repr(self.workload)),
+            remaining_capacity=table.capacity
+            - table.current_workload
+            - Decimal(repr(self.workload)),
+            time_buffer_minutes=self.time_buffer_minutes,
+            bottleneck_resource=ResourceType(table.bottleneck_resource),
+            congestion_factor=table.engine.workload_calculator.calculate_congestion_factor(
+                self.current_utilization
+            ),
+            vip_override_used=self.vip_override_used,
+            snapshot_stale=table.stale,
+            snapshot_age_seconds=round(table.snapshot_age_seconds, 1) if table.stale else None,
+        )
+
+    def to_decision(self) -> Decision:
+        """Materialize a full Decision (e.g. for the audit log)."""
+        return Decision(
+            can_ship_today=self.can_ship_today,
+            status=self.status,
+            confidence=self.confidence,
+            current_utilization=self.current_utilization,
+            estimated_completion=self.estimated_completion,
+            message=self.message,
+            factors=self.factors(),
+            calculated_at=self.calculated_at,
+        )
+
+
+class ThresholdTable:
+    """Admission thresholds of one warehouse snapshot."""
+
+    def __init__(
+        self,
+        engine: DecisionEngine,
+        warehouse_id: str,
+        current_workload: Decimal,
+        capacity: Decimal,
+        bottleneck_resource: str,
+        snapshot_version: Optional[str] = None,
+    ) -> None:
+        """
+        Solve the snapshot's utilization thresholds.
+
+        Args:
+            engine: Decision engine supplying settings, clock and status rules
+            warehouse_id: Warehouse identifier
+            current_workload: Current warehouse workload (minutes)
+            capacity: Usable capacity
+            bottleneck_resource: Current bottleneck resource type
+            snapshot_version: Version of the warehouse snapshot used
+        """
+        self.engine = engine
+        self.warehouse_id = warehouse_id
+        self.current_workload = current_workload
+        self.capacity = capacity
+        self.bottleneck_resource = bottleneck_resource
+        self.snapshot_version = snapshot_version
+        self.built_at = time.monotonic()
+        self.stale = False
+        # Warehouse state epoch the snapshot was loaded under
+        self.epoch = 0
+
+        settings = engine.settings
+        self._alpha = settings.congestion_alpha
+        self._safety_buffer = settings.safety_buffer_minutes
+        self._workload = float(current_workload)
+        self._capacity = float(capacity)
+
+        # Strict upper bounds on the new workload from the utilization limit
+        max_utilization = settings.max_utilization
+        self._utilization_limits = {
+            Priority.STANDARD: self._workload_at(max_utilization),
+            Priority.VIP: self._workload_at(max_utilization + VIP_UTILIZATION_RESERVE),
+        }
+
+    @property
+    def snapshot_age_seconds(self) -> float:
+        """Seconds since the snapshot was loaded."""
+        return time.monotonic() - self.built_at
+
+    def as_stale(self) -> "ThresholdTable":
+        """
+        Copy of this table marked as a last-known-good fallback.
+
+        Thresholds stay valid for the old snapshot and the time limit is still
+        evaluated against the current clock.
+
+        Returns:
+            Stale ThresholdTable
+        """
+        stale = copy.copy(self)
+        stale.stale = True
+        return stale
+
+    def _workload_at(self, utilization: float) -> float:
+        """New workload that brings the warehouse to the given utilization."""
+        if self._capacity <= 0:
+            # Utilization is pinned at 1.0 without capacity
+            return math.inf if utilization > 1.0 else -math.inf
+        return utilization * self._capacity - self._workload
+
+    def max_utilization_workload(self, priority: Priority) -> float:
+        """
+        Utilization threshold: orders must stay strictly below it.
+
+        Args:
+            priority: Order priority (VIP may use the reserve)
+
+        Returns:
+            W_util in minutes
+        """
+        return self._utilization_limits[
+            Priority.VIP if priority == Priority.VIP else Priority.STANDARD
+        ]
+
+    def max_time_workload(self, minutes_remaining: float) -> float:
+        """
+        Time threshold: orders up to it finish within the safety buffer.
+
+        Args:
+            minutes_remaining: Minutes until the shift deadline
+
+        Returns:
+            W_time in minutes
+        """
+        budget = minutes_remaining - self._safety_buffer
+        if self._capacity <= 0:
+            # Processing time is W·(1 + α) when capacity is unknown
+            return budget / (1.0 + self._alpha) - self._workload
+        return solve_processing_utilization(budget, self._alpha) * self._capacity - self._workload
+
+    def decide(
+        self, workload: Decimal | float, priority: Priority = Priority.STANDARD
+    ) -> TableDecision:
+        """
+        Decide an order against the thresholds.
+
+        Args:
+            workload: Total workload of the order (minutes)
+            priority: Order priority
+
+        Returns:
+            TableDecision matching DecisionEngine.make_decision's outcome
+        """
+        now = self.engine.clock()
+        deadline = self.engine.shift_deadline(now)
+        minutes_remaining = (deadline - now).total_seconds() / 60
+
+        new_workload = float(workload)
+        time_ok = new_workload <= self.max_time_workload(minutes_remaining)
+        utilization_ok = new_workload < self._utilization_limits[Priority.STANDARD]
+        vip_override = (
+            priority == Priority.VIP
+            and not (utilization_ok and time_ok)
+            and new_workload < self._utilization_limits[Priority.VIP]
+        )
+        # The VIP reserve lifts the utilization limit, never the time limit
+        utilization_ok = utilization_ok or vip_override
+        can_ship_today = utilization_ok and time_ok
+
+        projected = self._workload + new_workload
+        if self._capacity > 0:
+            utilization = projected / self._capacity
+            processing_time = utilization * (1.0 + self._alpha * utilization * utilization)
+        else:
+            utilization = 1.0
+            processing_time = projected * (1.0 + self._alpha)
+
+        return TableDecision(
+            table=self,
+            workload=new_workload,
+            can_ship_today=can_ship_today,
+            utilization_ok=utilization_ok,
+            vip_override_used=vip_override,
+            utilization=utilization,
+            time_buffer_minutes=int(minutes_remaining - processing_time),
+            estimated_completion=now + timedelta(minutes=processing_time),
+            calculated_at=self.engine.calculated_at(now),
+        )
+
+
+class ThresholdTableRegistry:
+    """Latest threshold table per warehouse, reused while fresh."""
+
+    def __init__(
+        self,
+        max_age_seconds: Optional[float] = None,
+        epoch_refresh_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize registry.
+
+        Args:
+            max_age_seconds: Age after which a table is rebuilt from a new snapshot
+            epoch_refresh_seconds: Interval between warehouse state epoch checks
+        """
+        settings = get_settings()
+        self.max_age_seconds = (
+            settings.threshold_table_max_age_seconds if max_age_seconds is None else max_age_seconds
+        )
+        self.epoch_refresh_seconds = (
+            settings.cache_epoch_refresh_seconds
+            if epoch_refresh_seconds is None
+            else epoch_refresh_seconds
+        )
+        self._tables: dict[str, ThresholdTable] = {}
+        # Survives invalidate(): the fallback while HANA is unavailable
+        self._last_known_good: dict[str, ThresholdTable] = {}
+        self._epochs: dict[str, int] = {}
+        # time.monotonic() of the last invalidation, per warehouse and of all
+        self._invalidated_at: dict[str, float] = {}
+        self._all_invalidated_at = -math.inf
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, warehouse_id: str) -> Optional[ThresholdTable]:
+        """
+        Get the warehouse's table if it is still fresh.
+
+        Args:
+            warehouse_id: Warehouse identifier
+
+        Returns:
+            ThresholdTable or None if missing or stale
+        """
+        table = self._tables.get(warehouse_id)
+        if table is None or time.monotonic() - table.built_at >= self.max_age_seconds:
+            return None
+        return table
+
+    def publish(self, table: ThresholdTable) -> None:
+        """
+        Publish a newly built table.
+
+        Tables loaded under an epoch that has since been superseded are only
+        kept as the last-known-good fallback.
+
+        Args:
+            table: Table built from the latest snapshot
+        """
+        if table.epoch >= self.epoch(table.warehouse_id):
+            self._tables[table.warehouse_id] = table
+        self._last_known_good[table.warehouse_id] = table
+        logger.debug(
+            "threshold_table_published",
+            warehouse_id=table.warehouse_id,
+            snapshot_version=table.snapshot_version,
+            max_workload_standard=table.max_utilization_workload(Priority.STANDARD),
+            max_workload_vip=table.max_utilization_workload(Priority.VIP),
+        )
+
+    def last_known_good(
+        self, warehouse_id: str, max_age_seconds: Optional[float] = None
+    ) -> Optional[ThresholdTable]:
+        """
+        Get a stale copy of the warehouse's last published table.
+
+        Args:
+            warehouse_id: Warehouse identifier
+            max_age_seconds: Oldest acceptable snapshot (defaults to
+                settings.stale_snapshot_max_age_seconds)
+
+        Returns:
+            Stale ThresholdTable, or None if there is none young enough
+        """
+        if max_age_seconds is None:
+            max_age_seconds = get_settings().stale_snapshot_max_age_seconds
+        table = self._last_known_good.get(warehouse_id)
+        if table is None or table.snapshot_age_seconds > max_age_seconds:
+            return None
+        return table.as_stale()
+
+    def invalidate(self, warehouse_id: Optional[str] = None) -> None:
+        """
+        Drop tables so the next check reloads the snapshot.
+
+        Args:
+            warehouse_id: Warehouse to drop (None drops all)
+        """
+        if warehouse_id is None:
+            self._tables.clear()
+            self._all_invalidated_at = time.monotonic()
+        else:
+            self._tables.pop(warehouse_id, None)
+            self._invalidated_at[warehouse_id] = time.monotonic()
+
+    def invalidated_at(self, warehouse_id: str) -> float:
+        """
+        When the warehouse was last invalidated in this process.
+
+        Returns:
+            time.monotonic() of the invalidation, or -inf if never
+        """
+        return max(self._invalidated_at.get(warehouse_id, -math.inf), self._all_invalidated_at)
+
+    def epoch(self, warehouse_id: str) -> int:
+        """Latest state epoch seen for a warehouse (0 if never bumped)."""
+        return self._epochs.get(warehouse_id, 0)
+
+    def observe_epochs(self, epochs: dict[str, int]) -> list[str]:
+        """
+        Apply warehouse state epochs, invalidating warehouses whose epoch moved on.
+
+        Args:
+            epochs: Current epoch per warehouse
+
+        Returns:
+            Warehouses invalidated
+        """
+        changed = []
+        for warehouse_id, epoch in epochs.items():
+            if epoch > self.epoch(warehouse_id):
+                self._epochs[warehouse_id] = epoch
+                self.invalidate(warehouse_id)
+                changed.append(warehouse_id)
+        if changed:
+            logger.info("threshold_tables_invalidated", warehouses=changed)
+        return changed
+
+    async def refresh_epochs(self) -> list[str]:
+        """
+        Read the epochs of all known warehouses from Redis and apply them.
+
+        Returns:
+            Warehouses invalidated (none if Redis is unavailable)
+        """
+        epochs = await get_cache_repository().get_warehouse_epochs(list(self._last_known_good))
+        return self.observe_epochs(epochs or {})
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background epoch refresh is active."""
+        return self._task is not None
+
+    async def start(self) -> None:
+        """Start refreshing warehouse state epochs in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the epoch refresh."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        """Refresh epochs on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.epoch_refresh_seconds)
+            try:
+                await self.refresh_epochs()
+            except Exception as e:
+                logger.error("threshold_epoch_refresh_failed", error=str(e))
+
+
+# Global registry instance
+_threshold_tables: Optional[ThresholdTableRegistry] = None
+
+
+def get_threshold_tables() -> ThresholdTableRegistry:
+    """Get global threshold table registry instance."""
+    global _threshold_tables
+    if _threshold_tables is None:
+        _threshold_tables = ThresholdTableRegistry()
+    return _threshold_tables
+
+
+async def invalidate_threshold_table(warehouse_id: str) -> int:
+    """
+    Invalidate a warehouse's threshold tables in every worker.
+
+    Drops this worker's table at once and bumps the warehouse's state epoch
+    in Redis, which the other workers pick up on their next epoch check.
+
+    Args:
+        warehouse_id: Warehouse whose state changed
+
+    Returns:
+        New state epoch (0 if Redis is unavailable, in which case only this
+        worker is invalidated)
+    """
+    registry = get_threshold_tables()
+    registry.invalidate(warehouse_id)
+    epoch = await get_cache_repository().invalidate_warehouse_cache(warehouse_id)
+    if epoch:
+        registry.observe_epochs({warehouse_id: epoch})
+    return epoch
+
+
+def _current_workload(warehouse_id: str, snapshot_workload: Decimal) -> Decimal:
+    """
+    Remaining workload from ingested events if they cover the warehouse, else the snapshot's.
+
+    Events cover a warehouse only once an order workload snapshot seeded it:
+    on their own they miss every order opened before ingestion started.
+    """
+    ingestor = get_event_ingestor()
+    covered = ingestor.is_running and ingestor.is_seeded(warehouse_id)
+    state = ingestor.state(warehouse_id) if covered else None
+    if state is None:
+        return snapshot_workload
+    return Decimal(str(round(state.remaining_workload, 3)))
+
+
+def _stale_table(warehouse_id: str, detail: str, error: Exception) -> ThresholdTable:
+    """
+    Fall back to the last-known-good snapshot when HANA is unavailable.
+
+    Raises:
+        SnapshotUnavailable: If there is no recent enough snapshot
+    """
+    table = get_threshold_tables().last_known_good(warehouse_id)
+    if table is None:
+        raise SnapshotUnavailable(detail) from error
+    logger.warning(
+        "stale_snapshot_used",
+        warehouse_id=warehouse_id,
+        snapshot_version=table.snapshot_version,
+        snapshot_age_seconds=table.snapshot_age_seconds,
+        error=str(error) or type(error).__name__,
+    )
+    return table
+
+
+async def load_threshold_table(warehouse_id: str) -> ThresholdTable:
+    """
+    Build and publish a threshold table from the current HANA snapshot.
+
+    With the shared snapshot enabled, the warehouse's entry published by the
+    snapshot publisher is used instead of querying HANA. An entry the
+    publisher has not refreshed for shared_snapshot_max_age_seconds is served
+    as a stale table (up to stale_snapshot_max_age_seconds), so a lagging
+    publisher does not send every worker to HANA; only warehouses without a
+    usable entry are queried. Entries loaded before the warehouse was last
+    invalidated are skipped. If HANA fails, times out or its circuit breaker
+    is open, the warehouse's last-known-good table is returned as a stale
+    copy instead.
+
+    Args:
+        warehouse_id: Warehouse identifier
+
+    Returns:
+        Fresh ThresholdTable, or a stale one while HANA or the publisher is
+        unavailable
+
+    Raises:
+        SnapshotUnavailable: If HANA is unavailable and no recent snapshot exists
+    """
+    registry = get_threshold_tables()
+    # Captured before any await, so a bump during the load is not lost
+    epoch = registry.epoch(warehouse_id)
+    shared_snapshot = get_shared_snapshot()
+    if shared_snapshot is not None:
+        with stage("cache_lookup"):
+            entry = shared_snapshot.get(warehouse_id)
+        if entry is not None and entry.loaded_at >= registry.invalidated_at(warehouse_id):
+            settings = get_settings()
+            age_seconds = entry.age_seconds
+            if age_seconds <= settings.shared_snapshot_max_age_seconds:
+                with stage("cache_store"):
+                    return _publish_shared_table(entry)
+            if age_seconds <= settings.stale_snapshot_max_age_seconds:
+                return _stale_shared_table(entry, age_seconds)
+
+    hana_repo = get_hana_repository()
+    try:
+        capacity_data = await hana_repo.get_current_warehouse_capacity(warehouse_id)
+    except Exception as e:
+        logger.error("hana_query_failed", error=str(e) or type(e).__name__)
+        return _stale_table(warehouse_id, "Failed to query warehouse capacity from database", e)
+
+    # Get current workload from HANA (never assume an empty warehouse)
+    try:
+        cutoff_data = await hana_repo.get_cutoff_calculation(warehouse_id)
+    except Exception as e:
+        logger.error("hana_cutoff_query_failed", error=str(e) or type(e).__name__)
+        return _stale_table(warehouse_id, "Failed to query current workload from database", e)
+
+    # Build capacity object
+    capacity_service = get_capacity_service()
+    warehouse_capacity = capacity_service.calculate_warehouse_capacity(
+        pickers=capacity_data["available_pickers"],
+        packers=capacity_data["available_packers"],
+        loaders=capacity_data["available_loaders"],
+    )
+
+    with stage("cache_store"):
+        snapshot_version = f"{cutoff_data['calc_date']}T{cutoff_data['calc_time']}"
+        get_utilization_history().record(warehouse_id, float(cutoff_data["current_utilization"]))
+
+        table = ThresholdTable(
+            get_decision_engine(),
+            warehouse_id=warehouse_id,
+            current_workload=_current_workload(
+                warehouse_id, cutoff_data["total_remaining_workload"]
+            ),
+            capacity=warehouse_capacity.usable_capacity,
+            bottleneck_resource=warehouse_capacity.bottleneck_resource.value,
+            snapshot_version=snapshot_version,
+        )
+        table.epoch = epoch
+        registry.publish(table)
+    return table
+
+
+def _shared_table(entry: WarehouseSnapshot) -> ThresholdTable:
+    """Build a threshold table from a shared snapshot entry."""
+    table = ThresholdTable(
+        get_decision_engine(),
+        warehouse_id=entry.warehouse_id,
+        current_workload=_current_workload(
+            entry.warehouse_id, Decimal(str(entry.current_workload))
+        ),
+        capacity=Decimal(str(entry.capacity)),
+        bottleneck_resource=entry.bottleneck_resource.value,
+        snapshot_version=entry.snapshot_version,
+    )
+    # Age counts from the publisher's HANA load (CLOCK_MONOTONIC is host-wide)
+    table.built_at = entry.loaded_at
+    table.epoch = get_threshold_tables().epoch(entry.warehouse_id)
+    return table
+
+
+def _publish_shared_table(entry: WarehouseSnapshot) -> ThresholdTable:
+    """Build and publish a threshold table from a shared snapshot entry."""
+    table = _shared_table(entry)
+    get_utilization_history().record(entry.warehouse_id, entry.current_utilization)
+    get_threshold_tables().publish(table)
+    return table
+
+
+def _stale_shared_table(entry: WarehouseSnapshot, age_seconds: float) -> ThresholdTable:
+    """
+    Serve a shared snapshot entry the publisher has not refreshed in time.
+
+    The table is not published, so the next check reads the snapshot again
+    and picks up the publisher's next refresh.
+    """
+    logger.warning(
+        "stale_snapshot_used",
+        warehouse_id=entry.warehouse_id,
+        snapshot_version=entry.snapshot_version,
+        snapshot_age_seconds=age_seconds,
+        error="shared snapshot not refreshed",
+    )
+    return _shared_table(entry).as_stale()
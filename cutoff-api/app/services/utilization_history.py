@@ -0,0 +1,472 @@
+"""
+Fixed-memory utilization time series per warehouse.
+
+Each warehouse keeps three preallocated ring buffers:
+
+    raw      1-second resolution, last hour
+    minute   1-minute averages, last 24 hours
+    quarter  15-minute averages, last 7 days
+
+Samples are downsampled incrementally as buckets close, and an EWMA of the
+utilization slope is updated on every sample, so recording and reading the
+trend are both O(1). Series can optionally be persisted to memory-mapped
+files and reloaded after a restart. Every worker writes its copy to a file
+of its own and renames it over the warehouse's file, so concurrent workers
+replace each other's copies whole and a reader never sees a torn file.
+
+The registry keeps at most max_warehouses series (about 110 KB each) and
+evicts the least recently used one beyond that, so warehouse ids that only
+ever appear in a request cannot grow memory without bound.
+"""
+
+import asyncio
+import math
+import mmap
+import os
+import struct
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from urllib.parse import quote, unquote
+
+from app.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Trend thresholds on the smoothed slope (utilization change per minute)
+TREND_THRESHOLD_PER_MINUTE = 0.002
+# Time constant of the slope EWMA (seconds)
+SLOPE_TAU_SECONDS = 300.0
+
+
+class RingSeries:
+    """Preallocated ring buffer of (timestamp, value) pairs."""
+
+    def __init__(self, resolution_seconds: int, capacity: int) -> None:
+        """
+        Initialize ring buffer.
+
+        Args:
+            resolution_seconds: Bucket width of this tier
+            capacity: Number of points retained
+        """
+        self.resolution_seconds = resolution_seconds
+        self.capacity = capacity
+        self.times = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self.head = 0  # Next write position
+        self.count = 0
+
+    def push(self, timestamp: float, value: float) -> None:
+        """Append a point, overwriting the oldest when full."""
+        self.times[self.head] = timestamp
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def replace_last(self, value: float) -> None:
+        """Overwrite the value of the most recent point."""
+        self.values[(self.head - 1) % self.capacity] = value
+
+    @property
+    def last_time(self) -> Optional[float]:
+        """Timestamp of the most recent point."""
+        if self.count == 0:
+            return None
+        return self.times[(self.head - 1) % self.capacity]
+
+    def latest(self, n: int) -> list[tuple[float, float]]:
+        """Return up to n most recent points, oldest first."""
+        n = min(n, self.count)
+        start = (self.head - n) % self.capacity
+        return [
+            (self.times[(start + i) % self.capacity], self.values[(start + i) % self.capacity])
+            for i in range(n)
+        ]
+
+
+class _Bucket:
+    """Running average of the samples falling into one downsampling bucket."""
+
+    __slots__ = ("start", "total", "count")
+
+    def __init__(self) -> None:
+        """Initialize an empty bucket."""
+        self.start = -1.0
+        self.total = 0.0
+        self.count = 0
+
+
+class UtilizationSeries:
+    """Utilization history and trend for one warehouse."""
+
+    RAW_CAPACITY = 3600  # 1 hour at 1 s
+    MINUTE_CAPACITY = 1440  # 24 hours at 1 min
+    QUARTER_CAPACITY = 672  # 7 days at 15 min
+
+    # magic, then per tier (head, count), then bucket state and EWMA state
+    _HEADER = struct.Struct("<8s6I dd I dd I dddd")
+    _MAGIC = b"UTILTS01"
+    FILE_SIZE = _HEADER.size + 16 * (RAW_CAPACITY + MINUTE_CAPACITY + QUARTER_CAPACITY)
+
+    def __init__(self) -> None:
+        """Initialize empty series."""
+        self.raw = RingSeries(1, self.RAW_CAPACITY)
+        self.minute = RingSeries(60, self.MINUTE_CAPACITY)
+        self.quarter = RingSeries(900, self.QUARTER_CAPACITY)
+        self._minute_bucket = _Bucket()
+        self._quarter_bucket = _Bucket()
+        self.level = 0.0
+        self.slope_per_minute = 0.0
+        self._last_time = -1.0
+        self._last_value = 0.0
+
+    def record(self, value: float, timestamp: Optional[float] = None) -> None:
+        """
+        Record a utilization sample.
+
+        Args:
+            value: Utilization (0-1)
+            timestamp: Epoch seconds (defaults to now)
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        second = math.floor(timestamp)
+
+        # Raw tier: keep the latest value per second
+        if self.raw.last_time == second:
+            self.raw.replace_last(value)
+        else:
+            self.raw.push(second, value)
+
+        self._roll(self._minute_bucket, self.minute, second, value)
+
+        # Incremental EWMA of level and slope
+        if self._last_time < 0:
+            self.level = value
+        else:
+            dt = timestamp - self._last_time
+            if dt > 0:
+                alpha = 1.0 - math.exp(-dt / SLOPE_TAU_SECONDS)
+                instant_slope = (value - self._last_value) / (dt / 60.0)
+                self.slope_per_minute += alpha * (instant_slope - self.slope_per_minute)
+                self.level += alpha * (value - self.level)
+        self._last_time = timestamp
+        self._last_value = value
+
+    def _roll(self, bucket: _Bucket, tier: RingSeries, second: float, value: float) -> None:
+        """Accumulate into a bucket, emitting its average when a new bucket starts."""
+        start = second - (second % tier.resolution_seconds)
+        if bucket.start != start:
+            if bucket.count:
+                average = bucket.total / bucket.count
+                tier.push(bucket.start, average)
+                if tier is self.minute:
+                    self._roll(self._quarter_bucket, self.quarter, bucket.start, average)
+            bucket.start = start
+            bucket.total = 0.0
+            bucket.count = 0
+        bucket.total += value
+        bucket.count += 1
+
+    @property
+    def trend(self) -> str:
+        """Trend from the smoothed slope: INCREASING, STABLE or DECREASING."""
+        if self.slope_per_minute > TREND_THRESHOLD_PER_MINUTE:
+            return "INCREASING"
+        if self.slope_per_minute < -TREND_THRESHOLD_PER_MINUTE:
+            return "DECREASING"
+        return "STABLE"
+
+    def history(self, points: int = 4) -> list[tuple[datetime, float]]:
+        """
+        Recent history for display: closed 15-minute buckets, then the latest sample.
+
+        Args:
+            points: Number of 15-minute points before the latest sample
+
+        Returns:
+            List of (time, utilization), oldest first
+        """
+        result = [(datetime.fromtimestamp(ts), value) for ts, value in self.quarter.latest(points)]
+        if self._last_time >= 0:
+            result.append((datetime.fromtimestamp(self._last_time), self._last_value))
+        return result
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the series in its file layout.
+
+        Copies every tier, so the result stays consistent while recording
+        continues (call it on the thread that records).
+
+        Returns:
+            File contents for write()
+        """
+        header = self._HEADER.pack(
+            self._MAGIC,
+            self.raw.head,
+            self.raw.count,
+            self.minute.head,
+            self.minute.count,
+            self.quarter.head,
+            self.quarter.count,
+            self._minute_bucket.start,
+            self._minute_bucket.total,
+            self._minute_bucket.count,
+            self._quarter_bucket.start,
+            self._quarter_bucket.total,
+            self._quarter_bucket.count,
+            self.level,
+            self.slope_per_minute,
+            self._last_time,
+            self._last_value,
+        )
+        tiers = (self.raw, self.minute, self.quarter)
+        return b"".join(
+            [header, *(column.tobytes() for tier in tiers for column in (tier.times, tier.values))]
+        )
+
+    @staticmethod
+    def write(path: Path, data: bytes) -> None:
+        """
+        Write serialized series to a fixed-size memory-mapped file.
+
+        The data goes to a temporary file of this process first, which then
+        atomically replaces the file at path.
+
+        Args:
+            path: File path (replaced as a whole)
+            data: Output of to_bytes()
+        """
+        staging_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(staging_path, "w+b") as f:
+                f.truncate(len(data))
+                with mmap.mmap(f.fileno(), len(data)) as mm:
+                    mm[:] = data
+                    mm.flush()
+            os.replace(staging_path, path)
+        except Exception:
+            staging_path.unlink(missing_ok=True)
+            raise
+
+    def save(self, path: Path) -> None:
+        """
+        Persist the series to a fixed-size memory-mapped file.
+
+        Args:
+            path: File path (replaced as a whole)
+        """
+        self.write(path, self.to_bytes())
+
+    @classmethod
+    def load(cls, path: Path) -> "UtilizationSeries":
+        """
+        Restore a series saved with save().
+
+        Args:
+            path: File path
+
+        Returns:
+            Restored series
+
+        Raises:
+            ValueError: If the file is not a complete, consistent series
+        """
+        series = cls()
+        tiers = (series.raw, series.minute, series.quarter)
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) != cls.FILE_SIZE:
+                raise ValueError(f"Utilization series file has {len(mm)} bytes: {path}")
+            fields = cls._HEADER.unpack_from(mm, 0)
+            if fields[0] != cls._MAGIC:
+                raise ValueError(f"Not a utilization series file: {path}")
+            positions = zip(tiers, fields[1:7:2], fields[2:7:2])
+            if any(head >= tier.capacity or count > tier.capacity for tier, head, count in positions):
+                raise ValueError(f"Corrupt utilization series header: {path}")
+            if not all(math.isfinite(value) for value in fields[7:]):
+                raise ValueError(f"Corrupt utilization series state: {path}")
+            (
+                series.raw.head,
+                series.raw.count,
+                series.minute.head,
+                series.minute.count,
+                series.quarter.head,
+                series.quarter.count,
+                series._minute_bucket.start,
+                series._minute_bucket.total,
+                series._minute_bucket.count,
+                series._quarter_bucket.start,
+                series._quarter_bucket.total,
+                series._quarter_bucket.count,
+                series.level,
+                series.slope_per_minute,
+                series._last_time,
+                series._last_value,
+            ) = fields[1:]
+            offset = cls._HEADER.size
+            for tier in tiers:
+                for column in (tier.times, tier.values):
+                    size = 8 * tier.capacity
+                    column[:] = array("d", mm[offset : offset + size])
+                    offset += size
+        return series
+
+
+class UtilizationHistory:
+    """Registry of per-warehouse utilization series with optional persistence."""
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        persist_interval_seconds: float = 60.0,
+        max_warehouses: int = 256,
+    ) -> None:
+        """
+        Initialize registry.
+
+        Args:
+            directory: Directory for mmap files (None disables persistence)
+            persist_interval_seconds: Time between persistence runs
+            max_warehouses: Series kept before the least recently used is evicted
+        """
+        self.directory = Path(directory) if directory else None
+        self.persist_interval_seconds = persist_interval_seconds
+        self.max_warehouses = max_warehouses
+        self._series: OrderedDict[str, UtilizationSeries] = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, warehouse_id: str) -> UtilizationSeries:
+        """Get (or create) the series for a warehouse, evicting the least recently used."""
+        series = self._series.get(warehouse_id)
+        if series is None:
+            series = self._series[warehouse_id] = UtilizationSeries()
+            if len(self._series) > self.max_warehouses:
+                self._series.popitem(last=False)
+        else:
+            self._series.move_to_end(warehouse_id)
+        return series
+
+    def record(self, warehouse_id: str, utilization: float) -> UtilizationSeries:
+        """
+        Record a utilization sample for a warehouse.
+
+        Args:
+            warehouse_id: Warehouse identifier
+            utilization: Current utilization (0-1)
+
+        Returns:
+            The warehouse's series
+        """
+        series = self.get(warehouse_id)
+        series.record(utilization)
+        return series
+
+    def _series_path(self, warehouse_id: str) -> Path:
+        """File of a warehouse's series; the id is percent-encoded, so it cannot add a path."""
+        assert self.directory is not None
+        return self.directory / f"{quote(warehouse_id, safe='')}.utilts"
+
+    def snapshot(self) -> list[tuple[Path, bytes]]:
+        """
+        Serialize every series for persist (on the event loop, while nothing records).
+
+        Returns:
+            (file path, contents) per warehouse
+        """
+        if self.directory is None:
+            return []
+        return [
+            (self._series_path(warehouse_id), series.to_bytes())
+            for warehouse_id, series in self._series.items()
+        ]
+
+    def write_snapshot(self, snapshot: list[tuple[Path, bytes]]) -> None:
+        """Write a snapshot() to the mmap files (safe to run in a worker thread)."""
+        if not snapshot or self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path, data in snapshot:
+            UtilizationSeries.write(path, data)
+
+    def persist(self) -> None:
+        """Write every series to its mmap file."""
+        self.write_snapshot(self.snapshot())
+
+    async def persist_async(self) -> None:
+        """Copy every series on the event loop, then write the copies in a thread."""
+        snapshot = self.snapshot()
+        await asyncio.to_thread(self.write_snapshot, snapshot)
+
+    def restore(self) -> int:
+        """
+        Load persisted series from the directory (the most recently written first).
+
+        Returns:
+            Number of warehouses restored
+        """
+        if self.directory is None or not self.directory.exists():
+            return 0
+        paths = sorted(
+            self.directory.glob("*.utilts"), key=lambda path: path.stat().st_mtime, reverse=True
+        )
+        restored = 0
+        # Oldest first, so the most recently written end up most recently used
+        for path in reversed(paths[: self.max_warehouses]):
+            try:
+                self._series[unquote(path.stem)] = UtilizationSeries.load(path)
+                restored += 1
+            except (OSError, ValueError, struct.error) as e:
+                logger.warning("utilization_history_restore_failed", path=str(path), error=str(e))
+        return restored
+
+    async def start(self) -> None:
+        """Restore persisted series and start periodic persistence."""
+        if self.directory is None or self._task is not None:
+            return
+        restored = await asyncio.to_thread(self.restore)
+        logger.info("utilization_history_restored", warehouses=restored)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop periodic persistence and write a final copy."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.persist_async()
+
+    async def _run(self) -> None:
+        """Persist on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.persist_interval_seconds)
+            try:
+                await self.persist_async()
+            except Exception as e:
+                logger.error("utilization_history_persist_failed", error=str(e))
+
+
+# Global registry instance
+_utilization_history: Optional[UtilizationHistory] = None
+
+
+def get_utilization_history() -> UtilizationHistory:
+    """Get global utilization history instance."""
+    global _utilization_history
+    if _utilization_history is None:
+        settings = get_settings()
+        _utilization_history = UtilizationHistory(
+            directory=settings.utilization_history_dir,
+            persist_interval_seconds=settings.utilization_history_persist_seconds,
+            max_warehouses=settings.utilization_history_max_warehouses,
+        )
+    return _utilization_history
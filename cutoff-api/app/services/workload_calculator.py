@@ -7,7 +7,9 @@ from decimal import Decimal
 from typing import Optional
 
 from app.core.logging import get_logger
-from app.models.domain import Order, OrderItem, OrderStatus, Workload
+from app.models.domain import Order, OrderItem, OrderStatus
+from app.models.internal import Workload
+from app.models.requests import OrderItemColumns
 
 logger = get_logger(__name__)
 
@@ -30,6 +32,7 @@ class WorkloadCalculator:
     PACKING_BASE = Decimal("3.0")  # minutes
     PACKING_PER_ITEM = Decimal("0.5")  # minutes per item
     LOADING_TIME = Decimal("1.5")  # minutes
+    _ONE = Decimal("1.0")
 
     # Progress factors by status (from algorithm spec)
     PROGRESS_FACTORS = {
@@ -118,6 +121,41 @@ class WorkloadCalculator:
             loading_time=self.LOADING_TIME,
         )
 
+    def calculate_columnar_workload(self, items: OrderItemColumns) -> Workload:
+        """
+        Calculate total workload for column-wise order items.
+
+        Same result as calculate_order_workload, without per-item objects:
+        quantities of items with default factors are summed as integers and
+        only weighted items go through Decimal multiplication.
+
+        Args:
+            items: Order items stored column-wise
+
+        Returns:
+            Workload object with breakdown
+        """
+        plain_quantity = 0
+        weighted = Decimal("0.0")
+        for quantity, weight_factor, location_factor in zip(
+            items.quantities, items.weight_factors, items.location_factors
+        ):
+            weight_factor = weight_factor or self._ONE
+            location_factor = location_factor or self._ONE
+            if weight_factor == self._ONE and location_factor == self._ONE:
+                plain_quantity += quantity
+            else:
+                weighted += Decimal(quantity) * weight_factor * location_factor
+        item_workload = weighted + plain_quantity
+
+        return Workload(
+            item_workload=item_workload,
+            setup_time=self.SETUP_TIME,
+            packing_base=self.PACKING_BASE,
+            packing_per_item=self.PACKING_PER_ITEM,
+            loading_time=self.LOADING_TIME,
+        )
+
     def calculate_batch_workload(self, orders: list[Order]) -> Decimal:
         """
         Calculate total workload for multiple orders.
@@ -0,0 +1,108 @@
+"""
+Startup warm-up and readiness.
+
+Service singletons, warehouse snapshots and the decision path are otherwise
+initialised by the first requests after a deploy. Warm-up runs them once in
+the background right after startup; GET /ready reports 503 until it has
+finished, so the router only sends traffic to warm instances while /health
+keeps answering liveness probes immediately.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from app.core.logging import get_logger
+from app.models.domain import Priority
+from app.models.requests import ParsedCapacityCheck, capacity_check_payload_adapter
+from app.repositories.cache_repository import get_cache_repository
+from app.repositories.hana_repository import get_hana_repository
+from app.services.capacity_service import get_capacity_service
+from app.services.decision_engine import get_decision_engine
+from app.services.threshold_table import load_threshold_table
+from app.services.workload_calculator import get_workload_calculator
+
+logger = get_logger(__name__)
+
+# Representative body pushed through parsing and workload calculation
+_SAMPLE_BODY = b'{"items": [{"product_id": "WARMUP", "quantity": 1, "weight_factor": "1.5"}]}'
+
+
+class Warmup:
+    """Runs warm-up once in the background and tracks readiness."""
+
+    def __init__(self) -> None:
+        """Initialize warm-up state."""
+        self.ready = False
+        self.duration_seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start warm-up in the background."""
+        if self._task is None and not self.ready:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel warm-up if it is still running."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        """Warm up, then report ready even if some steps failed."""
+        started = time.perf_counter()
+        try:
+            await self.warm_up()
+        except Exception as e:
+            logger.error("warmup_failed", error=str(e))
+        self.duration_seconds = time.perf_counter() - started
+        self.ready = True
+        logger.info("warmup_completed", duration_seconds=self.duration_seconds)
+
+    async def warm_up(self) -> None:
+        """
+        Build singletons, load warehouse snapshots and run one decision.
+
+        Snapshots are loaded into the threshold table registry; a warehouse
+        whose snapshot cannot be loaded is logged and skipped.
+        """
+        get_workload_calculator()
+        get_capacity_service()
+        get_decision_engine()
+        get_cache_repository()
+        hana_repo = get_hana_repository()
+
+        tables = []
+        for warehouse_id in await hana_repo.list_warehouses():
+            try:
+                tables.append(await load_threshold_table(warehouse_id))
+            except Exception as e:
+                logger.warning("warmup_snapshot_failed", warehouse_id=warehouse_id, error=str(e))
+
+        # Exercise parsing, workload and decision code once
+        request = ParsedCapacityCheck.from_payload(
+            capacity_check_payload_adapter.validate_json(_SAMPLE_BODY)
+        )
+        workload = get_workload_calculator().calculate_columnar_workload(request.items)
+        for table in tables[:1]:
+            decision = table.decide(workload.total_workload, Priority.VIP)
+            decision.to_decision().to_model().model_dump_json()
+
+        logger.info("warmup_snapshots_loaded", warehouses=len(tables))
+
+
+# Global warm-up instance
+_warmup: Optional[Warmup] = None
+
+
+def get_warmup() -> Warmup:
+    """Get global warm-up instance."""
+    global _warmup
+    if _warmup is None:
+        _warmup = Warmup()
+    return _warmup
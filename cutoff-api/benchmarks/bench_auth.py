@@ -0,0 +1,56 @@
+"""
+Benchmark the JWT authentication dependency with and without the verified-token cache.
+
+Runs get_current_user plus require_read_scope for one reused service token:
+"uncached" verifies the signature and builds the models on every call,
+"cached" serves the user from the verified-token cache.
+
+    cd cutoff-api && PYTHONPATH=. python benchmarks/bench_auth.py
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core import auth
+from app.core.auth import (
+    VerifiedTokenCache,
+    create_access_token,
+    get_current_user,
+    require_read_scope,
+)
+
+
+async def measure(name: str, cache_size: int, iterations: int) -> None:
+    """Print time per authenticated request."""
+    auth._token_cache = VerifiedTokenCache(max_size=cache_size)
+    token = create_access_token({"sub": "erp-service", "scopes": ["cutoff.read", "cutoff.write"]})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    for _ in range(1000):
+        await require_read_scope(await get_current_user(credentials))
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await require_read_scope(await get_current_user(credentials))
+    elapsed = time.perf_counter() - started
+
+    print(f"{name:>8}: {elapsed / iterations * 1e6:7.2f} µs/request")
+
+
+async def run(iterations: int) -> None:
+    await measure("uncached", 0, iterations)
+    await measure("cached", 10_000, iterations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark warehouse cache invalidation: SCAN MATCH vs tag sets vs state epochs.
+
+Fills a local Redis with decision entries spread over many warehouses, then
+times invalidating one warehouse three ways and samples the latency of
+concurrent GETs while each invalidation runs:
+
+- scan: SCAN the keyspace for the warehouse's keys and DEL them
+- tag: drain a per-warehouse tag set with chunked UNLINK
+- epoch: INCR the warehouse's state epoch (what invalidate_warehouse_cache does)
+
+Requires a disposable local Redis (the database is flushed):
+
+    python benchmarks/bench_cache_invalidation.py --keys 1000000 --warehouses 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import redis.asyncio as aioredis
+
+VALUE = "x" * 512
+
+
+async def fill(redis: aioredis.Redis, keys: int, warehouses: int) -> None:
+    """Write keys (with tag sets) evenly across warehouses."""
+    await redis.flushdb()
+    pipe = redis.pipeline(transaction=False)
+    for i in range(keys):
+        warehouse = f"WH-{i % warehouses:03d}"
+        key = f"capacity:{warehouse}:e0:{i:032x}"
+        pipe.set(key, VALUE, ex=3600)
+        pipe.sadd(f"cache_tag:{warehouse}:e0", key)
+        if len(pipe) >= 10_000:
+            await pipe.execute()
+    await pipe.execute()
+
+
+async def invalidate_scan(redis: aioredis.Redis, warehouse: str) -> int:
+    """SCAN the keyspace and DEL matches."""
+    deleted = 0
+    async for key in redis.scan_iter(match=f"capacity:{warehouse}:*", count=1000):
+        deleted += await redis.delete(key)
+    return deleted
+
+
+async def invalidate_tag(redis: aioredis.Redis, warehouse: str, chunk_size: int = 500) -> int:
+    """Drain the tag set with chunked UNLINK."""
+    deleted = 0
+    tag = f"cache_tag:{warehouse}:e0"
+    while members := await redis.spop(tag, chunk_size):
+        deleted += await redis.unlink(*members)
+    return deleted
+
+
+async def invalidate_epoch(redis: aioredis.Redis, warehouse: str) -> int:
+    """Advance the warehouse's state epoch; nothing is deleted."""
+    await redis.incr(f"cache_epoch:{warehouse}")
+    return 0
+
+
+async def probe(redis: aioredis.Redis, stop: asyncio.Event, samples: list[float]) -> None:
+    """Measure GET latency on an unrelated key until stopped."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await redis.get("probe")
+        samples.append((time.perf_counter() - started) * 1000)
+
+
+async def measure(
+    redis: aioredis.Redis, probe_client: aioredis.Redis, name: str, invalidate, warehouse: str
+) -> None:
+    """Time one invalidation and report concurrent GET latency."""
+    stop = asyncio.Event()
+    samples: list[float] = []
+    prober = asyncio.create_task(probe(probe_client, stop, samples))
+    # Let the prober take at least one sample, even for an O(1) invalidation
+    await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    deleted = await invalidate(redis, warehouse)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await prober
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1] if samples else 0.0
+    print(
+        f"{name:>5}: deleted={deleted} elapsed={elapsed * 1000:.3f}ms "
+        f"get_p50={statistics.median(samples) if samples else 0:.3f}ms get_p99={p99:.3f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="redis://localhost:6379/15")
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--warehouses", type=int, default=50)
+    args = parser.parse_args()
+
+    redis = aioredis.from_url(args.url, decode_responses=True)
+    probe_client = aioredis.from_url(args.url, decode_responses=True)
+    strategies = (("scan", invalidate_scan), ("tag", invalidate_tag), ("epoch", invalidate_epoch))
+    for name, invalidate in strategies:
+        await fill(redis, args.keys, args.warehouses)
+        await measure(redis, probe_client, name, invalidate, "WH-000")
+    await redis.flushdb()
+    await probe_client.aclose()
+    await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
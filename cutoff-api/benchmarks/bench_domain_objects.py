@@ -0,0 +1,113 @@
+"""
+Benchmark internal slotted domain objects against the pydantic models.
+
+Measures the per-request capacity/workload/decision objects: construction
+plus the derived-value accesses the decision path performs, and the memory
+held by one request's object graph (tracemalloc).
+
+    cd cutoff-api && PYTHONPATH=. python benchmarks/bench_domain_objects.py
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable
+
+from app.models import domain, internal
+from app.models.domain import DecisionStatus, ResourceType
+
+COUNTS = ((ResourceType.PICKER, 10), (ResourceType.PACKER, 8), (ResourceType.LOADER, 4))
+
+
+def pydantic_request() -> tuple[Any, ...]:
+    """Objects one capacity check built before: four validated models plus a decision."""
+    resources = [
+        domain.ResourceCapacity(resource_type=kind, available_count=count) for kind, count in COUNTS
+    ]
+    capacity = domain.WarehouseCapacity(
+        picker_capacity=resources[0], packer_capacity=resources[1], loader_capacity=resources[2]
+    )
+    # Each access recomputes all three rates
+    _ = capacity.usable_capacity, capacity.bottleneck_resource, capacity.usable_capacity
+    workload = domain.Workload(item_workload=Decimal("7.5"))
+    _ = workload.total_workload
+    decision = domain.Decision(
+        can_ship_today=True,
+        status=DecisionStatus.WARNING,
+        confidence=Decimal("0.3"),
+        current_utilization=Decimal("0.7"),
+        estimated_completion=datetime(2024, 1, 15, 12, 0),
+        message="ok",
+        factors=domain.DecisionFactors(
+            workload_impact=workload.total_workload,
+            remaining_capacity=Decimal("10"),
+            time_buffer_minutes=120,
+            bottleneck_resource=capacity.bottleneck_resource,
+        ),
+    )
+    return capacity, workload, decision
+
+
+def internal_request() -> tuple[Any, ...]:
+    """The same objects as internal slotted dataclasses."""
+    resources = [
+        internal.ResourceCapacity(resource_type=kind, available_count=count)
+        for kind, count in COUNTS
+    ]
+    capacity = internal.WarehouseCapacity(resources[0], resources[1], resources[2])
+    _ = capacity.usable_capacity, capacity.bottleneck_resource, capacity.usable_capacity
+    workload = internal.Workload(item_workload=Decimal("7.5"))
+    _ = workload.total_workload
+    decision = internal.Decision(
+        can_ship_today=True,
+        status=DecisionStatus.WARNING,
+        confidence=Decimal("0.3"),
+        current_utilization=Decimal("0.7"),
+        estimated_completion=datetime(2024, 1, 15, 12, 0),
+        message="ok",
+        factors=internal.DecisionFactors(
+            workload_impact=workload.total_workload,
+            remaining_capacity=Decimal("10"),
+            time_buffer_minutes=120,
+            bottleneck_resource=capacity.bottleneck_resource,
+        ),
+    )
+    return capacity, workload, decision
+
+
+def measure(name: str, func: Callable[[], tuple[Any, ...]], iterations: int) -> None:
+    """Print time per request and bytes held per request's objects."""
+    for _ in range(1000):
+        func()
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - started
+
+    retained = 10_000
+    tracemalloc.start()
+    kept = [func() for _ in range(retained)]
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+
+    print(
+        f"{name:>8}: {elapsed / iterations * 1e6:7.2f} µs/request  "
+        f"{held / retained:7.0f} B/request"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    measure("pydantic", pydantic_request, args.iterations)
+    measure("internal", internal_request, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
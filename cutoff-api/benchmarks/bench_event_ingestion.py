@@ -0,0 +1,82 @@
+"""
+Benchmark event ingestion throughput from a Redis Stream.
+
+Publishes order-created and delivery-status events to a stream, then drains
+it with EventIngestor.consume_once for several batch sizes and reports
+events per second (XREAD, dedupe, apply).
+
+Requires a disposable local Redis (the database is flushed):
+
+    cd cutoff-api && PYTHONPATH=. python benchmarks/bench_event_ingestion.py --events 200000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import redis.asyncio as aioredis
+
+from app.services.event_ingestion import EventIngestor
+
+STATUSES = ("ALLOCATED", "PICKING", "PACKING", "LOADING", "SHIPPED")
+
+
+async def publish(redis: aioredis.Redis, stream: str, events: int, warehouses: int) -> None:
+    """Append events: each order is created, then advanced through a status."""
+    await redis.flushdb()
+    rng = random.Random(42)
+    pipe = redis.pipeline(transaction=False)
+    for i in range(events):
+        order = i // 2
+        fields = {
+            "event_id": f"evt-{i}",
+            "warehouse_id": f"WH{order % warehouses:03d}",
+            "order_id": f"ORD-{order}",
+        }
+        if i % 2 == 0:
+            fields.update(type="order_created", workload=f"{rng.uniform(5, 60):.2f}")
+        else:
+            fields.update(type="delivery_status", status=rng.choice(STATUSES))
+        pipe.xadd(stream, fields)
+        if len(pipe) >= 10_000:
+            await pipe.execute()
+    await pipe.execute()
+
+
+async def drain(redis: aioredis.Redis, stream: str, events: int, batch_size: int) -> None:
+    """Consume the whole stream with a fresh ingestor and report throughput."""
+    ingestor = EventIngestor(stream=stream, batch_size=batch_size, block_ms=0)
+    ingestor.last_id = "0-0"
+
+    started = time.perf_counter()
+    handled = 0
+    while handled < events:
+        handled += await ingestor.consume_once(redis)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"batch={batch_size:>5}: {handled} events in {elapsed:.2f}s "
+        f"= {handled / elapsed:,.0f} events/s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="redis://localhost:6379/15")
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--warehouses", type=int, default=50)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    args = parser.parse_args()
+
+    redis = aioredis.from_url(args.url, decode_responses=True)
+    stream = "bench:events"
+    await publish(redis, stream, args.events, args.warehouses)
+    for batch_size in args.batch_sizes:
+        await drain(redis, stream, args.events, batch_size)
+    await redis.flushdb()
+    await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Benchmark capacity check latency during a HANA brownout.
+
+Replaces the HANA repository with one whose cutoff query hangs for
+--latency seconds, forces a snapshot reload on every check and fires
+concurrent POST /capacity/check requests through the ASGI app. Compares the
+circuit breaker with per-query timeouts against unbounded waiting.
+
+    cd cutoff-api && PYTHONPATH=. python benchmarks/bench_hana_brownout.py
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.main import app
+from app.repositories import hana_repository
+from app.repositories.hana_repository import HANARepository, guarded_query
+from app.services.threshold_table import get_threshold_tables
+
+ORDER = {"warehouse_id": "WH-MAIN", "items": [{"product_id": "MAT-001", "quantity": 10}]}
+
+
+class BrownoutHANARepository(HANARepository):
+    """Mock repository whose cutoff query hangs once the brownout starts."""
+
+    latency_seconds = 0.0
+
+    @guarded_query("cutoff_calculation")
+    async def get_cutoff_calculation(self, warehouse_id: str) -> dict:
+        await asyncio.sleep(self.latency_seconds)
+        return self._mock_data.get_cutoff_calculation(warehouse_id)
+
+
+async def run(label: str, repo: BrownoutHANARepository, args: argparse.Namespace) -> None:
+    """Load a good snapshot, start the brownout and time concurrent checks."""
+    hana_repository._hana_repository = repo
+    registry = get_threshold_tables()
+    registry.max_age_seconds = 0  # every check reloads the snapshot
+    registry.invalidate()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/api/v1/capacity/check", json=ORDER)  # last-known-good
+        repo.latency_seconds = args.latency
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies: list[float] = []
+        statuses: dict[int, int] = {}
+
+        async def check() -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post("/api/v1/capacity/check", json=ORDER)
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(check() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(
+        f"{label:>10}: p50 {statistics.median(latencies) * 1e3:8.1f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1e3:8.1f} ms  "
+        f"total {elapsed:6.2f} s  statuses {statuses}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=5.0, help="HANA latency (seconds)")
+    parser.add_argument("--timeout", type=float, default=0.5, help="Per-query timeout (seconds)")
+    args = parser.parse_args()
+
+    breaker = BrownoutHANARepository()
+    breaker.query_timeout_seconds = args.timeout
+    asyncio.run(run("breaker", breaker, args))
+
+    unbounded = BrownoutHANARepository()
+    unbounded.query_timeout_seconds = None
+    unbounded.breaker.failure_threshold = args.requests + 1
+    asyncio.run(run("unbounded", unbounded, args))
+
+
+if __name__ == "__main__":
+    main()
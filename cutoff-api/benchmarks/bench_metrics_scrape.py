@@ -0,0 +1,112 @@
+"""
+Benchmark /metrics scrape cost in Prometheus multi-process mode.
+
+Starts N worker processes that each record a realistic spread of label
+values into a shared PROMETHEUS_MULTIPROC_DIR and exit, then times scrapes
+of the aggregated registry (what /metrics does per request) against a
+single-process scrape of one worker's metrics.
+
+    cd cutoff-api && PYTHONPATH=. python benchmarks/bench_metrics_scrape.py --workers 16
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# One worker's traffic: a few endpoints, statuses, warehouses and resources
+_RECORD = """
+from app.core import metrics
+
+for endpoint in ("/api/v1/capacity/check", "/api/v1/cutoff/current", "/api/v1/status",
+                 "/api/v1/health", "/api/v1/ready", "/api/v1/simulate"):
+    for status in (200, 422, 503):
+        metrics.http_requests_total.labels("POST", endpoint, status).inc()
+        metrics.http_request_duration_seconds.labels("POST", endpoint).observe(0.02)
+metrics.request_parse_duration_seconds.labels("/capacity/check").observe(0.001)
+for decision in ("approved", "rejected"):
+    for priority in ("STANDARD", "EXPRESS", "VIP"):
+        metrics.capacity_checks_total.labels(decision, priority).inc()
+for warehouse in ("WH-MAIN", "WH-NORTH"):
+    metrics.warehouse_utilization.labels(warehouse).set(0.7)
+    metrics.cutoff_time_remaining_minutes.labels(warehouse).set(120)
+    for resource in ("PICKER", "PACKER", "LOADER"):
+        metrics.warehouse_capacity.labels(warehouse, resource).set(10)
+metrics.db_connection_pool_size.labels("hana").set(10)
+metrics.initialize_metrics("Cutoff Time API", "1.0.0", "bench")
+{scrape}
+"""
+
+_SCRAPE_SINGLE = """
+import time
+from prometheus_client import REGISTRY, generate_latest
+started = time.perf_counter()
+for _ in range({iterations}):
+    body = generate_latest(REGISTRY)
+print((time.perf_counter() - started) / {iterations}, len(body))
+"""
+
+
+def run_worker(env: dict[str, str], scrape: str = "") -> str:
+    """Run one worker process and return its stdout."""
+    result = subprocess.run(
+        [sys.executable, "-c", _RECORD.format(scrape=scrape)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    base_env = {
+        **os.environ,
+        "HANA_HOST": "bench",
+        "HANA_USER": "bench",
+        "HANA_PASSWORD": "bench",
+        "LOG_LEVEL": "WARNING",
+    }
+
+    single = run_worker(base_env, _SCRAPE_SINGLE.format(iterations=args.iterations))
+    seconds, size = single.split()
+    print(f"single process : {float(seconds) * 1e3:7.3f} ms/scrape  {int(size):7d} B")
+
+    with tempfile.TemporaryDirectory() as metrics_dir:
+        env = {**base_env, "PROMETHEUS_MULTIPROC_DIR": metrics_dir}
+        with multiprocessing.Pool(min(args.workers, os.cpu_count() or 1)) as pool:
+            pool.starmap(run_worker, [(env,)] * args.workers)
+        files = list(Path(metrics_dir).glob("*.db"))
+        size_on_disk = sum(path.stat().st_size for path in files)
+
+        # Scrape in this process, as the /metrics app of one worker would
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+        from prometheus_client import CollectorRegistry, generate_latest, multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        timings = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            body = generate_latest(registry)
+            timings.append(time.perf_counter() - started)
+
+    print(
+        f"{args.workers:2d} workers     : {statistics.median(timings) * 1e3:7.3f} ms/scrape "
+        f"(p95 {sorted(timings)[int(len(timings) * 0.95)] * 1e3:.3f} ms)  {len(body):7d} B  "
+        f"{len(files)} files, {size_on_disk / 1024:.0f} KiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
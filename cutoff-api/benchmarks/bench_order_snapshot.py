@@ -0,0 +1,105 @@
+"""
+Benchmark rebuilding warehouse order state: row dicts vs a Parquet snapshot.
+
+Writes a synthetic V_ORDER_WORKLOAD export, then times seeding the event
+ingestor's warehouse state (a) from a list of row dictionaries, as
+get_orders_by_status returns them, and (b) from the columnar snapshot read
+from Parquet.
+
+    cd cutoff-api && PYTHONPATH=. python benchmarks/bench_order_snapshot.py --lines 500000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.models.domain import OrderStatus
+from app.repositories.order_workload_snapshot import OrderWorkloadSnapshot
+from app.services.event_ingestion import EventIngestor, WarehouseEventState
+
+STATUSES = [status.value for status in OrderStatus]
+
+
+def write_export(path: Path, lines: int, warehouses: int, lines_per_order: int) -> None:
+    """Write a synthetic export with several lines per order."""
+    rng = random.Random(42)
+    orders = lines // lines_per_order
+    order_status = [rng.choice(STATUSES) for _ in range(orders)]
+    order_ids = [i // lines_per_order for i in range(lines)]
+    table = pa.table(
+        {
+            "warehouse_id": [f"WH{order % warehouses:03d}" for order in order_ids],
+            "order_id": [f"SO-{order:08d}" for order in order_ids],
+            "item_workload": [rng.uniform(0.5, 20.0) for _ in range(lines)],
+            "status": [order_status[order] for order in order_ids],
+        }
+    )
+    pq.write_table(table, path)
+
+
+def seed_from_rows(rows: list[dict]) -> dict[str, WarehouseEventState]:
+    """Row-by-row rebuild: one dict per line, accumulated per order."""
+    workloads: dict[tuple[str, str], float] = {}
+    statuses: dict[tuple[str, str], OrderStatus] = {}
+    for row in rows:
+        key = (row["warehouse_id"], row["order_id"])
+        workloads[key] = workloads.get(key, 0.0) + row["item_workload"]
+        statuses[key] = OrderStatus(row["status"])
+    warehouses: dict[str, WarehouseEventState] = {}
+    for (warehouse_id, order_id), workload in workloads.items():
+        state = warehouses.setdefault(warehouse_id, WarehouseEventState())
+        state.upsert(order_id, workload, statuses[(warehouse_id, order_id)])
+    return warehouses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=500_000)
+    parser.add_argument("--warehouses", type=int, default=50)
+    parser.add_argument("--lines-per-order", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "order_workload.parquet"
+        write_export(path, args.lines, args.warehouses, args.lines_per_order)
+
+        # Rows as a row-oriented query returns them (stands in for the driver)
+        started = time.perf_counter()
+        rows = pq.read_table(path).to_pylist()
+        rows_seconds = time.perf_counter() - started
+        warehouses = seed_from_rows(rows)
+        row_seconds = time.perf_counter() - started
+        del rows
+
+        ingestor = EventIngestor(stream="bench")
+        started = time.perf_counter()
+        snapshot = OrderWorkloadSnapshot.from_parquet(path)
+        loaded_seconds = time.perf_counter() - started
+        totals = snapshot.remaining_workload_by_warehouse()
+        aggregated_seconds = time.perf_counter() - started
+        ingestor.load_snapshot(snapshot)
+        seeded_seconds = time.perf_counter() - started
+
+    orders = sum(len(state.orders) for state in ingestor.warehouses.values())
+    assert orders == sum(len(state.orders) for state in warehouses.values())
+    assert abs(sum(totals.values()) - sum(s.remaining_workload for s in warehouses.values())) < 1
+    print(f"lines={args.lines} orders={orders} warehouses={len(totals)}")
+    print(
+        f"  row dicts:        rows {rows_seconds * 1000:8.1f}ms, "
+        f"seed {(row_seconds - rows_seconds) * 1000:.1f}ms, total {row_seconds * 1000:.1f}ms"
+    )
+    print(
+        f"  parquet snapshot: read {loaded_seconds * 1000:8.1f}ms, "
+        f"warehouse totals {(aggregated_seconds - loaded_seconds) * 1000:.1f}ms, "
+        f"seed {(seeded_seconds - aggregated_seconds) * 1000:.1f}ms, "
+        f"total {seeded_seconds * 1000:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
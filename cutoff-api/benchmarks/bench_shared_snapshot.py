@@ -0,0 +1,110 @@
+"""
+Benchmark shared snapshot reads across processes while a publisher writes.
+
+One process republishes all warehouses in a tight loop (every entry of a
+publish carries the same workload, so a torn read is detectable) while
+reader processes read the snapshot. Reports reads per second, seqlock
+retries and torn reads (must be 0), plus the cost of a read when nothing
+changed.
+
+    cd cutoff-api && PYTHONPATH=. python benchmarks/bench_shared_snapshot.py --readers 4
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+from app.models.domain import ResourceType
+from app.services.shared_snapshot import SharedSnapshot, WarehouseSnapshot
+
+
+def entries(warehouses: int, generation: int) -> list[WarehouseSnapshot]:
+    """One publish: every warehouse carries the generation as its workload."""
+    return [
+        WarehouseSnapshot(
+            warehouse_id=f"WH{index:03d}",
+            current_workload=float(generation),
+            capacity=400.0,
+            current_utilization=generation / 400.0,
+            bottleneck_resource=ResourceType.PACKER,
+            snapshot_version=f"gen-{generation}",
+            loaded_at=time.monotonic(),
+        )
+        for index in range(warehouses)
+    ]
+
+
+def publish(path: str, warehouses: int, seconds: float, result) -> None:
+    """Republish as fast as possible."""
+    snapshot = SharedSnapshot(path, max_warehouses=warehouses)
+    deadline = time.monotonic() + seconds
+    generation = 0
+    while time.monotonic() < deadline:
+        generation += 1
+        snapshot.write(entries(warehouses, generation))
+    result.put(("publishes", generation))
+
+
+def read(path: str, warehouses: int, seconds: float, result) -> None:
+    """Read continuously and check every view is from a single publish."""
+    snapshot = SharedSnapshot(path, max_warehouses=warehouses)
+    deadline = time.monotonic() + seconds
+    reads = torn = 0
+    while time.monotonic() < deadline:
+        view = snapshot.read()
+        reads += 1
+        if len({entry.current_workload for entry in view.values()}) > 1:
+            torn += 1
+    result.put(("reads", reads, torn))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--warehouses", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "snapshot")
+        snapshot = SharedSnapshot(path, max_warehouses=args.warehouses)
+        snapshot.write(entries(args.warehouses, 0))
+
+        context = multiprocessing.get_context("fork")
+        result = context.Queue()
+        processes = [
+            context.Process(target=publish, args=(path, args.warehouses, args.seconds, result))
+        ] + [
+            context.Process(target=read, args=(path, args.warehouses, args.seconds, result))
+            for _ in range(args.readers)
+        ]
+        for process in processes:
+            process.start()
+        outcomes = [result.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        publishes = next(outcome[1] for outcome in outcomes if outcome[0] == "publishes")
+        reads = sum(outcome[1] for outcome in outcomes if outcome[0] == "reads")
+        torn = sum(outcome[2] for outcome in outcomes if outcome[0] == "reads")
+        print(
+            f"warehouses={args.warehouses} readers={args.readers}: "
+            f"{publishes / args.seconds:,.0f} publishes/s, "
+            f"{reads / args.seconds:,.0f} reads/s under contention, torn reads={torn}"
+        )
+
+        snapshot.read()
+        count = 100_000
+        unchanged = timeit.timeit(snapshot.read, number=count) / count
+        lookup = timeit.timeit(lambda: snapshot.get("WH000"), number=count) / count
+        print(
+            f"unchanged snapshot: read {unchanged * 1e9:.0f}ns, "
+            f"get one warehouse {lookup * 1e9:.0f}ns"
+        )
+
+
+if __name__ == "__main__":
+    main()
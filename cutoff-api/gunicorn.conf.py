@@ -0,0 +1,36 @@
+"""
+Gunicorn configuration for multi-worker deployments.
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+Workers share Prometheus metrics through PROMETHEUS_MULTIPROC_DIR (default
+/tmp/cutoff-api-metrics), which is emptied when the master starts so values
+of a previous run are not reported again.
+"""
+
+import os
+import shutil
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+graceful_timeout = 30
+
+# Must be set before prometheus_client is imported (here or in a worker)
+metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/cutoff-api-metrics")
+
+
+def on_starting(server):
+    """Start from an empty metrics directory."""
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drop live gauges of an exited (or crashed) worker and archive its counters."""
+    from prometheus_client import multiprocess
+
+    from app.core.metrics import compact_worker_files
+
+    multiprocess.mark_process_dead(worker.pid)
+    compact_worker_files(worker.pid, metrics_dir)
@@ -0,0 +1,210 @@
+"""
+Integration tests for the capacity check endpoint.
+"""
+
+import time
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.config import get_settings
+from app.core.load_shedding import AdmissionController
+from app.core.rate_limit import get_rate_limiter
+from app.repositories.hana_repository import get_hana_repository
+from app.services.threshold_table import get_threshold_tables
+
+ORDER = {
+    "warehouse_id": "WH-MAIN",
+    "priority": "STANDARD",
+    "items": [{"product_id": "MAT-001", "quantity": 10}],
+}
+
+
+def test_capacity_check_omits_factors_by_default(client):
+    """Test that decision factors are only computed on request."""
+    response = client.post("/api/v1/capacity/check", json=ORDER)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["decision_factors"] is None
+    assert isinstance(body["can_ship_today"], bool)
+
+
+def test_capacity_check_with_factors(client):
+    """Test that ?factors=true returns the full decision factors."""
+    response = client.post("/api/v1/capacity/check?factors=true", json=ORDER)
+    assert response.status_code == 200
+    factors = response.json()["decision_factors"]
+    assert float(factors["workload_impact"]) > 0
+    assert factors["bottleneck_resource"]
+
+
+def test_capacity_check_reuses_threshold_table(client):
+    """Test that the second check is served from the warehouse's threshold table."""
+    client.post("/api/v1/capacity/check", json=ORDER)
+    response = client.post("/api/v1/capacity/check", json=ORDER)
+    assert response.json()["metadata"]["cache_hit"] is True
+
+
+def test_capacity_check_reports_stage_timings(client):
+    """Test that stage spans are sent as Server-Timing with sub-millisecond resolution."""
+
+    def stages(response):
+        header = response.headers["Server-Timing"]
+        return {
+            name: float(duration.removeprefix("dur="))
+            for name, duration in (metric.split(";") for metric in header.split(", "))
+        }
+
+    get_threshold_tables().invalidate("WH-MAIN")
+    miss = client.post("/api/v1/capacity/check", json=ORDER)
+    hit = client.post("/api/v1/capacity/check", json=ORDER)
+
+    assert {"parse", "workload", "cache_lookup", "hana", "cache_store", "decision"} <= set(
+        stages(miss)
+    )
+    assert {"parse", "workload", "cache_lookup", "decision", "serialize", "total"} <= set(
+        stages(hit)
+    )
+    assert "hana" not in stages(hit)
+    assert 0 < stages(hit)["workload"] < stages(hit)["total"]
+    assert isinstance(hit.json()["metadata"]["calculation_time_ms"], float)
+
+
+def test_metrics_labelled_by_route_template(client):
+    """Test that metric labels use route templates, not raw paths."""
+
+    def requests(method, endpoint, status):
+        labels = {"method": method, "endpoint": endpoint, "status": status}
+        return REGISTRY.get_sample_value("cutoff_api_requests_total", labels) or 0.0
+
+    template = "/api/v1/demo/scenario/{scenario_name}"
+    before = (
+        requests("POST", template, "200"),
+        requests("GET", "unmatched", "404"),
+        requests("GET", "/static", "200"),
+    )
+
+    client.post("/api/v1/demo/scenario/no-such-scenario")
+    assert client.get("/api/v1/no-such-path/12345").status_code == 404
+    client.get("/static/demo.html")
+
+    assert requests("POST", template, "200") == before[0] + 1
+    assert requests("GET", "unmatched", "404") == before[1] + 1
+    assert requests("GET", "/static", "200") == before[2] + 1
+    assert requests("GET", "/api/v1/no-such-path/12345", "404") == 0.0
+
+
+def test_capacity_check_accepts_max_items(client):
+    """Test that a 1000-item order is parsed by the bulk parser."""
+    order = {"items": [{"product_id": f"MAT-{i}", "quantity": 1} for i in range(1000)]}
+    response = client.post("/api/v1/capacity/check?factors=true", json=order)
+    assert response.status_code == 200
+    assert float(response.json()["decision_factors"]["workload_impact"]) == 1006.5
+
+
+def test_capacity_check_validation_errors_unchanged(client):
+    """Test that rejected bodies report the same errors as a model body parameter."""
+    response = client.post(
+        "/api/v1/capacity/check",
+        json={"items": [{"product_id": "MAT-001", "quantity": 0, "weight_factor": 5}]},
+    )
+    assert response.status_code == 422
+    assert [(e["type"], e["loc"]) for e in response.json()["detail"]] == [
+        ("greater_than", ["body", "items", 0, "quantity"]),
+        ("less_than_equal", ["body", "items", 0, "weight_factor"]),
+    ]
+
+    response = client.post(
+        "/api/v1/capacity/check",
+        content=b'{"items": [',
+        headers={"content-type": "application/json"},
+    )
+    assert response.json()["detail"][0]["type"] == "json_invalid"
+    assert response.json()["detail"][0]["loc"] == ["body", 11]
+
+    missing = [{"type": "missing", "loc": ["body"], "msg": "Field required", "input": None}]
+    response = client.post("/api/v1/capacity/check")
+    assert response.json()["detail"] == missing
+
+    response = client.post(
+        "/api/v1/capacity/check", content=b"null", headers={"content-type": "application/json"}
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"] == missing
+
+
+def test_capacity_check_falls_back_to_last_known_good(client, monkeypatch):
+    """Test that a HANA outage is bridged with the last snapshot, flagged as stale."""
+    fresh = client.post("/api/v1/capacity/check?factors=true", json=ORDER).json()
+    assert fresh["decision_factors"]["snapshot_stale"] is False
+
+    async def unavailable(warehouse_id):
+        raise ConnectionError("HANA down")
+
+    monkeypatch.setattr(get_hana_repository(), "get_cutoff_calculation", unavailable)
+    get_threshold_tables().invalidate()
+
+    response = client.post("/api/v1/capacity/check?factors=true", json=ORDER)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["decision_factors"]["snapshot_stale"] is True
+    assert body["decision_factors"]["snapshot_age_seconds"] >= 0
+    assert float(body["confidence"]) <= float(fresh["confidence"]) * 0.5 + 1e-9
+
+    # No snapshot to fall back to: fail instead of assuming an empty warehouse
+    response = client.post("/api/v1/capacity/check", json={**ORDER, "warehouse_id": "WH-NEW"})
+    assert response.status_code == 503
+
+
+def test_rate_limit_returns_429_with_retry_after(client, monkeypatch):
+    """Test that exceeding the capacity check limit returns 429 in the error format."""
+    # Frozen clock: no emission interval elapses between requests
+    limiter = get_rate_limiter()
+    now = time.monotonic()
+    monkeypatch.setattr(limiter, "clock", lambda: now)
+    monkeypatch.setattr(limiter, "_buckets", {})
+    limit = get_settings().rate_limit_capacity_check
+
+    for _ in range(limit):
+        response = client.post("/api/v1/capacity/check", json=ORDER)
+        assert response.status_code == 200
+
+    response = client.post("/api/v1/capacity/check", json=ORDER)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.json() == {
+        "error": "RATE_LIMIT_EXCEEDED",
+        "message": "Too many requests",
+        "retry_after_seconds": int(response.headers["Retry-After"]),
+        "limit": f"{limit} requests per minute",
+    }
+
+    # An unverified token does not buy a fresh bucket
+    headers = {"Authorization": "Bearer made-up"}
+    response = client.post("/api/v1/capacity/check", json=ORDER, headers=headers)
+    assert response.status_code == 429
+
+    # Other clients are unaffected
+    other = TestClient(client.app, client=("10.0.0.2", 50000))
+    assert other.post("/api/v1/capacity/check", json=ORDER).status_code == 200
+
+
+def test_overload_sheds_standard_but_admits_vip(client, monkeypatch):
+    """Test that under event-loop lag STANDARD checks get 503 while VIP checks pass."""
+    controller = AdmissionController({}, lag_threshold_seconds=0.1)
+    controller.lag_seconds = 0.3
+    monkeypatch.setattr(
+        "app.api.v1.endpoints.capacity.get_admission_controller", lambda: controller
+    )
+
+    response = client.post("/api/v1/capacity/check", json=ORDER)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.json() == {
+        "error": "SERVICE_OVERLOADED",
+        "message": "Service is overloaded",
+        "retry_after_seconds": 1,
+    }
+
+    response = client.post("/api/v1/capacity/check", json={**ORDER, "priority": "VIP"})
+    assert response.status_code == 200
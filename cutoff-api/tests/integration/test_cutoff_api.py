@@ -0,0 +1,31 @@
+"""
+Integration tests for the cutoff endpoints.
+"""
+
+
+def test_current_cutoff_reports_warehouse(client):
+    """Test single-warehouse cutoff."""
+    response = client.get("/api/v1/cutoff/current", params={"warehouse_id": "WH-NORTH"})
+    assert response.status_code == 200
+    assert response.json()["warehouse_id"] == "WH-NORTH"
+
+
+def test_fleet_cutoff_all_warehouses(client):
+    """Test that /cutoff/all covers every configured warehouse."""
+    response = client.get("/api/v1/cutoff/all")
+    assert response.status_code == 200
+    ids = [wh["warehouse_id"] for wh in response.json()["warehouses"]]
+    assert ids == ["WH-MAIN", "WH-NORTH"]
+
+
+def test_fleet_cutoff_filtered(client):
+    """Test filtering the fleet by warehouse_id."""
+    response = client.get("/api/v1/cutoff/all", params={"warehouse_id": ["WH-NORTH"]})
+    assert response.status_code == 200
+    assert [wh["warehouse_id"] for wh in response.json()["warehouses"]] == ["WH-NORTH"]
+
+
+def test_fleet_cutoff_unknown_warehouse(client):
+    """Test that unknown warehouses are rejected."""
+    response = client.get("/api/v1/cutoff/all", params={"warehouse_id": ["WH-NOPE"]})
+    assert response.status_code == 404
@@ -0,0 +1,98 @@
+"""
+Integration tests for startup warm-up, readiness and health endpoints.
+"""
+
+import asyncio
+import time
+
+from app.config import get_settings
+from app.services.health_prober import HealthProber
+from app.services.threshold_table import get_threshold_tables
+from app.warmup import Warmup
+
+
+async def test_warmup_loads_snapshots():
+    """Test that warm-up publishes a threshold table for every warehouse."""
+    warmup = Warmup()
+    await warmup.start()
+    await warmup._task
+
+    assert warmup.ready
+    assert warmup.duration_seconds is not None
+    assert get_threshold_tables().get("WH-MAIN") is not None
+    assert get_threshold_tables().get("WH-NORTH") is not None
+
+
+def test_ready_reports_warmup_state(client, monkeypatch):
+    """Test that /ready is 503 until warm-up has finished."""
+    warmup = Warmup()
+    monkeypatch.setattr("app.api.v1.endpoints.health.get_warmup", lambda: warmup)
+
+    response = client.get("/api/v1/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming_up"
+
+    warmup.ready = True
+    warmup.duration_seconds = 0.25
+    response = client.get("/api/v1/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "warmup_seconds": 0.25}
+
+
+def test_lifespan_starts_warmup(client, monkeypatch):
+    """Test that the instance turns ready once lifespan warm-up finishes."""
+    monkeypatch.setattr(get_settings(), "audit_enabled", False)
+    with client:
+        for _ in range(250):
+            response = client.get("/api/v1/ready")
+            if response.status_code == 200:
+                break
+            time.sleep(0.02)
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+
+def test_health_serves_cached_probe_results(client, monkeypatch):
+    """Test that /health reports the prober's latest results without probing."""
+    probe_calls = []
+
+    async def probe():
+        probe_calls.append(1)
+
+    prober = HealthProber({"hana": probe, "redis": probe})
+    monkeypatch.setattr("app.api.v1.endpoints.health.get_health_prober", lambda: prober)
+
+    response = client.get("/api/v1/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "degraded"
+    assert response.json()["checks"] == {"hana": "unknown", "redis": "unknown", "api": "ok"}
+    assert probe_calls == []
+
+    asyncio.run(prober.probe_all())
+    response = client.get("/api/v1/health")
+    body = response.json()
+    assert body["status"] == "healthy"
+    assert body["components"]["hana"]["latency_ms"] is not None
+    assert body["components"]["redis"]["last_success"] is not None
+    assert len(probe_calls) == 2
+
+
+def test_health_unhealthy_when_component_down(client, monkeypatch):
+    """Test that /health returns 503 once a dependency is down."""
+
+    async def failing():
+        raise ConnectionError("connection refused")
+
+    async def ok():
+        return None
+
+    prober = HealthProber({"hana": ok, "redis": failing})
+    asyncio.run(prober.probe_all())
+    monkeypatch.setattr("app.api.v1.endpoints.health.get_health_prober", lambda: prober)
+
+    response = client.get("/api/v1/health")
+    assert response.status_code == 503
+    body = response.json()
+    assert body["status"] == "unhealthy"
+    assert body["checks"]["redis"] == "down"
+    assert body["components"]["redis"]["last_error"] == "connection refused"
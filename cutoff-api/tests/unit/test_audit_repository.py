@@ -0,0 +1,207 @@
+"""
+Unit tests for the decision audit log.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.models.domain import Priority
+from app.repositories.audit_repository import (
+    AuditRepository,
+    read_audit_log,
+    recover_orphaned_segments,
+)
+from app.services.capacity_service import CapacityService
+from app.services.decision_engine import DecisionEngine
+from app.services.threshold_table import TableDecision, ThresholdTable
+from app.services.workload_calculator import WorkloadCalculator
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def decision():
+    """A decision of a warehouse threshold table."""
+    engine = DecisionEngine(
+        WorkloadCalculator(), CapacityService(), clock=lambda: datetime(2024, 1, 15, 9, 0)
+    )
+    table = ThresholdTable(
+        engine,
+        warehouse_id="WH-MAIN",
+        current_workload=Decimal("100.0"),
+        capacity=Decimal("200.0"),
+        bottleneck_resource="PACKER",
+        snapshot_version="2024-01-15T09:00:00",
+    )
+    return table.decide(Decimal("10.0"))
+
+
+def _record(repo, decision, count):
+    for i in range(count):
+        repo.record(
+            decision,
+            warehouse_id="WH-MAIN",
+            priority=Priority.STANDARD,
+            new_workload=10.0,
+            current_workload=100.0,
+            capacity=200.0,
+            order_id=f"SO-{i}",
+            snapshot_version="2024-01-15T09:00:00",
+        )
+
+
+async def test_flush_and_read_back(tmp_path, decision):
+    """Test that flushed records are readable after the segment is closed."""
+    repo = AuditRepository(directory=tmp_path)
+    await repo.start()
+    _record(repo, decision, 3)
+    await repo.stop()
+
+    table = read_audit_log(tmp_path)
+    assert table.num_rows == 3
+    assert table.column("order_id").to_pylist() == ["SO-0", "SO-1", "SO-2"]
+    assert table.column("can_ship_today").to_pylist() == [True, True, True]
+
+
+async def test_factors_derived_when_read(tmp_path, decision, monkeypatch):
+    """Test that recording skips the decision factors and reading derives them."""
+    expected = decision.factors()
+
+    def no_factors(self):
+        raise AssertionError("factors must not be built on the request path")
+
+    monkeypatch.setattr(TableDecision, "factors", no_factors)
+    repo = AuditRepository(directory=tmp_path)
+    await repo.start()
+    _record(repo, decision, 1)
+    await repo.stop()
+
+    row = read_audit_log(tmp_path).to_pylist()[0]
+    assert row["status"] == decision.status.value
+    assert row["utilization"] == float(decision.current_utilization)
+    assert row["congestion_factor"] == pytest.approx(float(expected.congestion_factor))
+    assert row["bottleneck_resource"] == "PACKER"
+    assert row["snapshot_stale"] is False
+
+
+async def test_segments_rotate(tmp_path, decision):
+    """Test rotation once a segment reaches its row limit."""
+    repo = AuditRepository(directory=tmp_path, segment_max_rows=1000)
+    _record(repo, decision, 1000)
+    await repo.flush()
+    _record(repo, decision, 10)
+    await repo.flush()
+
+    # First segment is complete, second is still in progress
+    assert len(list(tmp_path.glob("*.arrow"))) == 1
+    assert len(list(tmp_path.glob("*.arrow.tmp"))) == 1
+    assert read_audit_log(tmp_path).num_rows == 1000
+
+
+def test_record_drops_when_buffer_full(tmp_path, decision):
+    """Test that a full buffer drops records instead of growing."""
+    repo = AuditRepository(directory=tmp_path, buffer_size=1000)
+    _record(repo, decision, 1000)
+    assert (
+        repo.record(
+            decision,
+            warehouse_id="WH-MAIN",
+            priority=Priority.STANDARD,
+            new_workload=10.0,
+            current_workload=100.0,
+            capacity=200.0,
+        )
+        is False
+    )
+
+
+async def test_segment_names_are_unique_per_process(tmp_path, decision):
+    """Test that workers starting in the same second never share a segment file."""
+    repo = AuditRepository(directory=tmp_path)
+    _record(repo, decision, 1)
+    await repo.flush()
+
+    (segment,) = tmp_path.glob("*.arrow.tmp")
+    assert f"-{os.getpid()}-" in segment.name
+
+
+async def test_segments_rotate_by_age(tmp_path, decision):
+    """Test that a quiet segment is finalized once it is old enough."""
+    repo = AuditRepository(directory=tmp_path, segment_max_age_seconds=0.05)
+    _record(repo, decision, 5)
+    await repo.flush()
+    assert read_audit_log(tmp_path).num_rows == 0
+
+    time.sleep(0.06)
+    await repo.flush()
+
+    assert read_audit_log(tmp_path).num_rows == 5
+    assert not list(tmp_path.glob("*.arrow.tmp"))
+
+
+async def test_stop_waits_for_in_flight_flush(tmp_path, decision):
+    """Test that stop never writes through the segment while a flush thread does."""
+    repo = AuditRepository(directory=tmp_path)
+    write_batch = repo._write_batch
+    active = []
+    overlaps = []
+    lock = threading.Lock()
+
+    def slow_write_batch(rows):
+        with lock:
+            active.append(1)
+            overlaps.append(len(active))
+        time.sleep(0.05)
+        write_batch(rows)
+        with lock:
+            active.pop()
+
+    repo._write_batch = slow_write_batch
+    await repo.start()
+    _record(repo, decision, 3)
+    flushing = asyncio.create_task(repo.flush())
+    await asyncio.sleep(0.01)
+    _record(repo, decision, 2)
+    await repo.stop()
+    await flushing
+
+    assert max(overlaps) == 1
+    assert read_audit_log(tmp_path).num_rows == 5
+
+
+async def test_crashed_segment_is_recovered_on_start(tmp_path, decision):
+    """Test that an unfinished segment of a dead writer becomes readable."""
+    crashed = AuditRepository(directory=tmp_path)
+    _record(crashed, decision, 3)
+    await crashed.flush()
+    _record(crashed, decision, 2)
+    await crashed.flush()
+    # Simulate the worker dying: the footer is never written and the lock is released
+    os.close(crashed._segment_lock_fd)
+    (tmp_path / "decisions-20240115T090000-1-0000.arrow.tmp").write_bytes(b"not arrow")
+
+    repo = AuditRepository(directory=tmp_path)
+    await repo.start()
+    await repo.stop()
+
+    assert read_audit_log(tmp_path).num_rows == 5
+    assert [path.name for path in tmp_path.glob("*.orphaned")] == [
+        "decisions-20240115T090000-1-0000.arrow.orphaned"
+    ]
+    assert not list(tmp_path.glob("*.arrow.tmp"))
+
+
+async def test_live_segment_is_not_recovered(tmp_path, decision):
+    """Test that a segment another worker is still writing is left alone."""
+    live = AuditRepository(directory=tmp_path)
+    _record(live, decision, 3)
+    await live.flush()
+
+    assert recover_orphaned_segments(tmp_path) == 0
+    assert len(list(tmp_path.glob("*.arrow.tmp"))) == 1
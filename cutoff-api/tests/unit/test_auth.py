@@ -0,0 +1,101 @@
+"""
+Unit tests for JWT authentication and the verified-token cache.
+"""
+
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core import auth
+from app.core.auth import (
+    User,
+    VerifiedTokenCache,
+    create_access_token,
+    get_current_user,
+    require_read_scope,
+    require_write_scope,
+)
+
+
+@pytest.fixture(autouse=True)
+def token_cache(monkeypatch):
+    """Fresh verified-token cache per test."""
+    cache = VerifiedTokenCache(max_size=2)
+    monkeypatch.setattr(auth, "_token_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """Count full token verifications."""
+    calls = []
+    decode = auth.decode_access_token
+
+    def counting_decode(token, key=None):
+        calls.append(token)
+        return decode(token, key)
+
+    monkeypatch.setattr(auth, "decode_access_token", counting_decode)
+    return calls
+
+
+def _credentials(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+async def test_verified_token_is_served_from_cache(decode_calls):
+    """Test that a reused token is verified once."""
+    token = create_access_token({"sub": "erp-service", "scopes": ["cutoff.read"]})
+
+    first = await get_current_user(_credentials(token))
+    second = await get_current_user(_credentials(token))
+
+    assert second is first
+    assert second.username == "erp-service"
+    assert len(decode_calls) == 1
+
+
+async def test_expired_token_is_not_served_from_cache(token_cache):
+    """Test that cached entries expire with the token."""
+    user = User(username="erp-service")
+    token_cache.put("token", user, expires_at=time.time() - 1)
+
+    assert token_cache.get("token") is None
+    assert len(token_cache) == 0
+
+
+async def test_invalid_token_is_rejected_and_not_cached(token_cache):
+    """Test that tokens failing verification raise 401 and stay uncached."""
+    token = create_access_token({"sub": "erp-service"}, expires_delta=timedelta(minutes=-1))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(_credentials(token))
+
+    assert exc_info.value.status_code == 401
+    assert len(token_cache) == 0
+
+
+def test_cache_evicts_least_recently_used(token_cache):
+    """Test that the cache is bounded and keeps recently used tokens."""
+    expires_at = time.time() + 60
+    for name in ("a", "b"):
+        token_cache.put(name, User(username=name), expires_at)
+    token_cache.get("a")
+    token_cache.put("c", User(username="c"), expires_at)
+
+    assert token_cache.get("b") is None
+    assert token_cache.get("a").username == "a"
+    assert token_cache.get("c").username == "c"
+
+
+async def test_scope_dependencies_enforce_scopes():
+    """Test that scope dependencies admit granted scopes and reject others with 403."""
+    user = User(username="erp-service", scopes=["cutoff.read"])
+
+    assert await require_read_scope(user) is user
+    with pytest.raises(HTTPException) as exc_info:
+        await require_write_scope(user)
+    assert exc_info.value.status_code == 403
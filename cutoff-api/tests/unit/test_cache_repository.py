@@ -0,0 +1,73 @@
+"""
+Unit tests for cache keys and Redis-backed counters.
+"""
+
+import pytest
+
+from app.core.cache import CacheClient
+from app.repositories import cache_repository
+from app.repositories.cache_repository import CacheRepository
+
+
+class InMemoryCache(CacheClient):
+    """CacheClient backed by a dict instead of Redis."""
+
+    def __init__(self):
+        super().__init__()
+        self.store = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def get_many(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    async def increment(self, key, amount=1):
+        self.store[key] = str(int(self.store.get(key, 0)) + amount)
+        return int(self.store[key])
+
+    async def expire(self, key, ttl):
+        self.ttls[key] = ttl
+        return True
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """In-memory cache wired into the repository."""
+    client = InMemoryCache()
+    monkeypatch.setattr(cache_repository, "get_cache", lambda: client)
+    return client
+
+
+def test_generate_key_is_128_bit():
+    """Test that keys carry a 32-hex-digit digest."""
+    key = CacheClient().generate_key("capacity", a=1)
+    assert len(key.split(":")[1]) == 32
+
+
+async def test_rate_limit_counter_expires_from_first_hit(cache):
+    """Test that the window TTL is set once, on the first increment."""
+    repo = CacheRepository()
+    assert await repo.increment_rate_limit("user-1", "/capacity/check", window_seconds=60) == 1
+    cache.ttls.clear()
+    assert await repo.increment_rate_limit("user-1", "/capacity/check", window_seconds=60) == 2
+    assert cache.ttls == {}
+    assert await repo.get_rate_limit_count("user-1", "/capacity/check") == 2
+    assert await repo.get_rate_limit_count("user-2", "/capacity/check") == 0
+
+
+async def test_invalidation_advances_warehouse_epoch(cache):
+    """Test that invalidation is one counter bump read back by every worker."""
+    repo = CacheRepository()
+    assert await repo.get_warehouse_epochs(["WH-MAIN", "WH-NORTH"]) == {
+        "WH-MAIN": 0,
+        "WH-NORTH": 0,
+    }
+    assert await repo.invalidate_warehouse_cache("WH-MAIN") == 1
+    assert await repo.invalidate_warehouse_cache("WH-MAIN") == 2
+    assert await repo.get_warehouse_epochs(["WH-MAIN", "WH-NORTH"]) == {
+        "WH-MAIN": 2,
+        "WH-NORTH": 0,
+    }
+    assert await repo.get_warehouse_epochs([]) == {}
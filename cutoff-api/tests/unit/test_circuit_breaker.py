@@ -0,0 +1,132 @@
+"""
+Unit tests for the circuit breaker and the HANA repository guard.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.circuit_breaker import BreakerState, CircuitBreaker, CircuitOpenError
+from app.repositories.hana_repository import HANARepository
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _fail():
+    raise ConnectionError("HANA down")
+
+
+async def _ok():
+    return "ok"
+
+
+@pytest.fixture
+def clock():
+    """Fake monotonic clock."""
+    return FakeClock()
+
+
+async def test_breaker_opens_after_threshold(clock):
+    """Test that consecutive failures open the breaker and calls then fail fast."""
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout_seconds=10, clock=clock)
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            await breaker.call(_fail, timeout=1)
+    assert breaker.state == BreakerState.OPEN
+
+    called = False
+
+    async def probe():
+        nonlocal called
+        called = True
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        await breaker.call(probe, timeout=1)
+    assert not called
+    assert exc_info.value.retry_after_seconds == pytest.approx(10)
+
+
+async def test_breaker_half_open_trial(clock):
+    """Test that one trial call decides between closing and reopening."""
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout_seconds=5, clock=clock)
+    with pytest.raises(ConnectionError):
+        await breaker.call(_fail, timeout=1)
+
+    clock.now = 5.0
+    with pytest.raises(ConnectionError):
+        await breaker.call(_fail, timeout=1)
+    assert breaker.state == BreakerState.OPEN
+
+    clock.now = 10.0
+    assert await breaker.call(_ok, timeout=1) == "ok"
+    assert breaker.state == BreakerState.CLOSED
+
+
+async def test_breaker_counts_timeouts(clock):
+    """Test that slow calls are cut off by the timeout and count as failures."""
+    breaker = CircuitBreaker("test", failure_threshold=2, clock=clock)
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    for _ in range(2):
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(slow, timeout=0.01)
+    assert breaker.state == BreakerState.OPEN
+
+
+async def test_hana_queries_go_through_breaker(monkeypatch):
+    """Test that failing HANA queries open the repository's breaker."""
+    repo = HANARepository()
+
+    def fail(warehouse_id):
+        raise ConnectionError("HANA down")
+
+    monkeypatch.setattr(repo._mock_data, "get_cutoff_calculation", fail)
+    for _ in range(repo.breaker.failure_threshold):
+        with pytest.raises(ConnectionError):
+            await repo.get_cutoff_calculation("WH-MAIN")
+
+    with pytest.raises(CircuitOpenError):
+        await repo.get_current_warehouse_capacity("WH-MAIN")
+
+
+async def test_breaker_ignores_errors_of_a_responding_dependency(clock):
+    """Test that only connection errors and timeouts count towards opening."""
+    breaker = CircuitBreaker("test", failure_threshold=1, clock=clock)
+
+    async def bad_query():
+        raise ValueError("invalid column")
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            await breaker.call(bad_query, timeout=1)
+    assert breaker.state == BreakerState.CLOSED
+
+    with pytest.raises(ConnectionError):
+        await breaker.call(_fail, timeout=1)
+    assert breaker.state == BreakerState.OPEN
+
+
+async def test_bulk_load_bypasses_breaker_with_its_own_timeout():
+    """Test that the order snapshot load is not bound by the request timeout or breaker."""
+    pytest.importorskip("pyarrow")
+    repo = HANARepository(mock_latency=lambda endpoint: 0.05)
+    repo.query_timeout_seconds = 0.01
+    repo.breaker.state = BreakerState.OPEN
+    repo.breaker._opened_at = repo.breaker.clock()
+
+    assert await repo.get_order_workload_batches()
+
+    repo.bulk_query_timeout_seconds = 0.01
+    with pytest.raises(asyncio.TimeoutError):
+        await repo.get_order_workload_batches()
@@ -0,0 +1,139 @@
+"""
+Unit tests for time-bucketed decision counters.
+"""
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+
+import pytest
+
+from app.models.domain import Priority
+from app.services import decision_stats
+from app.services.decision_stats import DecisionStatsRecorder
+
+
+class FakePipeline:
+    """Minimal in-memory stand-in for a Redis pipeline."""
+
+    def __init__(self, store):
+        self.store = store
+        self.ops = []
+
+    def hincrby(self, key, field, amount):
+        self.ops.append(("hincrby", key, field, amount))
+
+    def expire(self, key, ttl):
+        self.ops.append(("expire", key))
+
+    def hgetall(self, key):
+        self.ops.append(("hgetall", key))
+
+    async def execute(self):
+        results = []
+        for op in self.ops:
+            if op[0] == "hincrby":
+                self.store[op[1]][op[2]] = str(int(self.store[op[1]].get(op[2], 0)) + op[3])
+            elif op[0] == "hgetall":
+                results.append(dict(self.store.get(op[1], {})))
+        return results
+
+
+class FakeCache:
+    """Cache client exposing a fake Redis."""
+
+    def __init__(self):
+        self.store = defaultdict(dict)
+        self.redis = self
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.store)
+
+
+class SlowWritePipeline(FakePipeline):
+    """Pipeline whose writes wait until released."""
+
+    def __init__(self, store, release):
+        super().__init__(store)
+        self.release = release
+
+    async def execute(self):
+        if any(op[0] == "hincrby" for op in self.ops):
+            await self.release.wait()
+        return await super().execute()
+
+
+@pytest.fixture
+def clock():
+    """Mutable virtual clock."""
+    state = {"now": datetime(2024, 1, 15, 9, 30)}
+    return state
+
+
+@pytest.fixture
+def recorder(clock):
+    """Recorder driven by the virtual clock."""
+    return DecisionStatsRecorder(clock=lambda: clock["now"])
+
+
+def _record_sample(recorder):
+    recorder.record("WH-MAIN", can_ship_today=True, priority=Priority.STANDARD)
+    recorder.record("WH-MAIN", can_ship_today=False, priority=Priority.STANDARD)
+    recorder.record("WH-MAIN", can_ship_today=True, priority=Priority.VIP, vip_override=True)
+    recorder.record("WH-NORTH", can_ship_today=True, priority=Priority.EXPRESS)
+
+
+async def test_stats_from_redis_buckets(monkeypatch, clock, recorder):
+    """Test that flushed buckets across minutes are summed from Redis."""
+    cache = FakeCache()
+    monkeypatch.setattr(decision_stats, "get_cache", lambda: cache)
+
+    _record_sample(recorder)
+    assert await recorder.flush() == 2
+    clock["now"] = datetime(2024, 1, 15, 9, 45)
+    recorder.record("WH-MAIN", can_ship_today=True, priority=Priority.STANDARD)
+    await recorder.flush()
+    # Unflushed counts are included as well
+    recorder.record("WH-MAIN", can_ship_today=False, priority=Priority.EXPRESS)
+
+    stats = await recorder.get_today_stats("WH-MAIN")
+    assert stats["total"] == 5
+    assert stats["approved"] == 3
+    assert stats["rejected"] == 2
+    assert stats["vip_override"] == 1
+    assert stats["STANDARD:approved"] == 2
+    assert stats["EXPRESS:rejected"] == 1
+
+
+async def test_stats_fall_back_to_local_buckets(recorder):
+    """Test local counts are served when Redis is not connected."""
+    _record_sample(recorder)
+    stats = await recorder.get_today_stats("WH-MAIN")
+    assert stats["total"] == 3
+    assert stats["VIP:approved"] == 1
+
+
+async def test_failed_flush_keeps_pending_counts(recorder):
+    """Test that counts survive a failed flush and are retried."""
+    _record_sample(recorder)
+    assert await recorder.flush() == 0
+    assert sum(c["total"] for c in recorder._pending.values()) == 4
+
+
+async def test_stats_include_batch_being_flushed(monkeypatch, recorder):
+    """Test that counts swapped out by an unfinished flush are still reported, once."""
+    cache = FakeCache()
+    release = asyncio.Event()
+    cache.pipeline = lambda transaction=True: SlowWritePipeline(cache.store, release)
+    monkeypatch.setattr(decision_stats, "get_cache", lambda: cache)
+
+    _record_sample(recorder)
+    flushing = asyncio.create_task(recorder.flush())
+    await asyncio.sleep(0)
+    assert not recorder._pending
+    reading = asyncio.create_task(recorder.get_today_stats("WH-MAIN"))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await flushing == 2
+    assert (await reading)["total"] == 3
@@ -0,0 +1,228 @@
+"""
+Unit tests for Redis Stream event ingestion.
+"""
+
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.domain import OrderStatus
+from app.services import event_ingestion, threshold_table
+from app.services.event_ingestion import EventIngestor
+from app.services.threshold_table import ThresholdTableRegistry
+
+
+class StreamDouble:
+    """Minimal stream: XREAD after an id and XREVRANGE of the newest entry."""
+
+    def __init__(self, entries: list[tuple[str, dict[str, str]]]) -> None:
+        self.entries = list(entries)
+        self.reads = 0
+
+    async def xread(self, streams, count=None, block=None):
+        self.reads += 1
+        ((stream, last_id),) = streams.items()
+        batch = [item for item in self.entries if _seq(item[0]) > _seq(last_id)][:count]
+        if not batch:
+            await asyncio.sleep(0)
+        return [[stream, batch]] if batch else []
+
+    async def xrevrange(self, stream, count=None):
+        return self.entries[-1:]
+
+
+def _seq(entry_id: str) -> tuple[int, int]:
+    ms, seq = entry_id.split("-")
+    return int(ms), int(seq)
+
+
+def entry(seq: int, event_type: str, **fields: str) -> tuple[str, dict[str, str]]:
+    return f"1700000000000-{seq}", {"type": event_type, "warehouse_id": "WH001", **fields}
+
+
+ORDER_LINE = {"warehouse_id": "WH-MAIN", "order_id": "O1", "item_workload": 10.0, "status": "NEW"}
+
+
+@pytest.fixture
+def ingestor() -> EventIngestor:
+    return EventIngestor(stream="events", batch_size=3)
+
+
+def test_created_order_adds_full_workload(ingestor):
+    """Test that a new order counts with its whole workload."""
+    counts = ingestor.apply_batch([entry(1, "order_created", order_id="O1", workload="10")])
+
+    state = ingestor.state("WH001")
+    assert counts == {("order_created", "applied"): 1}
+    assert state.remaining_workload == pytest.approx(10.0)
+    assert state.status_counts[OrderStatus.NEW] == 1
+
+
+def test_status_changes_adjust_remaining_workload(ingestor):
+    """Test that progress replaces the order's previous contribution."""
+    ingestor.apply_batch(
+        [
+            entry(1, "order_created", order_id="O1", workload="10"),
+            entry(2, "order_created", order_id="O2", workload="20"),
+            entry(3, "delivery_status", order_id="O1", status="PICKING"),
+            entry(4, "order_changed", order_id="O2", workload="30"),
+            entry(5, "delivery_status", order_id="O1", status="SHIPPED"),
+        ]
+    )
+
+    state = ingestor.state("WH001")
+    assert "O1" not in state.orders
+    assert state.remaining_workload == pytest.approx(30.0)
+    assert state.status_counts[OrderStatus.PICKING] == 0
+    assert state.last_event_ms == 1700000000000
+
+
+def test_duplicate_event_ids_are_skipped(ingestor):
+    """Test that a redelivered event is applied only once."""
+    event = entry(1, "order_created", order_id="O1", workload="10", event_id="evt-1")
+    redelivered = entry(2, "order_created", order_id="O1", workload="10", event_id="evt-1")
+
+    counts = ingestor.apply_batch([event, redelivered])
+
+    assert counts == {("order_created", "applied"): 1, ("order_created", "duplicate"): 1}
+    assert ingestor.state("WH001").remaining_workload == pytest.approx(10.0)
+
+
+def test_dedupe_window_is_bounded():
+    """Test that only the most recent event ids are remembered."""
+    ingestor = EventIngestor(stream="events", dedupe_window=2)
+    ingestor.apply_batch(
+        [entry(i, "order_created", order_id=f"O{i}", workload="1") for i in range(5)]
+    )
+
+    assert list(ingestor._seen) == ["1700000000000-3", "1700000000000-4"]
+
+
+def test_invalid_events_are_counted_not_applied(ingestor):
+    """Test that malformed events do not stop the batch."""
+    counts = ingestor.apply_batch(
+        [
+            entry(1, "order_created", order_id="O1"),
+            entry(2, "delivery_status", order_id="O1", status="LOST"),
+            entry(3, "refund", order_id="O1"),
+            entry(4, "order_created", order_id="O2", workload="5"),
+        ]
+    )
+
+    assert counts[("order_created", "invalid")] == 1
+    assert counts[("delivery_status", "invalid")] == 1
+    assert counts[("refund", "invalid")] == 1
+    assert ingestor.state("WH001").orders == {"O2": (5.0, OrderStatus.NEW)}
+
+
+@pytest.mark.parametrize("workload", ["nan", "inf", "-inf", "-1"])
+def test_non_finite_or_negative_workload_is_invalid(ingestor, workload):
+    """Test that a workload that would poison the remaining total is rejected."""
+    ingestor.apply_batch([entry(1, "order_created", order_id="O1", workload="10")])
+
+    counts = ingestor.apply_batch([entry(2, "order_changed", order_id="O1", workload=workload)])
+
+    assert counts == {("order_changed", "invalid"): 1}
+    assert ingestor.state("WH001").remaining_workload == pytest.approx(10.0)
+
+
+async def test_consume_reads_batches_after_the_last_id(ingestor):
+    """Test that batches are read in order and the position advances past them."""
+    stream = StreamDouble(
+        [entry(i, "order_created", order_id=f"O{i}", workload="2") for i in range(5)]
+    )
+
+    assert await ingestor.consume_once(stream) == 3
+    assert await ingestor.consume_once(stream) == 2
+    assert await ingestor.consume_once(stream) == 0
+
+    assert ingestor.last_id == "1700000000000-4"
+    assert ingestor.state("WH001").remaining_workload == pytest.approx(10.0)
+
+
+async def test_every_worker_sees_every_event():
+    """Test that workers read the stream independently rather than splitting it."""
+    stream = StreamDouble(
+        [entry(i, "order_created", order_id=f"O{i}", workload="2") for i in range(5)]
+    )
+    workers = [EventIngestor(stream="events", batch_size=10) for _ in range(2)]
+
+    for worker in workers:
+        assert await worker.consume_once(stream) == 5
+        assert worker.state("WH001").remaining_workload == pytest.approx(10.0)
+
+
+async def test_restart_applies_only_events_after_the_snapshot_position(ingestor, monkeypatch):
+    """Test that seek_to_end skips entries the seeded state already reflects."""
+    stream = StreamDouble([entry(1, "order_created", order_id="O1", workload="4")])
+    monkeypatch.setattr(event_ingestion, "get_cache", lambda: SimpleNamespace(redis=stream))
+
+    await ingestor.seek_to_end()
+    stream.entries.append(entry(2, "order_created", order_id="O2", workload="6"))
+
+    assert await ingestor.consume_once(stream) == 1
+    assert ingestor.state("WH001").orders == {"O2": (6.0, OrderStatus.NEW)}
+
+
+def seed(ingestor: EventIngestor, lines: list[dict]) -> None:
+    """Seed the ingestor from order workload lines."""
+    pa = pytest.importorskip("pyarrow")
+    from app.repositories.order_workload_snapshot import (
+        OrderWorkloadSnapshot,
+        order_workload_schema,
+    )
+
+    batch = pa.RecordBatch.from_pylist(lines, schema=order_workload_schema())
+    ingestor.load_snapshot(OrderWorkloadSnapshot.from_batches([batch]))
+
+
+async def test_threshold_tables_use_ingested_workload(ingestor, monkeypatch):
+    """Test that a running ingestor's remaining workload replaces the snapshot's."""
+    seed(ingestor, [ORDER_LINE])
+    stream = StreamDouble([entry(1, "order_changed", order_id="O1", workload="42.5")])
+    stream.entries[0][1]["warehouse_id"] = "WH-MAIN"
+    monkeypatch.setattr(event_ingestion, "get_cache", lambda: SimpleNamespace(redis=stream))
+    monkeypatch.setattr(threshold_table, "get_event_ingestor", lambda: ingestor)
+    monkeypatch.setattr(threshold_table, "get_shared_snapshot", lambda: None)
+    registry = ThresholdTableRegistry()
+    monkeypatch.setattr(threshold_table, "get_threshold_tables", lambda: registry)
+
+    snapshot_table = await threshold_table.load_threshold_table("WH-MAIN")
+    assert snapshot_table.current_workload != Decimal("42.5")
+
+    ingestor.last_id = "0-0"
+    await ingestor.start()
+    try:
+        while ingestor.state("WH-MAIN") is None:
+            await asyncio.sleep(0)
+        table = await threshold_table.load_threshold_table("WH-MAIN")
+    finally:
+        await ingestor.stop()
+    assert table.current_workload == Decimal("42.5")
+
+
+@pytest.mark.parametrize("lines", [[], [{**ORDER_LINE, "warehouse_id": "WH-NORTH"}]])
+async def test_unseeded_warehouse_keeps_snapshot_workload(ingestor, monkeypatch, lines):
+    """Test that events alone never replace HANA's workload for a warehouse."""
+    seed(ingestor, lines)
+    stream = StreamDouble([entry(1, "order_created", order_id="O9", workload="1")])
+    stream.entries[0][1]["warehouse_id"] = "WH-MAIN"
+    monkeypatch.setattr(event_ingestion, "get_cache", lambda: SimpleNamespace(redis=stream))
+    monkeypatch.setattr(threshold_table, "get_event_ingestor", lambda: ingestor)
+    monkeypatch.setattr(threshold_table, "get_shared_snapshot", lambda: None)
+    monkeypatch.setattr(threshold_table, "get_threshold_tables", ThresholdTableRegistry)
+
+    snapshot_table = await threshold_table.load_threshold_table("WH-MAIN")
+
+    ingestor.last_id = "0-0"
+    await ingestor.start()
+    try:
+        while ingestor.state("WH-MAIN") is None:
+            await asyncio.sleep(0)
+        table = await threshold_table.load_threshold_table("WH-MAIN")
+    finally:
+        await ingestor.stop()
+    assert not ingestor.is_seeded("WH-MAIN")
+    assert table.current_workload == snapshot_table.current_workload
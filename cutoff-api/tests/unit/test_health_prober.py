@@ -0,0 +1,115 @@
+"""
+Unit tests for the background health prober.
+"""
+
+import asyncio
+
+from app.repositories.hana_repository import HANARepository
+from app.services.health_prober import HealthProber
+
+
+class FlakyProbe:
+    """Probe whose outcome and latency are set by the test."""
+
+    def __init__(self) -> None:
+        self.healthy = True
+        self.delay = 0.0
+        self.calls = 0
+
+    async def __call__(self) -> None:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if not self.healthy:
+            raise ConnectionError("connection refused")
+
+
+async def test_components_unknown_until_probed():
+    """Test that components report unknown before the first probe."""
+    prober = HealthProber({"redis": FlakyProbe()})
+
+    assert prober.checks() == {"redis": "unknown"}
+
+
+async def test_successful_probe_records_latency():
+    """Test that a successful probe reports ok with its latency and time."""
+    prober = HealthProber({"redis": FlakyProbe()})
+
+    result = await prober.probe("redis")
+
+    assert result.status == "ok"
+    assert result.latency_ms is not None
+    assert result.last_success is not None
+    assert result.last_error is None
+
+
+async def test_slow_probe_is_degraded():
+    """Test that a probe slower than the threshold reports degraded."""
+    probe = FlakyProbe()
+    probe.delay = 0.02
+    prober = HealthProber({"hana": probe}, slow_ms=5)
+
+    result = await prober.probe("hana")
+
+    assert result.status == "degraded"
+    assert result.latency_ms >= 5
+
+
+async def test_failure_after_recent_success_is_degraded():
+    """Test that a failure shortly after a success degrades instead of going down."""
+    probe = FlakyProbe()
+    prober = HealthProber({"redis": probe}, interval_seconds=10)
+    first = await prober.probe("redis")
+
+    probe.healthy = False
+    result = await prober.probe("redis")
+
+    assert result.status == "degraded"
+    assert result.last_error == "connection refused"
+    assert result.last_success == first.last_success
+
+
+async def test_component_down_without_recent_success():
+    """Test that a component is down once it has not succeeded for several intervals."""
+    probe = FlakyProbe()
+    prober = HealthProber({"redis": probe}, interval_seconds=0.001)
+    await prober.probe("redis")
+    await asyncio.sleep(0.01)
+
+    probe.healthy = False
+    result = await prober.probe("redis")
+
+    assert result.status == "down"
+    assert result.last_success is not None
+
+
+async def test_probe_timeout_counts_as_failure():
+    """Test that a hanging probe is cut off by the timeout."""
+    probe = FlakyProbe()
+    probe.delay = 1.0
+    prober = HealthProber({"hana": probe}, timeout_seconds=0.01)
+
+    result = await prober.probe("hana")
+
+    assert result.status == "down"
+    assert result.last_error == "TimeoutError"
+
+
+async def test_background_loop_probes_on_interval():
+    """Test that start() probes repeatedly until stopped."""
+    probe = FlakyProbe()
+    prober = HealthProber({"redis": probe}, interval_seconds=0.01)
+
+    await prober.start()
+    await asyncio.sleep(0.05)
+    await prober.stop()
+
+    assert probe.calls >= 2
+    assert prober.checks() == {"redis": "ok"}
+
+
+async def test_hana_ping_in_mock_mode():
+    """Test that the HANA ping query succeeds against mock data."""
+    repo = HANARepository(use_mock=True)
+
+    assert await repo.ping() is None
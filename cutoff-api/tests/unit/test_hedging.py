@@ -0,0 +1,99 @@
+"""
+Unit tests for hedged reads.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from app.core.hedging import HedgedReader, LatencyTracker
+from app.repositories.hana_repository import HANARepository
+
+
+def test_latency_tracker_quantile():
+    """Test that the tracker reports the configured quantile once warm."""
+    tracker = LatencyTracker(quantile=0.95, min_samples=20)
+    for ms in range(1, 20):
+        tracker.record(ms / 1000)
+    assert tracker.value() is None
+
+    for ms in range(20, 101):
+        tracker.record(ms / 1000)
+    assert tracker.value() == pytest.approx(0.095)
+
+
+async def test_hedge_wins_and_cancels_loser():
+    """Test that a slow primary is hedged and the slow attempt is cancelled."""
+    reader = HedgedReader(["slow", "fast"], default_delay_seconds=0.01)
+    cancelled = []
+
+    async def query(endpoint):
+        try:
+            await asyncio.sleep(1.0 if endpoint == "slow" else 0.001)
+        except asyncio.CancelledError:
+            cancelled.append(endpoint)
+            raise
+        return endpoint
+
+    assert await reader.read("cutoff", query) == "fast"
+    await asyncio.sleep(0)
+    assert cancelled == ["slow"]
+
+
+async def test_fast_primary_is_not_hedged():
+    """Test that answers within the hedge delay never start a second attempt."""
+    reader = HedgedReader(["a", "b"], default_delay_seconds=0.5)
+    calls = []
+
+    async def query(endpoint):
+        calls.append(endpoint)
+        return endpoint
+
+    assert await reader.read("cutoff", query) == "a"
+    assert calls == ["a"]
+
+
+async def test_failed_primary_falls_back_to_hedge():
+    """Test that a failing primary is covered by the hedge."""
+    reader = HedgedReader(["down", "up"], default_delay_seconds=0.5)
+
+    async def query(endpoint):
+        if endpoint == "down":
+            raise ConnectionError("replica down")
+        return endpoint
+
+    assert await reader.read("cutoff", query) == "up"
+
+    async def all_down(endpoint):
+        raise ConnectionError(endpoint)
+
+    with pytest.raises(ConnectionError, match="up"):
+        # Round-robin: "up" is the primary this time
+        await reader.read("cutoff", all_down)
+
+
+async def test_mock_repository_with_random_latencies():
+    """Test that hedging cuts the tail of randomized mock replica latencies."""
+    rng = random.Random(7)
+    stalls = 0
+
+    def latency(endpoint):
+        # 3% of reads stall for 200 ms (beyond p95), the rest take ~1 ms
+        nonlocal stalls
+        if rng.random() < 0.03:
+            stalls += 1
+            return 0.2
+        return 0.001 + rng.random() / 1000
+
+    repo = HANARepository(read_endpoints=["hana-1", "hana-2"], mock_latency=latency)
+    loop = asyncio.get_running_loop()
+    slowest = 0.0
+    for _ in range(200):
+        started = loop.time()
+        data = await repo.get_cutoff_calculation("WH-MAIN")
+        slowest = max(slowest, loop.time() - started)
+        assert "total_remaining_workload" in data
+
+    assert stalls >= 3
+    assert slowest < 0.1
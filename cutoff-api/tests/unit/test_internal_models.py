@@ -0,0 +1,52 @@
+"""
+Unit tests for internal slotted domain objects.
+"""
+
+import dataclasses
+from decimal import Decimal
+
+import pytest
+
+from app.models import domain, internal
+from app.models.domain import ResourceType
+from app.services.capacity_service import CapacityService
+
+
+@pytest.mark.parametrize("counts", [(10, 8, 4), (1, 1, 1), (0, 5, 5), (3, 9, 2)])
+def test_warehouse_capacity_matches_pydantic(counts):
+    """Test that values computed once equal the pydantic properties."""
+    capacity = CapacityService().calculate_warehouse_capacity(*counts)
+    model = capacity.to_model()
+
+    assert capacity.usable_capacity == model.usable_capacity
+    assert capacity.bottleneck_resource == model.bottleneck_resource
+    assert capacity.packer_capacity.capacity_per_minute == (
+        model.packer_capacity.capacity_per_minute
+    )
+
+
+def test_workload_total_matches_pydantic():
+    """Test the total workload formula against the pydantic model."""
+    workload = internal.Workload(item_workload=Decimal("7.5"))
+    assert workload.total_workload == workload.to_model().total_workload
+
+
+def test_internal_objects_are_frozen_and_slotted():
+    """Test immutability and absence of per-instance dicts."""
+    resource = internal.ResourceCapacity(ResourceType.PICKER, 3)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        resource.available_count = 4  # type: ignore[misc]
+    assert not hasattr(resource, "__dict__")
+
+
+def test_decision_converts_at_the_edge():
+    """Test conversion of a decision to the response model."""
+    factors = internal.DecisionFactors(
+        workload_impact=Decimal("12.5"),
+        remaining_capacity=Decimal("40"),
+        time_buffer_minutes=90,
+        bottleneck_resource=ResourceType.PACKER,
+    )
+    model = factors.to_model()
+    assert isinstance(model, domain.DecisionFactors)
+    assert model.model_dump() == dataclasses.asdict(factors)
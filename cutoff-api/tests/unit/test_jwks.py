@@ -0,0 +1,179 @@
+"""
+Unit tests for the JWKS key provider and RS256 token verification.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwk, jwt
+
+from app.config import get_settings
+from app.core import auth
+from app.core.auth import VerifiedTokenCache, get_current_user
+from app.core.jwks import JWKSProvider
+
+JWKS_URL = "https://idp.example.com/token_keys"
+
+
+class SigningKey:
+    """RSA key pair standing in for one identity provider key."""
+
+    def __init__(self, kid: str) -> None:
+        self.kid = kid
+        private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_pem = private.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+        public = jwk.construct(self.private_pem, "RS256").public_key().to_dict()
+        self.jwk = {**public, "kid": kid, "use": "sig"}
+
+    def token(self, sub: str = "erp-service") -> str:
+        expires = datetime.utcnow() + timedelta(hours=1)
+        claims = {"sub": sub, "scopes": ["cutoff.read"], "exp": expires}
+        return jwt.encode(claims, self.private_pem, algorithm="RS256", headers={"kid": self.kid})
+
+
+@pytest.fixture(scope="module")
+def key_1():
+    return SigningKey("key-1")
+
+
+@pytest.fixture(scope="module")
+def key_2():
+    return SigningKey("key-2")
+
+
+class StubIdentityProvider:
+    """HTTP stub serving a JWKS document and counting fetches."""
+
+    def __init__(self, *keys: SigningKey) -> None:
+        self.keys = list(keys)
+        self.fetches = 0
+        self.fail = False
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.fetches += 1
+        if self.fail:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"keys": [key.jwk for key in self.keys]})
+
+    def provider(self, **kwargs) -> JWKSProvider:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        return JWKSProvider(JWKS_URL, http_client=client, **kwargs)
+
+
+async def test_loads_keys_from_file(tmp_path, key_1):
+    """Test that a local JWKS file stands in for the identity provider."""
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps({"keys": [key_1.jwk, {**key_1.jwk, "kid": "enc", "use": "enc"}]}))
+    provider = JWKSProvider(str(path))
+
+    assert await provider.refresh() == 1
+    assert await provider.get_key("key-1") is not None
+    # A token without kid matches a single-key set
+    assert await provider.get_key(None) is provider.keys["key-1"]
+
+
+async def test_unknown_kid_triggers_one_coalesced_refresh(key_1, key_2):
+    """Test that concurrent requests with a rotated-in kid share a single reload."""
+    idp = StubIdentityProvider(key_1)
+    provider = idp.provider(min_refresh_interval_seconds=0)
+    await provider.refresh()
+
+    idp.keys.append(key_2)
+    keys = await asyncio.gather(*(provider.get_key("key-2") for _ in range(20)))
+
+    assert all(key is provider.keys["key-2"] for key in keys)
+    assert idp.fetches == 2
+
+
+async def test_unknown_kid_refreshes_are_throttled(key_1):
+    """Test that random kids cannot force a reload on every request."""
+    idp = StubIdentityProvider(key_1)
+    provider = idp.provider(min_refresh_interval_seconds=30)
+    await provider.refresh()
+
+    assert await provider.get_key("bogus-1") is None
+    assert await provider.get_key("bogus-2") is None
+    assert idp.fetches == 1
+
+
+async def test_failed_refresh_keeps_previous_keys(key_1):
+    """Test that an identity provider outage does not drop cached keys."""
+    idp = StubIdentityProvider(key_1)
+    provider = idp.provider()
+    await provider.refresh()
+
+    idp.fail = True
+    with pytest.raises(httpx.HTTPStatusError):
+        await provider.refresh()
+
+    assert await provider.get_key("key-1") is not None
+
+
+def test_refresh_delay_is_jittered():
+    """Test that the background reload interval is spread around the configured value."""
+    provider = JWKSProvider("jwks.json", refresh_interval_seconds=100, refresh_jitter=0.1)
+
+    delays = {provider.next_refresh_delay() for _ in range(50)}
+
+    assert all(90 <= delay <= 110 for delay in delays)
+    assert len(delays) > 1
+
+
+async def test_get_current_user_verifies_rs256_tokens(monkeypatch, key_1, key_2):
+    """Test that RS256 tokens are verified with the JWKS key named by their kid."""
+    idp = StubIdentityProvider(key_1)
+    provider = idp.provider()
+    await provider.refresh()
+    monkeypatch.setattr(get_settings(), "jwt_algorithm", "RS256")
+    monkeypatch.setattr(auth, "get_jwks_provider", lambda: provider)
+    monkeypatch.setattr(auth, "_token_cache", VerifiedTokenCache())
+
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=key_1.token())
+    user = await get_current_user(credentials)
+    assert user.username == "erp-service"
+
+    # Signed by a key the identity provider does not publish
+    forged = HTTPAuthorizationCredentials(scheme="Bearer", credentials=key_2.token())
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(forged)
+    assert exc_info.value.status_code == 401
+
+
+async def test_key_set_change_clears_verified_tokens(monkeypatch, key_1, key_2):
+    """Test that tokens of a withdrawn key are no longer served from the cache."""
+    idp = StubIdentityProvider(key_1, key_2)
+    provider = idp.provider()
+    await provider.refresh()
+    monkeypatch.setattr(get_settings(), "jwt_algorithm", "RS256")
+    monkeypatch.setattr(auth, "get_jwks_provider", lambda: provider)
+    monkeypatch.setattr(auth, "_token_cache", VerifiedTokenCache())
+
+    token = key_2.token()
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    await get_current_user(credentials)
+    assert auth.get_token_cache().get(token) is not None
+
+    # Unchanged reload keeps the cache
+    version = provider.key_set_version
+    await provider.refresh()
+    assert provider.key_set_version == version
+    assert auth.get_token_cache().get(token) is not None
+
+    # key-2 withdrawn
+    idp.keys = [key_1]
+    await provider.refresh()
+    assert auth.get_token_cache().get(token) is None
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(credentials)
+    assert exc_info.value.status_code == 401
@@ -0,0 +1,141 @@
+"""
+Unit tests for admission control: bulkheads, lag shedding and VIP bypass.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.load_shedding import AdmissionController, AdmissionRejected, Bulkhead
+from app.models.domain import Priority
+
+
+def _controller(max_concurrent: int = 1, max_queue: int = 8, timeout: float = 1.0):
+    bulkhead = Bulkhead("capacity_check", max_concurrent, max_queue, timeout)
+    return AdmissionController({"capacity_check": bulkhead}, lag_threshold_seconds=0.1)
+
+
+async def test_queue_serves_higher_priority_first():
+    """Test that waiters get freed slots in priority order, not arrival order."""
+    controller = _controller()
+    order = []
+
+    async def request(priority):
+        async with controller.admit("capacity_check", priority):
+            order.append(priority)
+
+    async with controller.admit("capacity_check", Priority.STANDARD):
+        waiting = [
+            asyncio.create_task(request(Priority.STANDARD)),
+            asyncio.create_task(request(Priority.EXPRESS)),
+        ]
+        await asyncio.sleep(0)
+        assert controller.bulkheads["capacity_check"].queued == 2
+
+    await asyncio.gather(*waiting)
+    assert order == [Priority.EXPRESS, Priority.STANDARD]
+    assert controller.bulkheads["capacity_check"].active == 0
+
+
+async def test_vip_bypasses_full_bulkhead():
+    """Test that VIP requests are admitted immediately when the endpoint is busy."""
+    controller = _controller(max_queue=0)
+
+    async with controller.admit("capacity_check", Priority.STANDARD):
+        with pytest.raises(AdmissionRejected) as exc_info:
+            async with controller.admit("capacity_check", Priority.EXPRESS):
+                pass
+        assert exc_info.value.status_code == 429
+
+        async with controller.admit("capacity_check", Priority.VIP):
+            assert controller.in_flight == 2
+
+    assert controller.bulkheads["capacity_check"].active == 0
+
+
+async def test_queue_wait_times_out():
+    """Test that a request waiting too long is rejected and leaves the queue."""
+    controller = _controller(timeout=0.01)
+    bulkhead = controller.bulkheads["capacity_check"]
+
+    async with controller.admit("capacity_check", Priority.STANDARD):
+        with pytest.raises(AdmissionRejected) as exc_info:
+            async with controller.admit("capacity_check", Priority.STANDARD):
+                pass
+
+    assert exc_info.value.status_code == 429
+    assert bulkhead.queued == 0
+    assert bulkhead.active == 0
+
+
+async def test_cancelled_waiter_leaves_queue():
+    """Test that a client disconnecting while queued does not leak a slot."""
+    controller = _controller()
+    bulkhead = controller.bulkheads["capacity_check"]
+
+    async def request():
+        async with controller.admit("capacity_check", Priority.STANDARD):
+            pass
+
+    async with controller.admit("capacity_check", Priority.STANDARD):
+        waiter = asyncio.create_task(request())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    assert bulkhead.queued == 0
+    assert bulkhead.active == 0
+    async with controller.admit("capacity_check", Priority.STANDARD):
+        assert bulkhead.active == 1
+
+
+@pytest.mark.parametrize(
+    "lag, shed, admitted",
+    [
+        (0.05, [], [None, Priority.STANDARD, Priority.EXPRESS]),
+        (0.15, [None], [Priority.STANDARD, Priority.EXPRESS]),
+        (0.25, [None, Priority.STANDARD], [Priority.EXPRESS]),
+        (0.5, [None, Priority.STANDARD, Priority.EXPRESS], [Priority.VIP]),
+    ],
+)
+async def test_lag_sheds_lowest_priorities_first(lag, shed, admitted):
+    """Test that rising event-loop lag sheds background, STANDARD, then EXPRESS."""
+    controller = _controller()
+    controller.lag_seconds = lag
+
+    for priority in shed:
+        with pytest.raises(AdmissionRejected) as exc_info:
+            async with controller.admit("capacity_check", priority):
+                pass
+        assert exc_info.value.status_code == 503
+    for priority in admitted:
+        async with controller.admit("capacity_check", priority):
+            pass
+
+
+async def test_lag_monitor_detects_blocked_loop():
+    """Test that blocking the event loop shows up as lag."""
+    controller = _controller()
+    await controller.start()
+    await asyncio.sleep(0.06)
+
+    time.sleep(0.15)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0.01)
+    lag = controller.lag_seconds
+    await controller.stop()
+
+    assert lag >= 0.1
+
+
+async def test_disabled_controller_admits_everything():
+    """Test that a disabled controller neither sheds nor queues."""
+    controller = _controller(max_queue=0)
+    controller.enabled = False
+    controller.lag_seconds = 10.0
+
+    async with controller.admit("capacity_check", None):
+        async with controller.admit("capacity_check", Priority.STANDARD):
+            pass
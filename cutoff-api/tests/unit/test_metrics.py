@@ -0,0 +1,81 @@
+"""
+Unit tests for Prometheus multi-process metrics.
+"""
+
+import os
+import subprocess
+import sys
+
+from app.core.metrics import compact_worker_files
+
+_WORKER = """
+import os, sys
+from app.core import metrics
+
+metrics.capacity_checks_total.labels("approved", "STANDARD").inc(int(sys.argv[1]))
+metrics.warehouse_utilization.labels("WH-MAIN").set(float(sys.argv[1]) / 10)
+metrics.db_connection_pool_size.labels("hana").set(5)
+metrics.db_query_duration_seconds.labels("capacity").observe(0.02)
+print(os.getpid())
+"""
+
+_SCRAPE = """
+import sys
+from starlette.testclient import TestClient
+from app.core import metrics
+
+if len(sys.argv) > 1:
+    metrics.mark_worker_dead(int(sys.argv[1]))
+print(TestClient(metrics.create_metrics_app()).get("/").text)
+"""
+
+
+def _run(code: str, metrics_dir, *args) -> str:
+    """Run a snippet as a separate worker process sharing metrics_dir."""
+    env = {
+        "HANA_HOST": "test",
+        "HANA_USER": "test",
+        "HANA_PASSWORD": "test",
+        **os.environ,
+        "PROMETHEUS_MULTIPROC_DIR": str(metrics_dir),
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", code, *map(str, args)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def test_scrape_aggregates_all_workers(tmp_path):
+    """Test that counters sum across workers and gauges follow their mode."""
+    _run(_WORKER, tmp_path, 2)
+    last_pid = _run(_WORKER, tmp_path, 3)
+
+    body = _run(_SCRAPE, tmp_path)
+    assert 'cutoff_capacity_checks_total{decision="approved",priority="STANDARD"} 5.0' in body
+    # mostrecent: the value written last, not a per-pid series
+    assert 'cutoff_warehouse_utilization{warehouse_id="WH-MAIN"} 0.3' in body
+    assert 'cutoff_db_connection_pool_size{pool_name="hana"} 10.0' in body
+
+    # A dead worker's live gauges are dropped, its counters are kept
+    body = _run(_SCRAPE, tmp_path, last_pid)
+    assert 'cutoff_db_connection_pool_size{pool_name="hana"} 5.0' in body
+    assert 'cutoff_capacity_checks_total{decision="approved",priority="STANDARD"} 5.0' in body
+
+
+def test_exited_workers_are_compacted_into_archive_files(tmp_path):
+    """Test that dead workers' counter and histogram files are folded in, keeping totals."""
+    pids = [_run(_WORKER, tmp_path, count) for count in (2, 3)]
+    for pid in pids:
+        assert compact_worker_files(int(pid), str(tmp_path)) >= 1
+        assert not (tmp_path / f"counter_{pid}.db").exists()
+
+    assert sorted(p.name for p in tmp_path.glob("counter_*")) == ["counter_archive.db"]
+    assert sorted(p.name for p in tmp_path.glob("histogram_*")) == ["histogram_archive.db"]
+    body = _run(_SCRAPE, tmp_path)
+    assert 'cutoff_capacity_checks_total{decision="approved",priority="STANDARD"} 5.0' in body
+    assert 'cutoff_db_query_duration_seconds_count{query_type="capacity"} 2.0' in body
+    assert compact_worker_files(int(pids[0]), str(tmp_path)) == 0
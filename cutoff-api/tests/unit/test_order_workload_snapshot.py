@@ -0,0 +1,144 @@
+"""
+Unit tests for the columnar order workload snapshot.
+"""
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from app.models.domain import OrderStatus  # noqa: E402
+from app.repositories.hana_repository import HANARepository  # noqa: E402
+from app.repositories.order_workload_snapshot import (  # noqa: E402
+    OrderWorkloadSnapshot,
+    load_order_workload_snapshot,
+)
+from app.services.event_ingestion import EventIngestor  # noqa: E402
+
+LINES = {
+    "warehouse_id": ["WH001", "WH001", "WH001", "WH002"],
+    "order_id": ["O1", "O1", "O2", "O3"],
+    "item_workload": [10.0, 6.0, 20.0, 8.0],
+    "status": ["NEW", "NEW", "PICKING", "SHIPPED"],
+}
+
+
+@pytest.fixture
+def export_file(tmp_path):
+    """A Parquet export as written by the reporting job (plain string columns)."""
+    path = tmp_path / "order_workload.parquet"
+    pq.write_table(pa.table(LINES), path)
+    return path
+
+
+def test_reads_parquet_export(export_file):
+    """Test that an export is loaded with the snapshot schema."""
+    snapshot = OrderWorkloadSnapshot.from_parquet(export_file)
+
+    assert snapshot.num_rows == 4
+    assert pa.types.is_dictionary(snapshot.table.schema.field("warehouse_id").type)
+    assert snapshot.remaining_workload_by_warehouse() == {
+        "WH001": pytest.approx(16.0 + 20.0 * 0.60),
+        "WH002": 0.0,
+    }
+
+
+def test_reads_directory_of_part_files(tmp_path):
+    """Test that the part files of one export are read together."""
+    table = pa.table(LINES)
+    pq.write_table(table.slice(0, 2), tmp_path / "part-0.parquet")
+    pq.write_table(table.slice(2), tmp_path / "part-1.parquet")
+
+    snapshot = OrderWorkloadSnapshot.from_parquet(tmp_path)
+
+    assert snapshot.num_rows == 4
+    assert set(snapshot.remaining_workload_by_warehouse()) == {"WH001", "WH002"}
+
+
+def test_orders_sum_lines(export_file):
+    """Test that lines are aggregated to one row per order."""
+    snapshot = OrderWorkloadSnapshot.from_parquet(export_file)
+
+    assert sorted(snapshot.orders()) == [
+        ("WH001", "O1", 16.0, OrderStatus.NEW),
+        ("WH001", "O2", 20.0, OrderStatus.PICKING),
+        ("WH002", "O3", 8.0, OrderStatus.SHIPPED),
+    ]
+
+
+def test_batches_are_not_copied():
+    """Test that a snapshot from record batches references their buffers."""
+    batch = pa.RecordBatch.from_pydict(
+        {**LINES, "item_workload": pa.array(LINES["item_workload"], pa.float64())}
+    )
+
+    snapshot = OrderWorkloadSnapshot.from_batches([batch, batch])
+
+    column = snapshot.table.column("item_workload")
+    assert snapshot.num_rows == 8
+    assert column.chunk(0).buffers()[1].address == batch.column(2).buffers()[1].address
+
+
+def test_missing_column_is_rejected(tmp_path):
+    """Test that an export without a required column fails clearly."""
+    path = tmp_path / "broken.parquet"
+    pq.write_table(pa.table({key: LINES[key] for key in ("warehouse_id", "order_id")}), path)
+
+    with pytest.raises(ValueError, match="missing columns: item_workload, status"):
+        OrderWorkloadSnapshot.from_parquet(tmp_path)
+
+
+def test_unknown_status_is_rejected():
+    """Test that statuses outside OrderStatus are not silently weighted."""
+    with pytest.raises(ValueError, match="Unknown order status in snapshot: LOST"):
+        OrderWorkloadSnapshot(pa.table({**LINES, "status": ["NEW", "NEW", "LOST", "NEW"]}), "test")
+
+
+def test_empty_snapshot():
+    """Test that no batches yield an empty snapshot."""
+    snapshot = OrderWorkloadSnapshot.from_batches([])
+
+    assert snapshot.num_rows == 0
+    assert snapshot.remaining_workload_by_warehouse() == {}
+    assert list(snapshot.orders()) == []
+
+
+def test_snapshot_seeds_event_state(export_file):
+    """Test that ingestion starts from the snapshot and applies events on top."""
+    ingestor = EventIngestor(stream="events")
+    event = {"type": "delivery_status", "warehouse_id": "WH001", "order_id": "O1"}
+
+    ingestor.load_snapshot(OrderWorkloadSnapshot.from_parquet(export_file))
+    ingestor.apply_batch([("1700000000000-0", {**event, "status": "PACKING"})])
+
+    assert ingestor.state("WH002").remaining_workload == 0.0
+    assert ingestor.state("WH001").remaining_workload == pytest.approx(16.0 * 0.25 + 20.0 * 0.60)
+
+
+async def test_loads_mock_batches_from_hana(monkeypatch):
+    """Test that the HANA path builds the snapshot from Arrow batches."""
+    repo = HANARepository(use_mock=True, mock_latency=lambda endpoint: 0.0)
+    monkeypatch.setattr(
+        "app.repositories.order_workload_snapshot.get_hana_repository", lambda: repo
+    )
+
+    snapshot = await load_order_workload_snapshot()
+
+    assert snapshot.source == "hana"
+    assert snapshot.num_rows == 5
+    assert {order_id for _, order_id, _, _ in snapshot.orders()} == {
+        "SO-2024-001",
+        "SO-2024-002",
+        "SO-2024-003",
+    }
+
+
+async def test_unimplemented_hana_query_is_not_an_empty_snapshot(monkeypatch):
+    """Test that the unimplemented live query fails instead of reporting no open orders."""
+    repo = HANARepository(use_mock=False)
+    monkeypatch.setattr(
+        "app.repositories.order_workload_snapshot.get_hana_repository", lambda: repo
+    )
+
+    with pytest.raises(NotImplementedError):
+        await load_order_workload_snapshot()
@@ -0,0 +1,190 @@
+"""
+Unit tests for the GCRA rate limiter and its Redis reconciliation.
+"""
+
+import time
+
+import pytest
+
+from app.core.auth import User, get_token_cache
+from app.core.rate_limit import RateLimiter, client_key, parse_networks
+
+ROUTE = "/api/v1/simulate"
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SharedCounters:
+    """In-memory stand-in for the Redis counters shared by all workers."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, int] = {}
+        self.calls = 0
+        self.available = True
+
+    async def __call__(self, amounts: dict[str, int], ttl: int):
+        self.calls += 1
+        if not self.available:
+            return None
+        for key, amount in amounts.items():
+            self.values[key] = self.values.get(key, 0) + amount
+        return {key: self.values[key] for key in amounts}
+
+
+@pytest.fixture
+def clock():
+    """Fake monotonic clock."""
+    return FakeClock()
+
+
+@pytest.fixture
+def counters():
+    """Shared counter backend."""
+    return SharedCounters()
+
+
+def _admitted(limiter: RateLimiter, n: int, client: str = "client-a") -> int:
+    return sum(limiter.acquire(ROUTE, client) == 0 for _ in range(n))
+
+
+def test_burst_up_to_limit_then_reject(clock, counters):
+    """Test that the full limit is admitted as a burst and the next request waits."""
+    limiter = RateLimiter({ROUTE: 10}, counters=counters, clock=clock)
+
+    assert _admitted(limiter, 10) == 10
+    retry_after = limiter.acquire(ROUTE, "client-a")
+
+    assert retry_after == pytest.approx(6.0)
+    assert counters.calls == 0
+
+    # 0.6 s intervals do not add up exactly to the window
+    limiter = RateLimiter({ROUTE: 100}, counters=counters, clock=clock)
+    assert _admitted(limiter, 101) == 100
+
+
+def test_tokens_refill_at_steady_rate(clock, counters):
+    """Test that one request is admitted per emission interval after a burst."""
+    limiter = RateLimiter({ROUTE: 10}, counters=counters, clock=clock)
+    _admitted(limiter, 10)
+
+    clock.now += 6.0
+    assert _admitted(limiter, 2) == 1
+
+
+def test_clients_are_limited_independently(clock, counters):
+    """Test that one client's burst does not limit another client."""
+    limiter = RateLimiter({ROUTE: 5}, counters=counters, clock=clock)
+    _admitted(limiter, 5, client="client-a")
+
+    assert _admitted(limiter, 5, client="client-b") == 5
+
+
+async def test_reconcile_charges_requests_admitted_by_other_workers(clock, counters):
+    """Test that two workers sharing counters converge on one global limit."""
+    worker_a = RateLimiter({ROUTE: 10}, counters=counters, clock=clock)
+    worker_b = RateLimiter({ROUTE: 10}, counters=counters, clock=clock)
+
+    assert _admitted(worker_a, 1) == 1
+    assert _admitted(worker_b, 1) == 1
+    await worker_a.reconcile()
+    await worker_b.reconcile()
+
+    # Worker B uses 6 more; after the next sync worker A only has the rest
+    assert _admitted(worker_b, 6) == 6
+    await worker_b.reconcile()
+    await worker_a.reconcile()
+
+    assert _admitted(worker_a, 10) == 2
+
+
+async def test_reconcile_batches_all_buckets_in_one_call(clock, counters):
+    """Test that every active bucket is pushed in a single counter update."""
+    limiter = RateLimiter({ROUTE: 10}, counters=counters, clock=clock)
+    for client in ("a", "b", "c"):
+        limiter.acquire(ROUTE, client)
+
+    await limiter.reconcile()
+
+    assert counters.calls == 1
+    assert sorted(counters.values.values()) == [1, 1, 1]
+
+
+async def test_reconcile_keeps_pending_when_redis_unavailable(clock, counters):
+    """Test that counts are retried on the next sync if Redis was unavailable."""
+    limiter = RateLimiter({ROUTE: 10}, counters=counters, clock=clock)
+    _admitted(limiter, 3)
+
+    counters.available = False
+    await limiter.reconcile()
+    counters.available = True
+    await limiter.reconcile()
+
+    assert list(counters.values.values()) == [3]
+
+
+async def test_reconcile_drops_refilled_buckets(clock, counters):
+    """Test that buckets are forgotten once full again with nothing pending."""
+    limiter = RateLimiter({ROUTE: 10}, counters=counters, clock=clock)
+    _admitted(limiter, 3)
+    await limiter.reconcile()
+
+    clock.now += 60
+    await limiter.reconcile()
+
+    assert limiter._buckets == {}
+    assert counters.calls == 1
+
+
+def test_client_key_uses_verified_subject_only():
+    """Test that clients are keyed by verified subject, else by address."""
+    token = "header.payload.signature"
+    with_token = {
+        "headers": [(b"authorization", b"Bearer " + token.encode())],
+        "client": ("10.0.0.1", 5000),
+    }
+    forged = {"headers": [(b"authorization", b"Bearer forged")], "client": ("10.0.0.1", 5000)}
+    anonymous = {"headers": [], "client": ("10.0.0.1", 5000)}
+
+    # Not verified yet: same bucket as any other request from the address
+    assert client_key(with_token) == client_key(forged) == client_key(anonymous) == "ip-10.0.0.1"
+
+    get_token_cache().put(token, User(username="svc-orders"), time.time() + 60)
+    try:
+        assert client_key(with_token) == "user-svc-orders"
+        assert client_key(forged) == "ip-10.0.0.1"
+    finally:
+        get_token_cache().clear()
+
+
+def test_clients_behind_the_same_proxy_get_separate_buckets(clock, counters):
+    """Test that clients routed through one proxy address are keyed by forwarded address."""
+    router = parse_networks(["10.0.0.0/8"])
+
+    def via_router(*forwarded: str) -> dict:
+        return {
+            "headers": [(b"x-forwarded-for", ", ".join(forwarded).encode())],
+            "client": ("10.0.4.7", 41000),
+        }
+
+    first = via_router("203.0.113.5", "10.0.9.1")
+    second = via_router("198.51.100.20", "10.0.9.1")
+    # Entries left of the first untrusted address are the client's own
+    spoofed = via_router("192.0.2.99", "203.0.113.5", "10.0.9.1")
+
+    assert client_key(first, router) == client_key(spoofed, router) == "ip-203.0.113.5"
+    assert client_key(second, router) == "ip-198.51.100.20"
+    # Untrusted peers cannot pick their key through the header
+    assert client_key(first) == "ip-10.0.4.7"
+    assert client_key({**first, "client": ("192.0.2.1", 5000)}, router) == "ip-192.0.2.1"
+
+    limiter = RateLimiter({ROUTE: 5}, counters=counters, clock=clock)
+    assert _admitted(limiter, 5, client=client_key(first, router)) == 5
+    assert _admitted(limiter, 5, client=client_key(second, router)) == 5
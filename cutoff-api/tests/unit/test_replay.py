@@ -0,0 +1,145 @@
+"""
+Unit tests for the replay/backtest harness.
+"""
+
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.services.capacity_service import CapacityService
+from app.services.decision_engine import DecisionEngine
+from app.services.replay import ReplayEngine, VirtualClock, load_events
+from app.services.threshold_table import ThresholdTable
+from app.services.workload_calculator import WorkloadCalculator
+
+
+@pytest.fixture
+def recorded_day():
+    """A small recorded day: one snapshot, three orders, two shipments."""
+    return [
+        {
+            "type": "snapshot",
+            "ts": "2024-01-15T08:00:00",
+            "warehouse_id": "WH-MAIN",
+            "current_workload": 100.0,
+            "capacity": 200.0,
+            "bottleneck_resource": "PACKER",
+        },
+        # Approved, shipped today -> true positive
+        {
+            "type": "order",
+            "ts": "2024-01-15T09:00:00",
+            "order_id": "SO-1",
+            "warehouse_id": "WH-MAIN",
+            "priority": "STANDARD",
+            "workload": 10.0,
+        },
+        # Approved, never shipped today -> false positive
+        {
+            "type": "order",
+            "ts": "2024-01-15T09:05:00",
+            "order_id": "SO-2",
+            "warehouse_id": "WH-MAIN",
+            "priority": "STANDARD",
+            "items": [{"product_id": "MAT-001", "quantity": 5}],
+        },
+        # Rejected (over capacity), shipped today anyway -> false negative
+        {
+            "type": "order",
+            "ts": "2024-01-15T09:10:00",
+            "order_id": "SO-3",
+            "warehouse_id": "WH-MAIN",
+            "priority": "STANDARD",
+            "workload": 150.0,
+        },
+        {"type": "shipment", "ts": "2024-01-15T14:00:00", "order_id": "SO-1"},
+        {"type": "shipment", "ts": "2024-01-15T15:00:00", "order_id": "SO-3"},
+    ]
+
+
+def test_decision_engine_uses_injected_clock():
+    """Test that the deadline is derived from the injected clock."""
+    clock = VirtualClock(datetime(2024, 1, 15, 15, 50))
+    engine = DecisionEngine(WorkloadCalculator(), CapacityService(), clock=clock.now)
+
+    decision = engine.make_decision(
+        new_workload=Decimal("10.0"),
+        current_workload=Decimal("100.0"),
+        capacity=Decimal("200.0"),
+        bottleneck_resource="PACKER",
+    )
+
+    # Ten minutes before end of shift there is no time left to ship today
+    assert decision.can_ship_today is False
+    assert decision.estimated_completion.date() == datetime(2024, 1, 15).date()
+
+
+def test_decisions_are_stamped_with_the_injected_clock():
+    """Test that calculated_at comes from the virtual clock, not the wall clock."""
+    clock = VirtualClock(datetime(2024, 1, 15, 9, 30, tzinfo=timezone.utc))
+    engine = DecisionEngine(WorkloadCalculator(), CapacityService(), clock=clock.now)
+    table = ThresholdTable(
+        engine,
+        warehouse_id="WH-MAIN",
+        current_workload=Decimal("100.0"),
+        capacity=Decimal("200.0"),
+        bottleneck_resource="PACKER",
+    )
+
+    decision = engine.make_decision(
+        new_workload=Decimal("10.0"),
+        current_workload=Decimal("100.0"),
+        capacity=Decimal("200.0"),
+        bottleneck_resource="PACKER",
+    )
+
+    assert decision.calculated_at == datetime(2024, 1, 15, 9, 30)
+    assert table.decide(Decimal("10.0")).calculated_at == datetime(2024, 1, 15, 9, 30)
+    assert table.decide(Decimal("10.0")).to_decision().calculated_at == datetime(2024, 1, 15, 9, 30)
+
+
+def test_virtual_clock_never_moves_backwards():
+    """Test that out-of-order timestamps do not rewind the clock."""
+    clock = VirtualClock(datetime(2024, 1, 15, 10, 0))
+    clock.advance_to(datetime(2024, 1, 15, 9, 0))
+    assert clock.now() == datetime(2024, 1, 15, 10, 0)
+
+
+def test_replay_confusion_counts(recorded_day):
+    """Test false positive/negative accounting against shipments."""
+    report = ReplayEngine().run(recorded_day)
+
+    assert report.decisions == 3
+    assert report.true_positives == 1
+    assert report.false_positives == 1
+    assert report.false_negatives == 1
+    assert report.false_positive_rate == pytest.approx(0.5)
+    assert report.false_negative_rate == pytest.approx(1.0)
+
+
+def test_replay_skips_orders_before_first_snapshot():
+    """Test that orders without warehouse state are not scored."""
+    report = ReplayEngine().run(
+        [
+            {
+                "type": "order",
+                "ts": "2024-01-15T09:00:00",
+                "order_id": "SO-1",
+                "warehouse_id": "WH-MAIN",
+                "workload": 10.0,
+            },
+        ]
+    )
+    assert report.decisions == 0
+    assert report.skipped_orders == 1
+
+
+def test_load_events_jsonl(tmp_path, recorded_day):
+    """Test streaming events from a JSONL file."""
+    path = tmp_path / "day.jsonl"
+    path.write_text("\n".join(json.dumps(event) for event in recorded_day))
+
+    report = ReplayEngine().run(load_events(path))
+    assert report.decisions == 3
@@ -0,0 +1,57 @@
+"""
+Unit tests for bulk request parsing into column-wise items.
+"""
+
+import json
+from decimal import Decimal
+
+from app.models.domain import OrderItem, Priority
+from app.models.requests import (
+    CapacityCheckRequest,
+    OrderItemColumns,
+    ParsedCapacityCheck,
+    capacity_check_payload_adapter,
+)
+from app.services.workload_calculator import WorkloadCalculator
+
+BODY = {
+    "order_id": "SO-1",
+    "priority": "VIP",
+    "items": [
+        {"product_id": "A", "quantity": 10},
+        {"product_id": "B", "quantity": 3, "weight_factor": "1.5"},
+        {"product_id": "C", "quantity": 7, "weight_factor": None, "location_factor": 1.2},
+    ],
+}
+
+
+def test_payload_matches_request_model():
+    """Test that the bulk parser yields the same request as the pydantic model."""
+    raw = json.dumps(BODY).encode()
+    parsed = ParsedCapacityCheck.from_payload(capacity_check_payload_adapter.validate_json(raw))
+    expected = ParsedCapacityCheck.from_request(CapacityCheckRequest.model_validate_json(raw))
+
+    assert parsed == expected
+    assert parsed.priority == Priority.VIP
+    assert parsed.warehouse_id == "WH-MAIN"
+    assert len(parsed.items) == 3
+
+
+def test_columnar_workload_matches_order_workload():
+    """Test that column-wise items produce the same workload as OrderItem models."""
+    items = [
+        OrderItem(
+            product_id=f"MAT-{i}",
+            quantity=i % 17 + 1,
+            weight_factor=Decimal("1.5") if i % 3 == 0 else None,
+            location_factor=Decimal("1.2") if i % 5 == 0 else None,
+        )
+        for i in range(1000)
+    ]
+    calculator = WorkloadCalculator()
+
+    columnar = calculator.calculate_columnar_workload(OrderItemColumns.from_items(items))
+    expected = calculator.calculate_order_workload(items)
+
+    assert columnar.item_workload == expected.item_workload
+    assert columnar.total_workload == expected.total_workload
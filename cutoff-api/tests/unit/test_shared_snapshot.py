@@ -0,0 +1,237 @@
+"""
+Unit tests for the shared-memory warehouse snapshot.
+"""
+
+import dataclasses
+import multiprocessing
+import time
+
+import pytest
+
+from app.models.domain import Priority, ResourceType
+from app.repositories.hana_repository import get_hana_repository
+from app.services import threshold_table
+from app.services.shared_snapshot import (
+    SharedSnapshot,
+    SnapshotPublisher,
+    WarehouseSnapshot,
+    load_warehouse_snapshots,
+)
+from app.services.threshold_table import ThresholdTableRegistry
+
+
+def make_entry(warehouse_id: str = "WH-MAIN", workload: float = 280.5) -> WarehouseSnapshot:
+    return WarehouseSnapshot(
+        warehouse_id=warehouse_id,
+        current_workload=workload,
+        capacity=400.0,
+        current_utilization=workload / 400.0,
+        bottleneck_resource=ResourceType.PACKER,
+        snapshot_version="2024-01-15T08:30:00",
+        loaded_at=time.monotonic(),
+    )
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "snapshot"
+
+
+def test_empty_file_has_no_warehouses(path):
+    """Test that a snapshot nobody published yet reads as empty."""
+    snapshot = SharedSnapshot(path, max_warehouses=4)
+
+    assert snapshot.read() == {}
+    assert snapshot.get("WH-MAIN") is None
+
+
+def test_write_then_read_from_another_mapping(path):
+    """Test that a second mapping of the file sees published entries."""
+    writer = SharedSnapshot(path, max_warehouses=4)
+    reader = SharedSnapshot(path, max_warehouses=4)
+    entries = [make_entry("WH-MAIN"), make_entry("WH-NORTH", 120.0)]
+
+    epoch = writer.write(entries)
+
+    assert epoch == 1
+    assert reader.read() == {entry.warehouse_id: entry for entry in entries}
+    assert reader.sequence % 2 == 0
+
+
+def test_republish_replaces_entries(path):
+    """Test that each publish replaces the previous snapshot."""
+    snapshot = SharedSnapshot(path, max_warehouses=4)
+    snapshot.write([make_entry("WH-MAIN"), make_entry("WH-NORTH")])
+
+    assert snapshot.write([make_entry("WH-MAIN", 300.0)]) == 2
+
+    assert list(snapshot.read()) == ["WH-MAIN"]
+    assert snapshot.get("WH-MAIN").current_workload == 300.0
+
+
+def test_unchanged_sequence_reuses_decoded_entries(path):
+    """Test that readers decode again only after a publish."""
+    writer = SharedSnapshot(path, max_warehouses=4)
+    reader = SharedSnapshot(path, max_warehouses=4)
+    writer.write([make_entry()])
+
+    first = reader.read()
+    assert reader.read() is first
+
+    writer.write([make_entry(workload=10.0)])
+    assert reader.read() is not first
+
+
+def test_reader_retries_while_write_in_progress(path, monkeypatch):
+    """Test that a reader never returns a half-written snapshot."""
+    monkeypatch.setattr("app.services.shared_snapshot.MAX_READ_ATTEMPTS", 3)
+    writer = SharedSnapshot(path, max_warehouses=4)
+    reader = SharedSnapshot(path, max_warehouses=4)
+    writer.write([make_entry()])
+    consistent = reader.read()
+
+    # A writer stopped midway: sequence odd, slot already overwritten
+    writer._mmap[16:24] = (writer.sequence + 1).to_bytes(8, "little")
+    writer._mmap[40:56] = b"WH-TORN".ljust(16, b"\x00")
+
+    assert reader.read() is consistent
+    # The next publish completes the sequence and readers see it
+    writer.write([make_entry("WH-NEW")])
+    assert list(reader.read()) == ["WH-NEW"]
+    assert reader.sequence % 2 == 0
+
+
+def test_max_age_treats_old_entries_as_missing(path):
+    """Test that entries the publisher stopped refreshing are not used."""
+    snapshot = SharedSnapshot(path, max_warehouses=4)
+    snapshot.write([dataclasses.replace(make_entry(), loaded_at=time.monotonic() - 60)])
+
+    assert snapshot.get("WH-MAIN", max_age_seconds=15) is None
+    assert snapshot.get("WH-MAIN") is not None
+
+
+def test_oversized_entries_are_rejected(path):
+    """Test that ids or counts that do not fit the layout fail before writing."""
+    snapshot = SharedSnapshot(path, max_warehouses=1)
+
+    with pytest.raises(ValueError, match="exceed"):
+        snapshot.write([make_entry("A"), make_entry("B")])
+    with pytest.raises(ValueError, match="does not fit"):
+        snapshot.write([make_entry("WH-" + "X" * 20)])
+    assert snapshot.epoch == 0
+
+
+def _publish_in_child(path: str) -> None:
+    SharedSnapshot(path, max_warehouses=4).write([make_entry("WH-CHILD", 42.0)])
+
+
+def test_entries_are_shared_across_processes(path):
+    """Test that a publish in another process is visible through the mapping."""
+    reader = SharedSnapshot(path, max_warehouses=4)
+    process = multiprocessing.get_context("fork").Process(
+        target=_publish_in_child, args=(str(path),)
+    )
+    process.start()
+    process.join(10)
+
+    entry = reader.get("WH-CHILD")
+    assert process.exitcode == 0
+    assert entry.current_workload == 42.0
+    # CLOCK_MONOTONIC is shared by the processes of a host
+    assert 0 <= entry.age_seconds < 10
+
+
+async def test_only_one_publisher_is_elected(path):
+    """Test that the lock elects one publisher and fails over when it stops."""
+
+    async def loader():
+        return [make_entry()]
+
+    first = SnapshotPublisher(SharedSnapshot(path), loader)
+    second = SnapshotPublisher(SharedSnapshot(path), loader)
+
+    assert first.try_acquire()
+    assert not second.try_acquire()
+
+    await first.publish_once()
+    first.release()
+    assert second.try_acquire()
+    assert await second.publish_once() == 2
+    second.release()
+
+
+async def test_threshold_table_built_from_shared_entry(path, monkeypatch):
+    """Test that a worker builds its table from the snapshot without querying HANA."""
+    snapshot = SharedSnapshot(path, max_warehouses=4)
+    entry = make_entry()
+    snapshot.write([entry])
+    registry = ThresholdTableRegistry(max_age_seconds=5.0)
+
+    def no_hana():
+        raise AssertionError("HANA must not be queried")
+
+    monkeypatch.setattr(threshold_table, "get_shared_snapshot", lambda: snapshot)
+    monkeypatch.setattr(threshold_table, "get_threshold_tables", lambda: registry)
+    monkeypatch.setattr(threshold_table, "get_hana_repository", no_hana)
+
+    table = await threshold_table.load_threshold_table("WH-MAIN")
+
+    assert float(table.current_workload) == entry.current_workload
+    assert float(table.capacity) == entry.capacity
+    assert table.built_at == entry.loaded_at
+    assert table.max_utilization_workload(Priority.STANDARD) == pytest.approx(
+        0.85 * entry.capacity - entry.current_workload
+    )
+    assert not table.stale
+    assert registry.get("WH-MAIN") is table
+
+
+async def test_unrefreshed_shared_entry_served_stale(path, monkeypatch):
+    """Test that an entry the publisher did not refresh is served stale, not reloaded."""
+    snapshot = SharedSnapshot(path, max_warehouses=4)
+    entry = dataclasses.replace(make_entry(), loaded_at=time.monotonic() - 60.0)
+    snapshot.write([entry])
+    registry = ThresholdTableRegistry(max_age_seconds=5.0)
+
+    def no_hana():
+        raise AssertionError("HANA must not be queried")
+
+    monkeypatch.setattr(threshold_table, "get_shared_snapshot", lambda: snapshot)
+    monkeypatch.setattr(threshold_table, "get_threshold_tables", lambda: registry)
+    monkeypatch.setattr(threshold_table, "get_hana_repository", no_hana)
+
+    table = await threshold_table.load_threshold_table("WH-MAIN")
+
+    assert table.stale
+    assert table.snapshot_version == entry.snapshot_version
+    assert float(table.current_workload) == entry.current_workload
+    assert registry.get("WH-MAIN") is None
+
+
+async def test_entry_loaded_before_invalidation_is_skipped(path, monkeypatch):
+    """Test that an invalidated warehouse is reloaded from HANA, not the old entry."""
+    snapshot = SharedSnapshot(path, max_warehouses=4)
+    snapshot.write([make_entry()])
+    registry = ThresholdTableRegistry(max_age_seconds=5.0)
+    registry.observe_epochs({"WH-MAIN": 3})
+
+    monkeypatch.setattr(threshold_table, "get_shared_snapshot", lambda: snapshot)
+    monkeypatch.setattr(threshold_table, "get_threshold_tables", lambda: registry)
+
+    table = await threshold_table.load_threshold_table("WH-MAIN")
+
+    assert table.snapshot_version != make_entry().snapshot_version
+    assert table.epoch == 3
+    assert registry.get("WH-MAIN") is table
+
+
+async def test_loads_all_warehouses_from_hana():
+    """Test that the publisher's loader covers every warehouse HANA lists."""
+    entries = await load_warehouse_snapshots()
+
+    by_id = {entry.warehouse_id: entry for entry in entries}
+    assert set(by_id) == set(await get_hana_repository().list_warehouses())
+    for entry in entries:
+        assert entry.capacity > 0
+        assert entry.current_workload >= 0
+        assert entry.age_seconds < 5.0
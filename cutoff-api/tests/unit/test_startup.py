@@ -0,0 +1,105 @@
+"""
+Unit tests for cold-start cost: import budget and pre-generated OpenAPI.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from app.main import app
+from app.openapi import (
+    FINGERPRINT_FIELD,
+    install_openapi_schema,
+    load_openapi_schema,
+    schema_fingerprint,
+    write_openapi_schema,
+)
+
+# Generous budgets for a fresh interpreter importing app.main; ~0.7 s and
+# ~65 MB on a developer laptop. Tighten when the baseline improves.
+IMPORT_BUDGET_SECONDS = 2.5
+RSS_BUDGET_MB = 120
+
+# Peak RSS of the probe itself: ru_maxrss survives fork/exec on Linux and would
+# report the test runner's high-water mark, so VmHWM is preferred when available
+_PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import app.main
+seconds = time.perf_counter() - started
+try:
+    with open("/proc/self/status") as status:
+        rss_kb = next(int(line.split()[1]) for line in status if line.startswith("VmHWM:"))
+except OSError:
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "seconds": seconds,
+    "rss_mb": rss_kb / 1024,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def _import_app_main() -> dict:
+    """Import app.main in a fresh interpreter and report its cost."""
+    env = {
+        "HANA_HOST": "test",
+        "HANA_USER": "test",
+        "HANA_PASSWORD": "test",
+        **os.environ,
+        "LOG_LEVEL": "WARNING",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE], capture_output=True, text=True, env=env, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_within_budget():
+    """Test that importing the app stays within the time/RSS budget."""
+    report = _import_app_main()
+
+    assert report["seconds"] < IMPORT_BUDGET_SECONDS
+    assert report["rss_mb"] < RSS_BUDGET_MB
+    # Auth is only needed once an endpoint enables it
+    assert "jose" not in report["modules"]
+    assert "app.core.auth" not in report["modules"]
+
+
+def test_pregenerated_openapi_schema(tmp_path):
+    """Test that the build-time document is served and stale ones are ignored."""
+    path = tmp_path / "openapi.json"
+    write_openapi_schema(app, path)
+    fingerprint = schema_fingerprint(app)
+    schema = load_openapi_schema(path, fingerprint)
+    assert "/api/v1/capacity/check" in schema["paths"]
+    assert schema[FINGERPRINT_FIELD] == fingerprint
+
+    # Same info.version, different code
+    assert load_openapi_schema(path, "0" * 64) is None
+    assert load_openapi_schema(tmp_path / "missing.json", fingerprint) is None
+
+    original = app.openapi_schema
+    try:
+        app.openapi_schema = None
+        assert install_openapi_schema(app, path)
+        assert app.openapi() == json.loads(path.read_text())
+    finally:
+        app.openapi_schema = original
+
+
+def test_openapi_fingerprint_tracks_routes_not_only_version():
+    """Test that a route change with an unchanged version makes the document stale."""
+    fingerprint = schema_fingerprint(app)
+    assert schema_fingerprint(app) == fingerprint
+
+    @app.get("/fingerprint-probe", include_in_schema=False)
+    async def probe():
+        return {}
+
+    try:
+        assert schema_fingerprint(app) != fingerprint
+    finally:
+        app.router.routes.pop()
+    assert schema_fingerprint(app) == fingerprint
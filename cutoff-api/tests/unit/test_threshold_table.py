@@ -0,0 +1,143 @@
+"""
+Unit tests for precomputed admission threshold tables.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.models.domain import Priority
+from app.services.capacity_service import CapacityService
+from app.services.decision_engine import DecisionEngine
+from app.services.replay import VirtualClock
+from app.services.threshold_table import (
+    ThresholdTable,
+    ThresholdTableRegistry,
+    solve_processing_utilization,
+)
+from app.services.workload_calculator import WorkloadCalculator
+
+
+@pytest.fixture
+def clock():
+    """Virtual clock at mid-morning."""
+    return VirtualClock(datetime(2024, 1, 15, 9, 0))
+
+
+@pytest.fixture
+def engine(clock):
+    """Decision engine driven by the virtual clock."""
+    return DecisionEngine(WorkloadCalculator(), CapacityService(), clock=clock.now)
+
+
+@pytest.mark.parametrize("budget", [0.0, 1.0, 37.5, 400.0])
+def test_solve_processing_utilization(budget):
+    """Test that the cubic root satisfies u + αu³ = budget."""
+    u = solve_processing_utilization(budget, 1.2)
+    assert u + 1.2 * u**3 == pytest.approx(budget)
+
+
+@pytest.mark.parametrize(
+    "moment,current_workload,capacity",
+    [
+        (datetime(2024, 1, 15, 9, 0), Decimal("100"), Decimal("200")),
+        (datetime(2024, 1, 15, 15, 0), Decimal("10"), Decimal("20")),
+        (datetime(2024, 1, 15, 15, 20), Decimal("2"), Decimal("3.6")),
+        # Time limit binds before the utilization limit
+        (datetime(2024, 1, 15, 15, 28, 45), Decimal("2"), Decimal("20")),
+        (datetime(2024, 1, 15, 9, 0), Decimal("280.5"), Decimal("0")),
+    ],
+)
+def test_table_matches_make_decision(engine, clock, moment, current_workload, capacity):
+    """Test that the threshold comparison reproduces the full decision rule."""
+    clock.advance_to(moment)
+    table = ThresholdTable(engine, "WH-MAIN", current_workload, capacity, "PACKER")
+
+    for step in range(0, 400, 3):
+        workload = Decimal(step) / 2
+        for priority in Priority:
+            expected = engine.make_decision(
+                workload, current_workload, capacity, "PACKER", priority
+            )
+            actual = table.decide(workload, priority)
+            assert actual.can_ship_today == expected.can_ship_today, (workload, priority)
+            assert actual.message == expected.message
+            assert actual.status == expected.status
+            assert actual.vip_override_used == expected.factors.vip_override_used
+
+
+def test_factors_built_on_demand(engine):
+    """Test that factors match the engine's factors for the same order."""
+    table = ThresholdTable(engine, "WH-MAIN", Decimal("100"), Decimal("200"), "PACKER")
+    expected = engine.make_decision(Decimal("12.5"), Decimal("100"), Decimal("200"), "PACKER")
+    factors = table.decide(Decimal("12.5")).factors()
+
+    assert factors.time_buffer_minutes == expected.factors.time_buffer_minutes
+    assert factors.remaining_capacity == expected.factors.remaining_capacity
+    assert float(factors.congestion_factor) == pytest.approx(
+        float(expected.factors.congestion_factor)
+    )
+
+
+def test_registry_expires_tables(engine):
+    """Test that tables are only reused while fresh."""
+    table = ThresholdTable(engine, "WH-MAIN", Decimal("100"), Decimal("200"), "PACKER")
+
+    registry = ThresholdTableRegistry(max_age_seconds=60)
+    registry.publish(table)
+    assert registry.get("WH-MAIN") is table
+    assert registry.get("WH-NORTH") is None
+
+    stale = ThresholdTableRegistry(max_age_seconds=0)
+    stale.publish(table)
+    assert stale.get("WH-MAIN") is None
+
+
+def test_stale_copy_lowers_confidence(engine):
+    """Test that last-known-good tables decide the same with lowered confidence."""
+    table = ThresholdTable(engine, "WH-MAIN", Decimal("100"), Decimal("200"), "PACKER")
+    registry = ThresholdTableRegistry(max_age_seconds=0)
+    registry.publish(table)
+    registry.invalidate()
+
+    stale = registry.last_known_good("WH-MAIN", max_age_seconds=60)
+    fresh_decision = table.decide(Decimal("12.5"))
+    stale_decision = stale.decide(Decimal("12.5"))
+
+    assert stale_decision.can_ship_today == fresh_decision.can_ship_today
+    assert stale_decision.confidence == fresh_decision.confidence * Decimal(
+        str(engine.settings.stale_snapshot_confidence_factor)
+    )
+    assert stale_decision.factors().snapshot_stale
+    assert not table.stale
+    assert registry.last_known_good("WH-MAIN", max_age_seconds=-1) is None
+
+
+def test_newer_epoch_drops_table(engine):
+    """Test that a warehouse's table is dropped once its state epoch moves on."""
+    table = ThresholdTable(engine, "WH-MAIN", Decimal("100"), Decimal("200"), "PACKER")
+    registry = ThresholdTableRegistry(max_age_seconds=60)
+    registry.publish(table)
+
+    assert registry.observe_epochs({"WH-MAIN": 0, "WH-NORTH": 1}) == ["WH-NORTH"]
+    assert registry.get("WH-MAIN") is table
+
+    assert registry.observe_epochs({"WH-MAIN": 2}) == ["WH-MAIN"]
+    assert registry.get("WH-MAIN") is None
+    assert registry.last_known_good("WH-MAIN", max_age_seconds=60) is not None
+    assert registry.observe_epochs({"WH-MAIN": 2}) == []
+
+
+def test_table_from_older_epoch_not_published(engine):
+    """Test that a table loaded before an epoch bump is not served as fresh."""
+    registry = ThresholdTableRegistry(max_age_seconds=60)
+    table = ThresholdTable(engine, "WH-MAIN", Decimal("100"), Decimal("200"), "PACKER")
+    registry.observe_epochs({"WH-MAIN": 1})
+
+    registry.publish(table)
+    assert registry.get("WH-MAIN") is None
+
+    table.epoch = 1
+    registry.publish(table)
+    assert registry.get("WH-MAIN") is table
@@ -0,0 +1,85 @@
+"""
+Unit tests for request stage timing.
+"""
+
+import asyncio
+import time
+
+from prometheus_client import REGISTRY
+
+from app.core.timing import current_timer, stage, start_request_timer, stop_request_timer
+
+
+def test_stage_outside_request_is_a_no_op():
+    """Test that stages run without a request timer (background tasks, startup)."""
+    assert current_timer() is None
+    with stage("hana"):
+        pass
+    assert current_timer() is None
+
+
+def test_stages_accumulate_high_resolution_spans():
+    """Test that repeated stages add up and short spans are not rounded away."""
+    timer, token = start_request_timer()
+    try:
+        with stage("hana"):
+            time.sleep(0.002)
+        with stage("hana"):
+            time.sleep(0.002)
+        with stage("decision"):
+            pass
+    finally:
+        stop_request_timer(token)
+
+    assert current_timer() is None
+    assert list(timer.stages) == ["hana", "decision"]
+    assert timer.stages["hana"] >= 0.004
+    assert 0 < timer.stages["decision"] < 0.001
+
+
+def test_span_is_recorded_when_stage_raises():
+    """Test that a failing stage still reports its time."""
+    timer, token = start_request_timer()
+    try:
+        with stage("hana"):
+            raise TimeoutError
+    except TimeoutError:
+        pass
+    finally:
+        stop_request_timer(token)
+
+    assert "hana" in timer.stages
+
+
+async def test_stages_in_child_tasks_reach_the_request_timer():
+    """Test that tasks spawned while handling the request record into its timer."""
+
+    async def query():
+        with stage("hana"):
+            await asyncio.sleep(0)
+
+    timer, token = start_request_timer()
+    try:
+        await asyncio.gather(query(), query())
+    finally:
+        stop_request_timer(token)
+
+    assert timer.stages["hana"] > 0
+
+
+def test_server_timing_header_and_histogram():
+    """Test the Server-Timing rendering (milliseconds) and per-stage observations."""
+    timer, token = start_request_timer()
+    stop_request_timer(token)
+    timer.add("cache_lookup", 0.0004123)
+    timer.add("hana", 0.0125)
+    labels = {"endpoint": "/timing-test", "stage": "hana"}
+
+    timer.observe("/timing-test")
+
+    assert timer.server_timing(0.015) == (
+        "cache_lookup;dur=0.412, hana;dur=12.500, total;dur=15.000"
+    )
+    assert (
+        REGISTRY.get_sample_value("cutoff_api_request_stage_duration_seconds_sum", labels) == 0.0125
+    )
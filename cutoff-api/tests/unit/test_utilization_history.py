@@ -0,0 +1,161 @@
+"""
+Unit tests for the utilization time-series store.
+"""
+
+import time
+
+import pytest
+
+from app.services.utilization_history import RingSeries, UtilizationHistory, UtilizationSeries
+
+START = 1_705_300_200.0  # 2024-01-15 06:30:00 UTC, aligned to 15 minutes
+
+
+def test_ring_series_wraps_around():
+    """Test that the ring keeps only the newest points."""
+    ring = RingSeries(1, 3)
+    for i in range(5):
+        ring.push(float(i), float(i) * 10)
+    assert ring.count == 3
+    assert ring.latest(5) == [(2.0, 20.0), (3.0, 30.0), (4.0, 40.0)]
+
+
+def test_downsampling_tiers():
+    """Test minute and 15-minute averages are emitted as buckets close."""
+    series = UtilizationSeries()
+    # 32 minutes of samples every 10 s; utilization equals the minute index / 100
+    for second in range(0, 32 * 60, 10):
+        series.record((second // 60) / 100, START + second)
+
+    assert series.raw.count == 192
+    assert series.minute.count == 31
+    assert series.minute.latest(1)[0][1] == pytest.approx(0.30)
+    # Two closed quarter buckets: minutes 0-14 and 15-29 (closed once minute 30 is)
+    quarter = series.quarter.latest(10)
+    assert len(quarter) == 2
+    assert quarter[0][1] == pytest.approx(0.07)
+    assert quarter[1][1] == pytest.approx(0.22)
+
+
+def test_raw_tier_keeps_latest_value_per_second():
+    """Test that samples within the same second overwrite each other."""
+    series = UtilizationSeries()
+    series.record(0.5, START + 0.1)
+    series.record(0.6, START + 0.9)
+    assert series.raw.count == 1
+    assert series.raw.latest(1)[0][1] == 0.6
+
+
+def test_trend_from_slope():
+    """Test rising, flat and falling series."""
+    rising, flat, falling = UtilizationSeries(), UtilizationSeries(), UtilizationSeries()
+    for i in range(120):
+        rising.record(0.5 + i * 0.001, START + i * 5)
+        flat.record(0.5, START + i * 5)
+        falling.record(0.8 - i * 0.001, START + i * 5)
+    assert rising.trend == "INCREASING"
+    assert flat.trend == "STABLE"
+    assert falling.trend == "DECREASING"
+
+
+def test_history_ends_with_latest_sample():
+    """Test status history points."""
+    series = UtilizationSeries()
+    for second in range(0, 32 * 60, 30):
+        series.record(0.7, START + second)
+    history = series.history(points=4)
+    assert len(history) == 3
+    assert history[-1][1] == 0.7
+    assert history[0][1] == pytest.approx(0.7)
+
+
+def test_persist_and_restore(tmp_path):
+    """Test round trip through the mmap file."""
+    history = UtilizationHistory(directory=tmp_path)
+    series = history.get("WH-MAIN")
+    for second in range(0, 20 * 60, 15):
+        series.record(0.4 + second / 100_000, START + second)
+    history.persist()
+
+    restored = UtilizationHistory(directory=tmp_path)
+    assert restored.restore() == 1
+    copy = restored.get("WH-MAIN")
+    assert copy.minute.latest(100) == series.minute.latest(100)
+    assert copy.raw.latest(10) == series.raw.latest(10)
+    assert copy.slope_per_minute == series.slope_per_minute
+    assert copy.trend == series.trend
+
+
+def test_workers_replace_series_files_whole(tmp_path):
+    """Test that workers persisting the same warehouse never leave a mixed or partial file."""
+    first = UtilizationHistory(directory=tmp_path)
+    first.get("WH-MAIN").record(0.4, START)
+    first.get("WH-MAIN").record(0.5, START + 1)
+    second = UtilizationHistory(directory=tmp_path)
+    second.get("WH-MAIN").record(0.9, START)
+
+    first.persist()
+    second.persist()
+
+    assert [path.name for path in tmp_path.iterdir()] == ["WH-MAIN.utilts"]
+    restored = UtilizationHistory(directory=tmp_path)
+    assert restored.restore() == 1
+    assert restored.get("WH-MAIN").raw.latest(10) == [(START, 0.9)]
+
+
+@pytest.mark.parametrize("damage", ["truncate", "header"])
+def test_damaged_series_file_is_not_restored(tmp_path, damage):
+    """Test that a short file or an inconsistent header is rejected on load."""
+    history = UtilizationHistory(directory=tmp_path)
+    history.record("WH-MAIN", 0.5)
+    history.persist()
+    path = tmp_path / "WH-MAIN.utilts"
+    data = bytearray(path.read_bytes())
+    if damage == "truncate":
+        data = data[: len(data) // 2]
+    else:
+        # raw tier head beyond its capacity
+        data[8:12] = (UtilizationSeries.RAW_CAPACITY).to_bytes(4, "little")
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError):
+        UtilizationSeries.load(path)
+    assert UtilizationHistory(directory=tmp_path).restore() == 0
+
+
+def test_least_recently_used_series_is_evicted():
+    """Test that unknown warehouse ids cannot grow the registry without bound."""
+    history = UtilizationHistory(max_warehouses=2)
+    history.record("WH-MAIN", 0.5)
+    history.record("WH-NORTH", 0.5)
+    history.record("WH-MAIN", 0.6)
+    history.record("WH-BOGUS", 0.5)
+
+    assert list(history._series) == ["WH-MAIN", "WH-BOGUS"]
+
+
+def test_persisted_file_names_cannot_escape_directory(tmp_path):
+    """Test that ids with path separators are encoded into a single file name."""
+    directory = tmp_path / "history"
+    history = UtilizationHistory(directory=directory)
+    history.record("../../evil", 0.5)
+    history.persist()
+
+    assert list(tmp_path.iterdir()) == [directory]
+    restored = UtilizationHistory(directory=directory)
+    assert restored.restore() == 1
+    assert list(restored._series) == ["../../evil"]
+
+
+def test_snapshot_is_a_copy(tmp_path):
+    """Test that samples recorded after the snapshot do not leak into the written file."""
+    history = UtilizationHistory(directory=tmp_path)
+    series = history.record("WH-MAIN", 0.5)
+    snapshot = history.snapshot()
+    series.record(0.9, time.time() + 5)
+
+    history.write_snapshot(snapshot)
+
+    restored = UtilizationHistory(directory=tmp_path)
+    restored.restore()
+    assert restored.get("WH-MAIN").raw.latest(10) == series.raw.latest(2)[:1]